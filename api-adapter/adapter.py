@@ -23,17 +23,29 @@ Features:
 - Automatic item import to Aura closet
 - Caching to reduce repeated requests
 """
-from fastapi import FastAPI, Query, HTTPException, Header
+from fastapi import FastAPI, Query, HTTPException, Header, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_json
 from typing import List, Optional, Any, Dict
+import sys
+import json
 import time
+import hashlib
+from email.utils import formatdate
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import math
 from pathlib import Path
 
+logger = logging.getLogger("aura-amazon-adapter")
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -57,17 +69,163 @@ except ImportError:
 
 # Import scraper
 try:
-    from amazon_scraper import scrape_amazon_orders, HAS_PLAYWRIGHT
+    from amazon_scraper import (
+        scrape_amazon_orders,
+        iter_amazon_orders,
+        HAS_PLAYWRIGHT,
+        get_browser_pool,
+        start_browser_pool,
+        stop_browser_pool,
+        shutdown_parse_executor,
+    )
 except ImportError:
     scrape_amazon_orders = None
+    iter_amazon_orders = None
+    get_browser_pool = None
+    start_browser_pool = None
+    stop_browser_pool = None
+    shutdown_parse_executor = None
     HAS_PLAYWRIGHT = False
 
+from order_store import OrderStore, get_order_store
+from order_jobs import OrderJobQueue, OrderSyncJob
+from normalize import PRODUCT_SPEC
+from order_sync import ORDER_SYNC_BATCH_SIZE, close_order_sync, sync_order_batches
+from cache_backends import CacheBackend, MemoryCacheBackend, create_cache_backend
+from hot_keys import HotKeyTracker
+from search_query import canonical_query
+from resilience import OVERLOAD_STATUS_CODES, Upstream, UpstreamUnavailable
+from metrics import METRICS_ENABLED, REGISTRY, MetricsMiddleware, span
+from amazon_clients import close_client_registry, get_client_registry
+
 # Optional caching to avoid hitting Amazon too often
-from cachetools import TTLCache
+from cachetools import LRUCache
+
+# Result-set tier: one entry per normalized query holding the normalized Product
+# list. Bounded by approximate bytes rather than entry count; every page, limit
+# and sort is served from the same entry by the view layer in `search`.
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("AMAZON_SEARCH_CACHE_BYTES", str(32 * 1024 * 1024)))
+# Entries are fresh for the TTL, then served stale (and refreshed in the
+# background) for the stale window before they expire
+SEARCH_CACHE_TTL = float(os.getenv("AMAZON_SEARCH_CACHE_TTL", "300"))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("AMAZON_SEARCH_CACHE_STALE_TTL", "60"))
+# Fresh seconds for a query with no results, which may start matching sooner
+SEARCH_CACHE_EMPTY_TTL = float(os.getenv("AMAZON_SEARCH_CACHE_EMPTY_TTL", "60"))
+# "memory" (per worker), "sqlite" (shared file on this host) or "redis" (shared server)
+SEARCH_CACHE_BACKEND = os.getenv("AMAZON_SEARCH_CACHE_BACKEND", "memory")
+SEARCH_CACHE_PATH = Path(os.getenv("AMAZON_SEARCH_CACHE_PATH", str(Path.home() / ".aura" / "search-cache.db")))
+SEARCH_CACHE_URL = os.getenv("AMAZON_SEARCH_CACHE_URL") or os.getenv("REDIS_URL")
+
+
+def build_search_cache(kind: str = SEARCH_CACHE_BACKEND) -> CacheBackend:
+    """Create the configured search cache backend, falling back to in-process memory."""
+    options = dict(
+        max_bytes=SEARCH_CACHE_MAX_BYTES,
+        max_ttl=SEARCH_CACHE_TTL + SEARCH_CACHE_STALE_TTL,
+        getsizeof=lambda result_set: result_set.nbytes,
+    )
+    try:
+        return create_cache_backend(kind, path=SEARCH_CACHE_PATH, url=SEARCH_CACHE_URL, **options)
+    except Exception as e:
+        logger.warning(f"Search cache backend {kind!r} unavailable, using memory: {e}")
+        return MemoryCacheBackend(options["max_bytes"], options["max_ttl"], options["getsizeof"])
+
+
+SEARCH_CACHE = build_search_cache()
+# Decoded ResultSets for entries read from a shared backend, keyed on
+# (cache key, stored_at), so a hit decodes each stored entry once per worker
+_decoded_result_sets = LRUCache(maxsize=SEARCH_CACHE_MAX_BYTES, getsizeof=lambda result_set: result_set.nbytes)
+
+# Guards on calls to Amazon (see resilience.py). amazon_search calls start with
+# AMAZON_SEARCH_CONCURRENCY in flight; the limit adapts between 1 and
+# AMAZON_SEARCH_MAX_CONCURRENCY, and extra requests queue on the loop.
+SEARCH_CONCURRENCY = int(os.getenv("AMAZON_SEARCH_CONCURRENCY", "8"))
+SEARCH_UPSTREAM = Upstream(
+    "search",
+    rate=float(os.getenv("AMAZON_SEARCH_RATE", "10")),
+    burst=float(os.getenv("AMAZON_SEARCH_BURST", "20")),
+    concurrency=SEARCH_CONCURRENCY,
+    max_concurrency=int(os.getenv("AMAZON_SEARCH_MAX_CONCURRENCY", str(4 * SEARCH_CONCURRENCY))),
+    failure_threshold=int(os.getenv("AMAZON_UPSTREAM_FAILURE_THRESHOLD", "5")),
+    reset_timeout=float(os.getenv("AMAZON_UPSTREAM_RESET_TIMEOUT", "30")),
+)
+# Order scrapes: one call per sync job, plus one rate-limit token per page load
+ORDERS_UPSTREAM = Upstream(
+    "orders",
+    rate=float(os.getenv("AMAZON_ORDERS_RATE", "1")),
+    burst=float(os.getenv("AMAZON_ORDERS_BURST", "4")),
+    concurrency=1,
+    max_concurrency=int(os.getenv("AMAZON_ORDERS_MAX_CONCURRENCY", "4")),
+    failure_threshold=int(os.getenv("AMAZON_UPSTREAM_FAILURE_THRESHOLD", "5")),
+    reset_timeout=float(os.getenv("AMAZON_UPSTREAM_RESET_TIMEOUT", "30")),
+    max_wait=60.0,
+)
+
+# Upstream searches currently in flight, keyed on the normalized query. Concurrent
+# identical requests await the same task instead of calling amazon_search again.
+_inflight_searches: Dict[str, asyncio.Task] = {}
+SEARCH_STATS = {
+    "hits": 0, "misses": 0, "coalesced": 0, "not_modified": 0, "refreshes": 0, "prefetches": 0,
+    # Requests whose query was rewritten by canonicalization (case, spacing, Unicode, folding)
+    "canonicalized": 0,
+}
+
+# Optional query folding on top of case/whitespace/Unicode canonicalization
+# (see search_query.py): "dress for the beach" -> "dress beach", "dresses" -> "dress"
+SEARCH_FOLD_STOP_WORDS = os.getenv("AMAZON_SEARCH_FOLD_STOP_WORDS", "false").lower() in ("1", "true", "yes")
+SEARCH_FOLD_PLURALS = os.getenv("AMAZON_SEARCH_FOLD_PLURALS", "false").lower() in ("1", "true", "yes")
+# Append every /search query as a JSON line here, for benchmarks/replay_query_log.py
+SEARCH_QUERY_LOG = os.getenv("AMAZON_SEARCH_QUERY_LOG")
+_query_log = None
+
+# Proactive refresh: every PREFETCH_INTERVAL seconds, the TOP_N most requested
+# queries (seen at least MIN_HITS times) whose cache entry goes stale within
+# PREFETCH_LEAD seconds are re-fetched, so popular queries never wait on upstream.
+# Request counts are halved every HOT_HALF_LIFE seconds. TOP_N=0 disables it.
+SEARCH_PREFETCH_TOP_N = int(os.getenv("AMAZON_SEARCH_PREFETCH_TOP_N", "20"))
+SEARCH_PREFETCH_INTERVAL = float(os.getenv("AMAZON_SEARCH_PREFETCH_INTERVAL", "15"))
+SEARCH_PREFETCH_LEAD = float(os.getenv("AMAZON_SEARCH_PREFETCH_LEAD", str(2 * SEARCH_PREFETCH_INTERVAL)))
+SEARCH_PREFETCH_MIN_HITS = int(os.getenv("AMAZON_SEARCH_PREFETCH_MIN_HITS", "3"))
+SEARCH_HOT_HALF_LIFE = float(os.getenv("AMAZON_SEARCH_HOT_HALF_LIFE", "600"))
+HOT_QUERIES = HotKeyTracker(capacity=max(64, 4 * SEARCH_PREFETCH_TOP_N), half_life=SEARCH_HOT_HALF_LIFE)
+
+# Encoded /orders bodies, keyed on orders_snapshot_key()
+ORDERS_BODY_CACHE = LRUCache(maxsize=64)
 
-CACHE = TTLCache(maxsize=1024, ttl=300)  # cache queries for 5 minutes
+# /orders serves the stored snapshot and queues a refresh once it is older than this
+ORDERS_MAX_AGE = float(os.getenv("AMAZON_ORDERS_MAX_AGE", "900"))
 
-app = FastAPI(title="Aura Amazon Adapter")
+# Launch the scraper's browser at startup so the first /orders call is warm
+BROWSER_WARMUP = os.getenv("AMAZON_BROWSER_WARMUP", "true").lower() not in ("0", "false", "no")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if HAS_PLAYWRIGHT and BROWSER_WARMUP and os.getenv("AMAZON_EMAIL"):
+        try:
+            await start_browser_pool()
+            logger.info("Browser pool warmed up")
+        except Exception as e:
+            logger.warning(f"Browser pool warmup failed, will launch on first use: {e}")
+    prefetcher = None
+    if HAS_AMAZON_MCP and SEARCH_PREFETCH_TOP_N > 0:
+        prefetcher = asyncio.ensure_future(prefetch_hot_searches())
+    yield
+    if prefetcher is not None:
+        prefetcher.cancel()
+        await asyncio.gather(prefetcher, return_exceptions=True)
+    await ORDER_JOBS.shutdown()
+    await close_order_sync()
+    await SEARCH_CACHE.close()
+    close_client_registry()
+    if _query_log is not None:
+        _query_log.close()
+    if HAS_PLAYWRIGHT:
+        await stop_browser_pool()
+        shutdown_parse_executor()
+
+
+app = FastAPI(title="Aura Amazon Adapter", lifespan=lifespan)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -77,8 +235,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-logger = logging.getLogger("aura-amazon-adapter")
+# Request latency per route template, for GET /metrics (AMAZON_METRICS=false disables)
+app.add_middleware(MetricsMiddleware)
 
 class Product(BaseModel):
     id: str
@@ -106,6 +264,10 @@ class OrderItem(BaseModel):
     image_url: Optional[str] = None
     url: Optional[str] = None
 
+class OrderSyncRequest(BaseModel):
+    """Batch of order items pushed to /sync/orders"""
+    orders: List[OrderItem]
+
 class SearchResponse(BaseModel):
     products: List[Product]
     total: int
@@ -116,97 +278,631 @@ class OrdersResponse(BaseModel):
     orders: List[OrderItem]
     total: int
 
+# Products without a price sort after every priced product, in either direction
+def _price_low_key(product: Product):
+    return (product.price is None, product.price or 0)
+
+
+def _price_high_key(product: Product):
+    return (product.price is None, -(product.price or 0))
+
+
+def _rating_key(product: Product):
+    # Highest rated first; review count breaks ties; unrated products go last
+    return (product.rating is None, -(product.rating or 0), -(product.reviews or 0))
+
+
+def view_etag(*parts: Any) -> str:
+    """Strong ETag for a response fully determined by `parts` (a content digest plus view parameters)."""
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+class ResultSet:
+    """Normalized upstream results for one query.
+
+    Shared by every page/limit/sort/category view of that query. Sort orders are
+    precomputed as index permutations when the set is built, so serving a page
+    of a sorted view is a slice plus `limit` lookups. Ties keep upstream order.
+    Each product is JSON-encoded once up front, and rendered page bodies are
+    memoized, so a repeated view costs one dict lookup. `digest` hashes the
+    encoded products, so a view's ETag is known without rendering it.
+    `nbytes` approximates the memory held and is what the search cache is
+    bounded by.
+    """
+
+    __slots__ = (
+        "query", "products", "status_code", "fetched_at", "fresh_until", "nbytes",
+        "sort_orders", "_category_views", "product_json", "digest",
+        "_rendered", "_rendered_bytes", "render_budget",
+    )
+
+    # "newest" has no date to sort on in search results, so it keeps upstream order
+    SORT_ALIASES = {"newest": "relevance"}
+    # Cap on memoized category-filtered permutations per result set
+    MAX_CATEGORY_VIEWS = 16
+    # Floor on the bytes of rendered page bodies memoized per result set
+    MIN_RENDER_BUDGET = 64 * 1024
+
+    def __init__(
+        self,
+        query: str,
+        products: List[Product],
+        status_code: int = 200,
+        fetched_at: Optional[float] = None,
+    ):
+        self.query = query
+        self.products = products
+        self.status_code = status_code
+        self.fetched_at = fetched_at or time.time()
+        # Set once the set is stored in (or read from) the search cache
+        self.fresh_until: Optional[float] = None
+
+        n = len(products)
+        relevance = list(range(n))
+        self.sort_orders = {
+            "relevance": relevance,
+            "price_low": sorted(relevance, key=lambda i: _price_low_key(products[i])),
+            "price_high": sorted(relevance, key=lambda i: _price_high_key(products[i])),
+            "rating": sorted(relevance, key=lambda i: _rating_key(products[i])),
+        }
+        self._category_views: Dict[tuple, List[int]] = {}
+
+        self.product_json = [to_json(product) for product in products]
+        self.digest = hashlib.blake2b(b"\n".join(self.product_json), digest_size=16).hexdigest()
+        json_bytes = sum(len(encoded) for encoded in self.product_json)
+        # Rendered pages may hold about one more copy of the encoded products
+        self.render_budget = max(json_bytes, self.MIN_RENDER_BUDGET)
+        self._rendered: Dict[tuple, tuple] = {}
+        self._rendered_bytes = 0
+
+        self.nbytes = (
+            sys.getsizeof(products)
+            # Product models, approximated by their JSON size, plus the encoded copies
+            + 2 * json_bytes
+            + sys.getsizeof(self.product_json)
+            + sum(sys.getsizeof(order) for order in self.sort_orders.values())
+            # Headroom for memoized category views and rendered pages
+            + self.MAX_CATEGORY_VIEWS * sys.getsizeof(relevance)
+            + self.render_budget
+        )
+
+    def is_stale(self) -> bool:
+        return self.fresh_until is not None and time.time() >= self.fresh_until
+
+    def sort_name(self, sort: Optional[str]) -> str:
+        sort = self.SORT_ALIASES.get(sort, sort)
+        return sort if sort in self.sort_orders else "relevance"
+
+    def view(self, sort: Optional[str] = None, category: Optional[str] = None) -> List[int]:
+        """Return the product index permutation for a sort order and optional category."""
+        sort = self.sort_name(sort)
+        order = self.sort_orders[sort]
+        if not category:
+            return order
+
+        key = (sort, category.casefold())
+        indices = self._category_views.get(key)
+        if indices is None:
+            wanted = key[1]
+            indices = [
+                i for i in order
+                if (self.products[i].category or "").casefold() == wanted
+            ]
+            if len(self._category_views) >= self.MAX_CATEGORY_VIEWS:
+                self._category_views.pop(next(iter(self._category_views)))
+            self._category_views[key] = indices
+        return indices
+
+    def view_key(self, page: int, limit: int, sort: Optional[str] = None, category: Optional[str] = None) -> tuple:
+        return (self.sort_name(sort), category.casefold() if category else None, page, limit)
+
+    def etag(self, page: int, limit: int, sort: Optional[str] = None, category: Optional[str] = None) -> str:
+        """ETag of a page of a view, derived from the digest without rendering the body."""
+        return view_etag(self.digest, *self.view_key(page, limit, sort, category))
+
+    def render(
+        self,
+        page: int,
+        limit: int,
+        sort: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> tuple:
+        """Return (SearchResponse JSON bytes, ETag) for one page of a view.
+
+        The body is spliced from the pre-encoded products and memoized, oldest
+        evicted first once `render_budget` bytes are held.
+        """
+        key = self.view_key(page, limit, sort, category)
+        rendered = self._rendered.get(key)
+        if rendered is not None:
+            return rendered
+
+        indices = self.view(sort, category)
+        start = (page - 1) * limit
+        encoded = self.product_json
+        body = b"".join((
+            b'{"products":[',
+            b",".join([encoded[i] for i in indices[start:start + limit]]),
+            b'],"total":%d,"page":%d,"limit":%d}' % (len(indices), page, limit),
+        ))
+        rendered = (body, view_etag(self.digest, *key))
+        while self._rendered and self._rendered_bytes + len(body) > self.render_budget:
+            evicted_body, _ = self._rendered.pop(next(iter(self._rendered)))
+            self._rendered_bytes -= len(evicted_body)
+        if len(body) <= self.render_budget:
+            self._rendered[key] = rendered
+            self._rendered_bytes += len(body)
+        return rendered
+
+
 class AmazonClientError(Exception):
     """Raised when amazon-mcp client operations fail"""
     pass
 
 
+PRODUCT_LIST = TypeAdapter(List[Product])
+
+
+def normalize_amazon_mcp_results(items: List[Any]) -> List[Product]:
+    """Map a batch of amazon-mcp items (dicts or objects) into Product models.
+
+    Field mapping runs through the shared PRODUCT_SPEC plan, and the whole
+    batch is validated in one TypeAdapter call. If any row is invalid, rows
+    are validated one by one and the bad ones are dropped.
+    """
+    with span("search.map"):
+        rows = PRODUCT_SPEC.normalize(items)
+    try:
+        with span("search.validate"):
+            return PRODUCT_LIST.validate_python(rows)
+    except ValidationError:
+        products = []
+        for row in rows:
+            try:
+                products.append(Product.model_validate(row))
+            except ValidationError as e:
+                logger.warning(f"Failed to normalize product: {e}")
+        return products
+
+
 def normalize_amazon_mcp_result(item: Any) -> Product:
-    """Map an amazon-mcp item (dict or object) into our Product model.
-    Handles various response formats from amazon-mcp.
+    """Map a single amazon-mcp item into our Product model."""
+    return Product.model_validate(PRODUCT_SPEC.normalize([item])[0])
+
+
+def new_amazon_client() -> Amazon:
+    # amazon-mcp.server.Amazon provides the search interface
+    # It auto-detects credentials from environment variables:
+    # AMAZON_EMAIL, AMAZON_PASSWORD (for browser-based auth)
+    # or AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY (for API auth)
+    return Amazon()
+
+
+# Built on first use and reused by every request (see amazon_clients.py)
+AMAZON_CLIENT = get_client_registry().register("amazon", new_amazon_client)
+
+
+def search_overloaded(result: Any) -> bool:
+    """Whether an amazon_search result is a (status_code, results) tuple with a non-200 status."""
+    return isinstance(result, tuple) and bool(result) and result[0] != 200
+
+
+async def fetch_search_results(query: str):
+    """Await amazon_search on the server loop under SEARCH_UPSTREAM's guards.
+
+    Non-200 statuses shrink the adaptive concurrency limit and count toward
+    opening the circuit, like exceptions do.
+
+    Raises:
+        UpstreamUnavailable: The circuit is open or the rate limit is saturated
     """
+    with span("search.upstream"):
+        result = await SEARCH_UPSTREAM.call(amazon_search, query, overloaded=search_overloaded)
+    if search_overloaded(result) and result[0] in OVERLOAD_STATUS_CODES:
+        logger.warning(f"amazon_search throttled ({result[0]}) for {query!r}")
+    return result
+
+
+def normalize_query(q: str) -> str:
+    """Canonicalize a search query for cache and in-flight dedup keys."""
+    return canonical_query(q, SEARCH_FOLD_STOP_WORDS, SEARCH_FOLD_PLURALS)
+
+
+def log_search_query(q: str) -> None:
+    """Append `q` to the AMAZON_SEARCH_QUERY_LOG file, if configured."""
+    global _query_log
+    if not SEARCH_QUERY_LOG:
+        return
     try:
-        if isinstance(item, dict):
-            raw = item
-        else:
-            # try to convert object attributes to dict
-            raw = getattr(item, "__dict__", {}) or dict(item)
-    except Exception:
-        raw = {}
-
-    # Extract ID - try multiple possible field names
-    pid = (raw.get("id") or raw.get("asin") or raw.get("product_id") or 
-           raw.get("url") or str(time.time()))
-    
-    # Extract title/name
-    name = (raw.get("title") or raw.get("name") or 
-            raw.get("product_name") or "Unknown Product")
-    
-    # Extract price - try multiple field names and conversions
-    price = None
-    for k in ("price", "price_value", "price_amount", "offer_price", "current_price"):
+        if _query_log is None:
+            _query_log = open(SEARCH_QUERY_LOG, "a", encoding="utf-8", buffering=1)
+        _query_log.write(json.dumps({"ts": round(time.time(), 3), "q": q}, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.warning(f"Could not write search query log: {e}")
+
+
+def search_cache_key(q: str) -> str:
+    return f"search:{normalize_query(q)}"
+
+
+def build_result_set(query: str, result: Any) -> ResultSet:
+    """Normalize a raw amazon_search result into a ResultSet."""
+    # amazon_search returns tuple: (status_code, results_list)
+    if isinstance(result, tuple):
+        status_code, search_results = result
+        if status_code != 200 or not search_results:
+            return ResultSet(query, [], status_code=status_code)
+        raw_items = search_results
+    else:
+        # Fallback if return format is different
+        raw_items = result if isinstance(result, list) else []
+
+    products = normalize_amazon_mcp_results(raw_items)
+    with span("search.index"):
+        return ResultSet(query, products)
+
+
+class CachedResultSet(BaseModel):
+    """Wire format of a ResultSet in a shared cache backend"""
+    query: str
+    fetched_at: float
+    products: List[Product]
+
+
+def encode_result_set(result_set: ResultSet) -> bytes:
+    """Serialize a ResultSet for a shared backend, reusing its pre-encoded products."""
+    return b"".join((
+        b'{"query":', to_json(result_set.query),
+        b',"fetched_at":', repr(result_set.fetched_at).encode(),
+        b',"products":[', b",".join(result_set.product_json), b"]}",
+    ))
+
+
+def decode_result_set(blob: bytes) -> ResultSet:
+    cached = CachedResultSet.model_validate_json(blob)
+    return ResultSet(cached.query, cached.products, fetched_at=cached.fetched_at)
+
+
+async def cached_result_set(query: str) -> Optional[ResultSet]:
+    """The cached result set for `query`, fresh or stale, or None on a miss."""
+    key = search_cache_key(query)
+    with span("search.cache_get"):
+        entry = await SEARCH_CACHE.get(key)
+    if entry is None:
+        return None
+    if not SEARCH_CACHE.shared:
+        return entry.value
+
+    memo_key = (key, entry.stored_at)
+    result_set = _decoded_result_sets.get(memo_key)
+    if result_set is None:
+        try:
+            with span("search.cache_decode"):
+                result_set = decode_result_set(entry.value)
+        except Exception as e:
+            logger.warning(f"Discarding undecodable cache entry for {query!r}: {e}")
+            return None
+        result_set.fresh_until = entry.fresh_until
         try:
-            if k in raw and raw[k] is not None:
-                price_val = raw[k]
-                # Handle string prices like "$19.99"
-                if isinstance(price_val, str):
-                    price_val = float(price_val.replace("$", "").replace(",", ""))
-                else:
-                    price_val = float(price_val)
-                price = price_val
-                break
-        except (ValueError, TypeError):
+            _decoded_result_sets[memo_key] = result_set
+        except ValueError:
+            pass
+    return result_set
+
+
+async def cache_result_set(result_set: ResultSet) -> None:
+    """Store a result set in the search cache; failed ones are not cached.
+
+    Empty result sets are cached too, for SEARCH_CACHE_EMPTY_TTL, so a query
+    with no matches does not reach amazon-mcp on every request.
+    """
+    if result_set.status_code != 200:
+        return
+    value = encode_result_set(result_set) if SEARCH_CACHE.shared else result_set
+    ttl = SEARCH_CACHE_TTL if result_set.products else min(SEARCH_CACHE_EMPTY_TTL, SEARCH_CACHE_TTL)
+    with span("search.cache_set"):
+        entry = await SEARCH_CACHE.set(
+            search_cache_key(result_set.query), value, ttl, SEARCH_CACHE_STALE_TTL
+        )
+    if entry is not None:
+        result_set.fresh_until = entry.fresh_until
+
+
+async def load_result_set(query: str) -> ResultSet:
+    """Fetch and normalize the full result set for `query` and cache it."""
+    logger.info(f"Searching Amazon: {query}")
+    result_set = build_result_set(query, await fetch_search_results(query))
+    await cache_result_set(result_set)
+    return result_set
+
+
+def _forget_inflight(key: str, task: asyncio.Task) -> None:
+    if _inflight_searches.get(key) is task:
+        del _inflight_searches[key]
+    # Mark the exception as retrieved even if every waiter has gone away
+    if not task.cancelled():
+        task.exception()
+
+
+def start_search(query: str) -> tuple:
+    """Return (task, started): the in-flight upstream search for `query`, starting one if needed."""
+    key = normalize_query(query)
+    task = _inflight_searches.get(key)
+    if task is not None:
+        return task, False
+    task = asyncio.ensure_future(load_result_set(query))
+    _inflight_searches[key] = task
+    task.add_done_callback(lambda t: _forget_inflight(key, t))
+    return task, True
+
+
+async def singleflight_search(query: str) -> ResultSet:
+    """Load the result set for `query`, sharing one upstream call across identical requests.
+
+    The upstream call runs as its own task and waiters are shielded from it, so
+    a client disconnecting does not cancel the search for everyone else.
+    """
+    task, started = start_search(query)
+    if started:
+        SEARCH_STATS["misses"] += 1
+    else:
+        SEARCH_STATS["coalesced"] += 1
+        logger.debug(f"Joining in-flight search for {normalize_query(query)!r}")
+    return await asyncio.shield(task)
+
+
+def refresh_in_background(query: str) -> None:
+    """Re-fetch a stale result set without making the current request wait for it."""
+    if not SEARCH_UPSTREAM.available:
+        # Keep serving the stale copy until the circuit lets calls through again
+        return
+    _, started = start_search(query)
+    if started:
+        SEARCH_STATS["refreshes"] += 1
+        logger.debug(f"Refreshing stale search for {normalize_query(query)!r}")
+
+
+async def prefetch_once() -> int:
+    """Start refreshes for hot queries whose entries are about to go stale; returns how many."""
+    started_tasks = []
+    if not SEARCH_UPSTREAM.available:
+        return 0
+    deadline = time.time() + SEARCH_PREFETCH_LEAD
+    for key, query, count in HOT_QUERIES.top(SEARCH_PREFETCH_TOP_N, SEARCH_PREFETCH_MIN_HITS):
+        # Only entries that still exist: expired ones are fetched by the next request
+        entry = await SEARCH_CACHE.peek(search_cache_key(key))
+        if entry is None or entry.fresh_until > deadline:
             continue
+        task, started = start_search(query)
+        if started:
+            SEARCH_STATS["prefetches"] += 1
+            logger.debug(f"Prefetching hot search {key!r} (~{count} requests)")
+            started_tasks.append(task)
+    # Wait for this round so prefetches never pile up behind a slow upstream
+    await asyncio.gather(*started_tasks, return_exceptions=True)
+    return len(started_tasks)
+
+
+async def prefetch_hot_searches() -> None:
+    """Lifespan task: refresh the hottest search queries before their cache entries go stale."""
+    while True:
+        await asyncio.sleep(SEARCH_PREFETCH_INTERVAL)
+        try:
+            await prefetch_once()
+        except Exception as e:
+            logger.warning(f"Search prefetch round failed: {e}")
 
-    return Product(
-        id=pid,
-        asin=raw.get("asin") or raw.get("id"),
-        name=name,
-        retailer="amazon",
-        category=raw.get("category") or raw.get("department"),
-        price=price,
-        description=raw.get("description") or raw.get("snippet") or raw.get("desc"),
-        url=raw.get("url") or raw.get("product_url"),
-        image=raw.get("image") or raw.get("image_url") or raw.get("thumbnail"),
-        rating=raw.get("rating") or raw.get("score"),
-        reviews=raw.get("reviews") or raw.get("review_count"),
-        prime=raw.get("prime") or raw.get("is_prime") or False,
+
+def upstream_unavailable_error(e: UpstreamUnavailable) -> HTTPException:
+    """429 (rate limited) or 503 (circuit open) with a Retry-After header."""
+    return HTTPException(
+        status_code=429 if e.reason == "rate_limited" else 503,
+        detail={"error": "upstream_unavailable", "upstream": e.upstream, "reason": e.reason},
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
     )
 
 
-def get_amazon_client() -> Optional[Amazon]:
-    """Initialize and return an Amazon MCP client with credentials from env."""
-    if not HAS_AMAZON_MCP or not Amazon:
-        return None
-    
-    try:
-        # amazon-mcp.server.Amazon provides the search interface
-        # It auto-detects credentials from environment variables:
-        # AMAZON_EMAIL, AMAZON_PASSWORD (for browser-based auth)
-        # or AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY (for API auth)
-        client = Amazon()
-        return client
-    except Exception as e:
-        logger.warning(f"Failed to initialize Amazon client: {e}")
-        return None
+def orders_circuit_open() -> UpstreamUnavailable:
+    return UpstreamUnavailable(ORDERS_UPSTREAM.name, "circuit_open", ORDERS_UPSTREAM.breaker.retry_after())
 
 
-def run_async_search(query: str):
-    """Helper to run async amazon_search in a sync context."""
-    try:
-        # Get or create event loop
+def search_cache_headers(result_set: ResultSet, etag: str) -> Dict[str, str]:
+    """Validators and freshness for a search view; max-age is the cache entry's remaining TTL."""
+    # Stale and uncached (failed, empty, oversized) result sets get max-age=0
+    remaining = max(0, int(result_set.fresh_until - time.time())) if result_set.fresh_until else 0
+    return {
+        "ETag": etag,
+        "Last-Modified": http_date(result_set.fetched_at),
+        "Cache-Control": f"max-age={remaining}",
+    }
+
+
+def render_search_view(
+    result_set: ResultSet,
+    page: int,
+    limit: int,
+    category: Optional[str] = None,
+    sort: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+) -> Response:
+    """Serve one sorted, filtered page out of a cached result set as pre-encoded JSON.
+
+    Returns 304 without rendering when `if_none_match` matches the view's ETag.
+    """
+    etag = result_set.etag(page, limit, sort, category)
+    headers = search_cache_headers(result_set, etag)
+    if etag_matches(if_none_match, etag):
+        SEARCH_STATS["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    with span("search.render"):
+        body, _ = result_set.render(page, limit, sort, category)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+ORDER_DATE_FORMATS = ("%B %d, %Y", "%b %d, %Y", "%d %B %Y")
+
+
+def parse_order_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a scraped order date such as "December 15, 2025" or "Ordered on ..."."""
+    value = (value or "").strip()
+    for label in ("Ordered on", "Order placed"):
+        if value.startswith(label):
+            value = value[len(label):].strip()
+    for fmt in ORDER_DATE_FORMATS:
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        # Run the coroutine
-        result = loop.run_until_complete(amazon_search(query))
-        return result
-    except Exception as e:
-        logger.error(f"Error running async search: {e}")
-        raise
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def scraped_order_rows(raw_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert scraper output into order-store rows (OrderItem fields)."""
+    rows = []
+    for order in raw_orders:
+        rows.append({
+            "order_id": order.get("order_id") or "unknown",
+            "order_date": parse_order_date(order.get("order_date")),
+            "asin": order.get("asin", ""),
+            "name": order.get("name") or "Unknown Item",
+            "category": None,  # Will be inferred by Aura
+            "price": order.get("price"),
+            "quantity": 1,
+            "image_url": order.get("image_url"),
+            "url": order.get("url"),
+        })
+    return rows
+
+
+def order_item_from_row(row: Dict[str, Any]) -> OrderItem:
+    # Orders whose date could not be parsed are reported as placed now
+    return OrderItem(**{**row, "order_date": row["order_date"] or datetime.now()})
+
+
+def orders_since(days: Optional[int]) -> Optional[datetime]:
+    """Start of the `days` window, from midnight since order dates are day-granular.
+
+    Day alignment also keeps the window (and so the cached /orders body) fixed
+    for the rest of the day.
+    """
+    if not days:
+        return None
+    return datetime.combine((datetime.now() - timedelta(days=days)).date(), datetime.min.time())
+
+
+def order_store_covers(store: "OrderStore", account: str, limit: int, since: Optional[datetime]) -> bool:
+    """True if stored history already reaches back far enough for this request.
+
+    Then a delta scrape (stopping at known orders) is enough; otherwise the
+    scraper walks history in full and the store is backfilled.
+    """
+    if since is not None:
+        oldest = store.oldest_order_date(account)
+        if oldest is not None and oldest <= since:
+            return True
+    return store.count_items(account, since) >= limit
+
+
+def snapshot_covers(
+    state: Dict[str, Any],
+    limit: int,
+    since: Optional[datetime],
+    pages: Optional[int] = None,
+    years: Optional[int] = None,
+) -> bool:
+    """True if the last completed sync walked far enough to answer this request in full.
+
+    A snapshot from a sync with a smaller limit, page budget or year range is
+    stale for a request that asks for more, however recent it is.
+    """
+    if years and (state.get("years") or 0) < years:
+        return False
+    if state.get("complete"):
+        return True
+    # A request capped at fewer pages than were walked asks for no more than the sync saw
+    if pages and (state.get("pages") or 0) >= pages:
+        return True
+    if (state.get("covered_items") or 0) >= limit:
+        return True
+    covered_since = state.get("covered_since")
+    return since is not None and covered_since is not None and covered_since <= since
+
+
+def sync_coverage(
+    params: Dict[str, Any],
+    rows: List[Dict[str, Any]],
+    end: Dict[str, Any],
+    previous: Optional[Dict[str, Any]],
+    incremental: bool,
+) -> Dict[str, Any]:
+    """What a finished sync covered, for OrderStore.mark_synced.
+
+    `end` is the scraper's final {"stage": "end"} progress event. A delta scrape
+    that reached already-synced orders extends the previous sync's coverage.
+    """
+    dates = [row["order_date"] for row in rows if row["order_date"]]
+    if incremental and end.get("reached_known") and previous is not None:
+        years = [y for y in (previous.get("years"), params.get("years")) if y]
+        return {
+            "pages": max(previous.get("pages") or 0, end.get("pages", 0)),
+            "years": max(years) if years else None,
+            # The new orders sit on top of the previously covered run, so at least this many
+            "covered_items": max(previous.get("covered_items") or 0, len(rows)),
+            "covered_since": previous.get("covered_since") or min(dates, default=None),
+            "complete": previous.get("complete", False),
+        }
+    return {
+        "pages": end.get("pages"),
+        "years": params.get("years"),
+        "covered_items": len(rows),
+        "covered_since": min(dates, default=None),
+        "complete": end.get("complete", False),
+    }
+
+
+def orders_snapshot_key(account: str, state: Dict[str, Any], limit: int, since: Optional[datetime]) -> tuple:
+    # A completed sync changes last_sync, and with it the key and the ETag
+    return (account, state["last_sync"], limit, since)
+
+
+# OrderStore calls are serialized by its lock anyway; one thread avoids lock convoys
+STORE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aura-order-store")
+
+
+async def run_store(fn, *args, **kwargs):
+    """Run a synchronous OrderStore call (SQLite I/O behind the store's lock) off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(STORE_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+
+def render_orders_snapshot(store: "OrderStore", key: tuple) -> bytes:
+    """OrdersResponse JSON bytes for a stored snapshot (reads the store; blocking)."""
+    account, _, limit, since = key
+    rows = store.list_items(account, since=since)
+    return to_json(OrdersResponse(orders=[order_item_from_row(row) for row in rows[:limit]], total=len(rows)))
+
+
+async def encoded_orders_snapshot(store: "OrderStore", key: tuple) -> bytes:
+    """OrdersResponse JSON bytes for a stored snapshot, encoded once per sync."""
+    body = ORDERS_BODY_CACHE.get(key)
+    if body is None:
+        with span("orders.snapshot_encode"):
+            body = await run_store(render_orders_snapshot, store, key)
+        ORDERS_BODY_CACHE[key] = body
+    return body
 
 
 @app.get("/health")
@@ -214,18 +910,110 @@ async def health():
     return {
         "status": "healthy",
         "amazon_mcp_available": HAS_AMAZON_MCP,
+        "search_stats": {**SEARCH_STATS, "inflight": len(_inflight_searches)},
+        "search_cache": SEARCH_CACHE.status(),
+        "upstreams": {"search": SEARCH_UPSTREAM.status(), "orders": ORDERS_UPSTREAM.status()},
+        "hot_queries": HOT_QUERIES.status(),
+        "browser_pool": get_browser_pool().status() if HAS_PLAYWRIGHT else None,
+        "order_jobs": {"queued": ORDER_JOBS.queue_depth()},
+        "amazon_clients": get_client_registry().status(),
         "timestamp": datetime.utcnow().isoformat(),
     }
 
 
+# Counters and gauges read from the stats /health already reports, at scrape time
+REGISTRY.callback(
+    "aura_search_requests_total", "counter", "Search requests by outcome",
+    lambda: {(outcome,): SEARCH_STATS[outcome] for outcome in ("hits", "misses", "coalesced", "not_modified")},
+    labelnames=("outcome",),
+)
+REGISTRY.callback(
+    "aura_search_refreshes_total", "counter", "Background search refreshes by trigger",
+    lambda: {("stale",): SEARCH_STATS["refreshes"], ("prefetch",): SEARCH_STATS["prefetches"]},
+    labelnames=("trigger",),
+)
+REGISTRY.callback(
+    "aura_search_cache_lookups_total", "counter", "Search cache lookups by result",
+    lambda: {(result,): SEARCH_CACHE.stats[result] for result in ("hits", "stale_hits", "misses", "errors")},
+    labelnames=("result",),
+)
+REGISTRY.callback(
+    "aura_search_cache_hit_ratio", "gauge", "Share of search cache lookups served (fresh or stale)",
+    lambda: SEARCH_CACHE.status()["hit_rate"],
+)
+REGISTRY.callback(
+    "aura_upstream_calls_total", "counter", "Calls to Amazon by upstream and outcome",
+    lambda: {
+        (upstream.name, outcome): upstream.stats[outcome]
+        for upstream in (SEARCH_UPSTREAM, ORDERS_UPSTREAM)
+        for outcome in ("calls", "failures", "overloads", "rejected", "rate_limited")
+    },
+    labelnames=("upstream", "outcome"),
+)
+REGISTRY.callback(
+    "aura_upstream_inflight", "gauge", "Calls to Amazon in flight by upstream",
+    lambda: {(upstream.name,): upstream.concurrency.inflight for upstream in (SEARCH_UPSTREAM, ORDERS_UPSTREAM)},
+    labelnames=("upstream",),
+)
+REGISTRY.callback(
+    "aura_upstream_concurrency_limit", "gauge", "Adaptive concurrency limit by upstream",
+    lambda: {(upstream.name,): int(upstream.concurrency.limit) for upstream in (SEARCH_UPSTREAM, ORDERS_UPSTREAM)},
+    labelnames=("upstream",),
+)
+REGISTRY.callback(
+    "aura_upstream_circuit_open", "gauge", "1 while an upstream's circuit breaker refuses calls",
+    lambda: {(upstream.name,): int(upstream.breaker.is_open) for upstream in (SEARCH_UPSTREAM, ORDERS_UPSTREAM)},
+    labelnames=("upstream",),
+)
+REGISTRY.callback(
+    "aura_order_jobs_queued", "gauge", "Order sync jobs waiting to run",
+    lambda: ORDER_JOBS.queue_depth(),
+)
+if HAS_PLAYWRIGHT:
+    REGISTRY.callback(
+        "aura_browser_pool_tabs", "gauge", "Browser pool tabs leased, and the tab limit",
+        lambda: {
+            ("leased",): get_browser_pool().status()["active_leases"],
+            ("max",): get_browser_pool().status()["max_tabs"],
+        },
+        labelnames=("state",),
+    )
+    REGISTRY.callback(
+        "aura_browser_pool_events_total", "counter", "Browser pool launches, leases, recycles and crashes",
+        lambda: {(event,): count for event, count in get_browser_pool().stats.items()},
+        labelnames=("event",),
+    )
+REGISTRY.callback(
+    "aura_amazon_client_events_total", "counter", "amazon-mcp client builds, reuses, rebuilds and failures",
+    lambda: {
+        (name, event): count
+        for name, managed in get_client_registry().clients().items()
+        for event, count in managed.stats.items()
+    },
+    labelnames=("client", "event"),
+)
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus text exposition of stage latencies, request latencies,
+    cache, upstream and browser pool metrics. 404 when AMAZON_METRICS=false.
+    """
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail={"error": "metrics_disabled"})
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/search", response_model=SearchResponse)
-def search(
+async def search(
     q: str = Query(..., min_length=1),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     retailer: Optional[str] = None,
     category: Optional[str] = None,
     sort: Optional[str] = "relevance",
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Search Amazon products via amazon-mcp SDK.
@@ -235,14 +1023,29 @@ def search(
         page: Page number (default 1)
         limit: Results per page (default 10, max 100)
         retailer: Filter by retailer (optional, typically "amazon")
-        category: Filter by category (optional)
-        sort: Sort order - "relevance", "price_low", "price_high", "rating", "newest"
+        category: Filter by category (optional, case-insensitive exact match)
+        sort: Sort order - "relevance", "price_low", "price_high", "rating", "newest".
+            Products without a price or rating sort last; "newest" and unknown
+            values keep upstream (relevance) order.
+    
+    Responses carry an ETag, Last-Modified and a Cache-Control max-age equal
+    to the cache entry's remaining TTL. A cached view whose ETag matches
+    If-None-Match gets 304 without contacting amazon-mcp or serializing.
     """
-    # Check cache first
-    cache_key = f"search:{q}:{category}:{page}:{limit}:{sort}"
-    if cache_key in CACHE:
-        logger.debug(f"Cache hit for {cache_key}")
-        return CACHE[cache_key]
+    with span("search.normalize"):
+        key = normalize_query(q)
+    if key != q:
+        SEARCH_STATS["canonicalized"] += 1
+    HOT_QUERIES.record(key, q)
+    log_search_query(q)
+    result_set = await cached_result_set(q)
+    if result_set is not None:
+        logger.debug(f"Cache hit for {q!r}")
+        SEARCH_STATS["hits"] += 1
+        if result_set.is_stale():
+            # Stale-while-revalidate: answer from the cache, refresh behind it
+            refresh_in_background(q)
+        return render_search_view(result_set, page, limit, category, sort, if_none_match)
 
     if not HAS_AMAZON_MCP or not amazon_search:
         raise HTTPException(
@@ -255,47 +1058,14 @@ def search(
         )
 
     try:
-        # amazon_search is async - use sync wrapper
-        logger.info(f"Searching Amazon: {q} (page {page})")
-        result = run_async_search(q)
-        
-        # amazon_search returns tuple: (status_code, results_list)
-        if isinstance(result, tuple):
-            status_code, search_results = result
-            if status_code != 200 or not search_results:
-                return SearchResponse(products=[], total=0, page=page, limit=limit)
-            raw_items = search_results
-        else:
-            # Fallback if return format is different
-            raw_items = result if isinstance(result, list) else []
-
-        # Paginate results
-        products = []
-        total = len(raw_items)
-        start = (page - 1) * limit
-        end = start + limit
-        paginated_items = raw_items[start:end]
-        
-        for item in paginated_items:
-            try:
-                product = normalize_amazon_mcp_result(item)
-                products.append(product)
-            except Exception as e:
-                logger.warning(f"Failed to normalize product: {e}")
-
-        response = SearchResponse(
-            products=products,
-            total=total,
-            page=page,
-            limit=limit,
-        )
-        
-        # Cache the response
-        CACHE[cache_key] = response
-        return response
+        result_set = await singleflight_search(q)
+        return render_search_view(result_set, page, limit, category, sort, if_none_match)
 
     except HTTPException:
         raise
+    except UpstreamUnavailable as e:
+        # Nothing cached to fall back on: fail fast instead of adding to the pile-up
+        raise upstream_unavailable_error(e)
     except Exception as e:
         logger.exception(f"Search failed: {e}")
         raise HTTPException(
@@ -313,15 +1083,27 @@ async def get_orders(
     days: Optional[int] = Query(None, ge=1),
     test: bool = Query(False, description="Return test data"),
     use_scraper: bool = Query(True, description="Use browser scraper for real orders"),
+    pages: Optional[int] = Query(None, ge=1, description="Order-history page budget for the scraper"),
+    years: Optional[int] = Query(None, ge=1, le=20, description="Calendar years of history to walk"),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Fetch user's Amazon order history via browser scraper or MCP SDK.
     
+    With the scraper, this never waits on the browser: it serves the last
+    completed sync from the order store (age in the X-Orders-Snapshot-Age
+    header) and queues a background sync job when that snapshot is older than
+    AMAZON_ORDERS_MAX_AGE. Before the first sync it returns 202 with the job id.
+    The snapshot's ETag changes only when a sync completes; a matching
+    If-None-Match gets 304 without reading the store.
+    
     Args:
         limit: Maximum orders to retrieve (default 50)
-        days: Only fetch orders from last N days (optional)
+        days: Only return orders from last N days (optional)
         test: Return sample test data (default False)
         use_scraper: Use browser automation scraper (recommended, default True)
+        pages: Max order-history pages to scrape (default: enough for `limit`)
+        years: Walk this many calendar years back instead of Amazon's default listing
     """
 
     try:
@@ -372,98 +1154,61 @@ async def get_orders(
         # Use browser scraper if requested and available
         if use_scraper and HAS_PLAYWRIGHT and scrape_amazon_orders:
             logger.info(f"Browser scraper available: HAS_PLAYWRIGHT={HAS_PLAYWRIGHT}, scrape_amazon_orders={scrape_amazon_orders is not None}")
-            email = os.getenv("AMAZON_EMAIL")
-            password = os.getenv("AMAZON_PASSWORD")
-            logger.info(f"Email configured: {bool(email)}, Password configured: {bool(password)}")
+            email, _ = amazon_credentials()
+            store = get_order_store()
+            state = await run_store(store.sync_state, email)
+            
+            # Serve the last completed snapshot; refresh it in the background when it is
+            # too old, or when the sync behind it did not reach as far as this request
+            job = None
+            since = orders_since(days)
+            snapshot_age = time.time() - state["last_sync"] if state else None
+            covered = state is not None and snapshot_covers(state, limit, since, pages, years)
+            if snapshot_age is None or snapshot_age > ORDERS_MAX_AGE or not covered:
+                if ORDERS_UPSTREAM.available:
+                    job = ORDER_JOBS.enqueue(
+                        email, {"limit": limit, "days": days, "pages": pages, "years": years}
+                    )
+                    logger.info(f"Queued order sync job {job.id}")
+                elif state is None:
+                    raise upstream_unavailable_error(orders_circuit_open())
             
-            if not email or not password:
-                raise HTTPException(
-                    status_code=503,
-                    detail={
-                        "error": "Amazon credentials not configured",
-                        "hint": "Set AMAZON_EMAIL and AMAZON_PASSWORD in .env file",
-                    },
+            if state is None:
+                # Nothing synced yet: point the client at the job instead of waiting on a browser
+                return JSONResponse(
+                    status_code=202,
+                    content={"orders": [], "total": 0, "job_id": job.id, "status": job.status},
+                    headers={"Location": f"/orders/jobs/{job.id}", "X-Orders-Sync-Job": job.id},
                 )
             
-            logger.info(f"Using browser scraper to fetch {limit} orders...")
-            try:
-                raw_orders = await scrape_amazon_orders(email, password, max_orders=limit)
-                
-                # Convert to OrderItem format
-                orders = []
-                for order in raw_orders:
-                    try:
-                        order_date_str = order.get("order_date", "")
-                        # Parse various date formats
-                        try:
-                            if "," in order_date_str:
-                                order_date = datetime.strptime(order_date_str, "%B %d, %Y")
-                            else:
-                                order_date = datetime.now()
-                        except:
-                            order_date = datetime.now()
-                        
-                        orders.append(OrderItem(
-                            order_id=order.get("order_id", "unknown"),
-                            order_date=order_date,
-                            asin=order.get("asin", ""),
-                            name=order.get("name", "Unknown Item"),
-                            category=None,  # Will be inferred by Aura
-                            price=order.get("price"),
-                            quantity=1,
-                            image_url=order.get("image_url"),
-                            url=order.get("url"),
-                        ))
-                    except Exception as e:
-                        logger.warning(f"Failed to parse scraped order: {e}")
-                        continue
-                
-                if orders:
-                    return OrdersResponse(
-                        orders=orders[:limit],
-                        total=len(orders),
-                    )
-                else:
-                    logger.warning("Browser scraper returned no orders, will try amazon-mcp")
-            except Exception as scraper_error:
-                logger.warning(f"Browser scraper failed: {scraper_error}, will try amazon-mcp")
+            key = orders_snapshot_key(email, state, limit, since)
+            etag = view_etag(*key)
+            headers = {
+                "ETag": etag,
+                "Last-Modified": http_date(state["last_sync"]),
+                # Fresh until the snapshot is old enough to trigger a refresh
+                "Cache-Control": f"max-age={max(0, int(ORDERS_MAX_AGE - snapshot_age)) if covered else 0}",
+                "X-Orders-Snapshot-Age": str(int(snapshot_age)),
+                "X-Orders-Synced-At": datetime.utcfromtimestamp(state["last_sync"]).isoformat() + "Z",
+            }
+            if job is not None:
+                headers["X-Orders-Sync-Job"] = job.id
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=headers)
+            return Response(content=await encoded_orders_snapshot(store, key), media_type="application/json", headers=headers)
         
         # Fallback: Use amazon-mcp library if available
-        if HAS_AMAZON_MCP and Amazon:
-            logger.info("Falling back to amazon-mcp SDK for orders...")
-            try:
-                # Amazon() auto-detects credentials from environment variables
-                # AMAZON_EMAIL/AMAZON_PASSWORD or AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY
-                amazon = Amazon()
-                # This might not work without AWS credentials, but try anyway
-                logger.warning("amazon-mcp requires AWS credentials or real browser session")
-            except Exception as e:
-                logger.warning(f"amazon-mcp not available: {e}")
-        
-        # If we got here with no orders, return empty
-        logger.info("No orders found from any method")
-        return OrdersResponse(
-            orders=[],
-            total=0,
-            )
-        
-        # Fallback to MCP API
-        if not HAS_AMAZON_MCP:
-            raise HTTPException(
-                status_code=503,
-                detail={
-                    "error": "No order fetching method available",
-                    "hint": "Install playwright (pip install playwright && playwright install chromium) or amazon-mcp",
-                },
-            )
-        
-        client = get_amazon_client()
-        if not client:
+        if not HAS_AMAZON_MCP or not Amazon:
+            logger.info("No orders found from any method")
             return OrdersResponse(orders=[], total=0)
         
-        
-        # Use get_user_orders method - returns httpx.Response
-        response = client.get_user_orders()
+        logger.info("Falling back to amazon-mcp SDK for orders...")
+        # get_user_orders returns an httpx.Response; a 401/403 rebuilds the client once.
+        # Runs in a worker thread: building the client and the request both block
+        response = await AMAZON_CLIENT.call_async(lambda client: client.get_user_orders())
+        if response is None:
+            logger.warning("amazon-mcp not available: client could not be initialized")
+            return OrdersResponse(orders=[], total=0)
         
         # Parse JSON from response
         if hasattr(response, 'json'):
@@ -486,11 +1231,14 @@ async def get_orders(
                 order_id = order.get("orderId") or order.get("order_id") or "unknown"
                 order_date_str = order.get("orderDate") or order.get("order_date") or order.get("date")
                 
-                # Parse date
+                # Parse date: ISO timestamps, or page text such as "August 5, 2025"
+                order_date = None
                 if isinstance(order_date_str, str):
-                    order_date = datetime.fromisoformat(order_date_str.replace("Z", "+00:00"))
-                else:
-                    order_date = datetime.now()
+                    try:
+                        order_date = datetime.fromisoformat(order_date_str.replace("Z", "+00:00"))
+                    except ValueError:
+                        order_date = parse_order_date(order_date_str)
+                order_date = order_date or datetime.now()
                 
                 # Get items from the order
                 items = order.get("items") or order.get("orderItems") or [order]
@@ -532,14 +1280,246 @@ async def get_orders(
         )
 
 
+def amazon_credentials() -> tuple:
+    """(email, password) for the scraper, or a 503 if they are not configured."""
+    email = os.getenv("AMAZON_EMAIL")
+    password = os.getenv("AMAZON_PASSWORD")
+    if not email or not password:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "Amazon credentials not configured",
+                "hint": "Set AMAZON_EMAIL and AMAZON_PASSWORD in .env file",
+            },
+        )
+    return email, password
+
+
+async def run_order_sync_job(job: OrderSyncJob) -> Dict[str, Any]:
+    """Scrape orders for `job.account` into the order store.
+
+    Runs on the account's job worker, so only one scrape uses the browser
+    profile at a time.
+    """
+    params = job.params
+    _, password = amazon_credentials()
+    store = get_order_store()
+    since = orders_since(params.get("days"))
+    previous = await run_store(store.sync_state, job.account)
+    known = await run_store(store.known_order_ids, job.account)
+    # Scrape only the delta when the store already covers what was asked for
+    incremental = bool(known) and await run_store(order_store_covers, store, job.account, params["limit"], since)
+    mode = "delta" if incremental else "full"
+    
+    logger.info(f"Using browser scraper to fetch {params['limit']} orders ({mode})...")
+    job.publish({"type": "progress", "stage": "starting", "mode": mode})
+    rows = []
+    end: Dict[str, Any] = {}
+
+    def on_progress(event: Dict[str, Any]) -> None:
+        if event["stage"] == "end":
+            end.update(event)
+        job.publish({"type": "progress", **event})
+
+    async def scrape() -> None:
+        async for raw_order in iter_amazon_orders(
+            job.account,
+            password,
+            max_orders=params["limit"],
+            max_pages=params.get("pages"),
+            years=params.get("years"),
+            known_order_ids=known if incremental else None,
+            on_progress=on_progress,
+            throttle=ORDERS_UPSTREAM.throttle,
+        ):
+            row = scraped_order_rows([raw_order])[0]
+            rows.append(row)
+            # Streamed to /orders/stream followers as soon as the card is parsed
+            job.publish({"type": "order", "order": row})
+
+    # A scrape that fails counts toward ORDERS_UPSTREAM's circuit breaker;
+    # while it is open, jobs fail immediately instead of driving the browser
+    with span("orders.scrape"):
+        await ORDERS_UPSTREAM.call(scrape)
+    with span("orders.store"):
+        written = await run_store(store.upsert_items, job.account, rows)
+    coverage = sync_coverage(params, rows, end, previous, incremental)
+    await run_store(store.mark_synced, job.account, coverage)
+    logger.info(f"Scraped {len(rows)} order items, stored {written}")
+    return {"mode": mode, "scraped": len(rows), "stored": written}
+
+
+ORDER_JOBS = OrderJobQueue(run_order_sync_job)
+
+
+@app.post("/orders/jobs", status_code=202)
+async def create_order_sync_job(
+    limit: int = Query(50, ge=1, le=500),
+    days: Optional[int] = Query(None, ge=1),
+    pages: Optional[int] = Query(None, ge=1),
+    years: Optional[int] = Query(None, ge=1, le=20),
+):
+    """
+    Queue a background order sync. An identical job that is already queued or
+    running is returned instead of queueing another.
+    """
+    if not HAS_PLAYWRIGHT or not scrape_amazon_orders:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "Browser scraper not available",
+                "hint": "Install playwright (pip install playwright && playwright install chromium)",
+            },
+        )
+    email, _ = amazon_credentials()
+    job = ORDER_JOBS.enqueue(email, {"limit": limit, "days": days, "pages": pages, "years": years})
+    return JSONResponse(
+        status_code=202,
+        content=job.to_dict(),
+        headers={"Location": f"/orders/jobs/{job.id}"},
+    )
+
+
+@app.get("/orders/jobs/{job_id}")
+async def follow_order_sync_job(job_id: str):
+    """
+    Stream a sync job's progress as newline-delimited JSON events, ending when
+    the job succeeds or fails. Finished jobs replay their full event log.
+    """
+    job = ORDER_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail={"error": "job_not_found", "job_id": job_id})
+
+    async def events():
+        async for event in job.follow():
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+def format_stream_event(event: Dict[str, Any], sse: bool) -> str:
+    """One streamed event as an NDJSON line or a Server-Sent Events message."""
+    data = json.dumps(event, default=str)
+    if sse:
+        return f"event: {event.get('type', 'message')}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+@app.get("/orders/stream")
+async def stream_orders(
+    limit: int = Query(50, ge=1, le=500),
+    days: Optional[int] = Query(None, ge=1),
+    pages: Optional[int] = Query(None, ge=1),
+    years: Optional[int] = Query(None, ge=1, le=20),
+    format: Optional[str] = Query(None, pattern="^(ndjson|sse)$", description="ndjson or sse"),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Stream order history as it becomes available instead of as one response.
+    
+    Orders already in the store are sent first. If that snapshot is older than
+    AMAZON_ORDERS_MAX_AGE, a sync job is queued (or joined) and orders it finds
+    that were not in the snapshot follow as soon as each page is parsed, along
+    with the job's status and progress events. The stream ends with a "done"
+    event. Every event is a JSON object with a "type" of "order", "status",
+    "progress" or "done".
+    
+    Args:
+        limit: Maximum orders to stream (default 50)
+        days: Only stream orders from last N days (optional)
+        pages: Max order-history pages to scrape (default: enough for `limit`)
+        years: Walk this many calendar years back instead of Amazon's default listing
+        format: "ndjson" (default) or "sse"; an Accept: text/event-stream
+            header also selects Server-Sent Events
+    """
+    sse = format == "sse" or (format is None and "text/event-stream" in (accept or ""))
+    email, _ = amazon_credentials()
+    store = get_order_store()
+    state = await run_store(store.sync_state, email)
+    since = orders_since(days)
+    
+    job = None
+    if (
+        state is None
+        or time.time() - state["last_sync"] > ORDERS_MAX_AGE
+        or not snapshot_covers(state, limit, since, pages, years)
+    ):
+        if HAS_PLAYWRIGHT and iter_amazon_orders and ORDERS_UPSTREAM.available:
+            job = ORDER_JOBS.enqueue(email, {"limit": limit, "days": days, "pages": pages, "years": years})
+        elif state is None and HAS_PLAYWRIGHT and iter_amazon_orders:
+            raise upstream_unavailable_error(orders_circuit_open())
+        elif state is None:
+            raise HTTPException(
+                status_code=503,
+                detail={
+                    "error": "Browser scraper not available",
+                    "hint": "Install playwright (pip install playwright && playwright install chromium)",
+                },
+            )
+    
+    def order_event(row: Dict[str, Any], source: str) -> Dict[str, Any]:
+        return {"type": "order", "source": source, "order": order_item_from_row(row).model_dump(mode="json")}
+    
+    async def events():
+        sent = set()
+        for row in await run_store(store.list_items, email, since=since, limit=limit):
+            sent.add((row["order_id"], row["asin"]))
+            yield format_stream_event(order_event(row, "snapshot"), sse)
+        
+        if job is not None:
+            async for event in job.follow():
+                if event["type"] != "order":
+                    yield format_stream_event(event, sse)
+                    continue
+                if len(sent) >= limit:
+                    continue
+                row = event["order"]
+                key = (row["order_id"], row["asin"])
+                if key in sent or (since and row["order_date"] and row["order_date"] < since):
+                    continue
+                sent.add(key)
+                yield format_stream_event(order_event(row, "scrape"), sse)
+        
+        yield format_stream_event({"type": "done", "total": len(sent), "job_id": job.id if job else None}, sse)
+    
+    headers = {"Cache-Control": "no-cache"}
+    if job is not None:
+        headers["X-Orders-Sync-Job"] = job.id
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers=headers,
+    )
+
+
 @app.post("/sync/orders")
 async def sync_orders_to_store(
+    body: OrderSyncRequest,
     user_id: str = Header(...),
+    batch_size: int = Query(ORDER_SYNC_BATCH_SIZE, ge=1, le=10000),
 ):
     """
-    Sync Amazon order history to Aura store via webhook callback.
-    This endpoint receives order data and syncs it to IndexedDB.
+    Store a user's Amazon order items in the Aura database.
+    
+    Items are upserted on (user_id, order_id, asin) in batches of
+    `batch_size`, one statement per batch, into Postgres when DATABASE_URL is
+    set (SQLite otherwise). Re-sending items is harmless: unchanged rows are
+    reported as such and left untouched.
+    
+    Args:
+        body: {"orders": [OrderItem, ...]}
+        user_id: Aura user the orders belong to (header)
+        batch_size: Items per upsert statement
     """
-    # This is called by the Next.js app after fetching orders
-    logger.info(f"Syncing orders for user {user_id}")
-    return {"status": "synced"}
+    items = [order.model_dump() for order in body.orders]
+    logger.info(f"Syncing {len(items)} orders for user {user_id}")
+    try:
+        result = await sync_order_batches(user_id, items, batch_size)
+    except Exception as e:
+        logger.error(f"Order sync failed for user {user_id}: {e}")
+        raise HTTPException(status_code=500, detail={"error": "sync_failed", "message": str(e)})
+    logger.info(
+        f"Synced orders for user {user_id}: {result['inserted']} inserted, "
+        f"{result['updated']} updated, {result['unchanged']} unchanged ({result['backend']})"
+    )
+    return {"status": "synced", "user_id": user_id, **result}
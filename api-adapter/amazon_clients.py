@@ -0,0 +1,244 @@
+"""
+Process-wide amazon-mcp clients, built once and reused.
+
+Constructing an amazon-mcp client repeats credential discovery and opens new
+HTTP connections. A ManagedClient builds its client on first use and hands
+the same instance to every later caller, so its connection pool stays warm.
+It also:
+
+- probes the client's health every `health_check_interval` seconds and
+  rebuilds it when the probe fails, e.g. after its HTTP client was closed;
+- backs off for `retry_after` seconds after a failed construction, so missing
+  credentials are not rediscovered on every request;
+- rebuilds the client and retries once when a call fails with 401/403.
+
+adapter.py and mcp_server.py register their clients in the shared registry
+returned by `get_client_registry()`. The adapter closes it on shutdown. Builds,
+probes and SDK calls block, so async code goes through `get_async()` /
+`call_async()`, which run them in a worker thread.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("aura-amazon-clients")
+
+# Seconds between health probes of a reused client
+CLIENT_HEALTH_CHECK_INTERVAL = float(os.getenv("AMAZON_CLIENT_HEALTH_CHECK_INTERVAL", "60"))
+# Seconds to wait before retrying a client construction that failed
+CLIENT_RETRY_AFTER = float(os.getenv("AMAZON_CLIENT_RETRY_AFTER", "30"))
+
+AUTH_FAILURE_STATUS_CODES = (401, 403)
+# Attributes under which SDK clients commonly keep their HTTP client
+_HTTP_CLIENT_ATTRS = ("client", "_client", "http_client", "_http_client", "session", "_session")
+
+
+def is_auth_failure(result: Any) -> bool:
+    """Whether `result` (a response, or an exception) is an authentication failure."""
+    response = getattr(result, "response", None) if isinstance(result, BaseException) else result
+    return getattr(response, "status_code", None) in AUTH_FAILURE_STATUS_CODES
+
+
+def default_probe(client: Any) -> bool:
+    """Healthy unless the client, or an HTTP client it holds, has been closed."""
+    for target in [client] + [getattr(client, attr, None) for attr in _HTTP_CLIENT_ATTRS]:
+        if getattr(target, "is_closed", False) is True or getattr(target, "closed", False) is True:
+            return False
+    return True
+
+
+def close_client(client: Any) -> None:
+    """Close a client's connections, if it knows how."""
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"Error closing Amazon client: {e}")
+
+
+class ManagedClient:
+    """One lazily built, reused client.
+
+    Args:
+        name: Name in logs, /health and metrics
+        factory: Builds a new client (e.g. amazon_mcp's `Amazon`)
+        probe: Returns False when a built client can no longer be used
+            (default: `default_probe`)
+        health_check_interval: Seconds between probes of the reused client
+        retry_after: Seconds before retrying a construction that failed
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        probe: Optional[Callable[[Any], bool]] = None,
+        health_check_interval: float = CLIENT_HEALTH_CHECK_INTERVAL,
+        retry_after: float = CLIENT_RETRY_AFTER,
+    ):
+        self.name = name
+        self.factory = factory
+        self.probe = probe or default_probe
+        self.health_check_interval = health_check_interval
+        self.retry_after = retry_after
+
+        self._client: Any = None
+        self._built_at = 0.0
+        self._last_health_check = 0.0
+        self._failed_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self.stats = {"builds": 0, "reuses": 0, "rebuilds": 0, "build_failures": 0, "auth_failures": 0}
+
+    def get(self) -> Optional[Any]:
+        """The shared client, built on first use; None while it cannot be built."""
+        with self._lock:
+            if self._client is not None:
+                if time.monotonic() - self._last_health_check > self.health_check_interval:
+                    self._health_check()
+            if self._client is not None:
+                self.stats["reuses"] += 1
+                return self._client
+            if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_after:
+                return None
+            return self._build()
+
+    def _build(self) -> Optional[Any]:
+        started = time.perf_counter()
+        try:
+            client = self.factory()
+        except Exception as e:
+            self._failed_at = time.monotonic()
+            self._last_error = str(e)
+            self.stats["build_failures"] += 1
+            logger.warning(f"Failed to initialize Amazon client {self.name!r}: {e}")
+            return None
+        self._client = client
+        self._built_at = self._last_health_check = time.monotonic()
+        self._failed_at = None
+        self._last_error = None
+        self.stats["builds"] += 1
+        logger.info(f"Amazon client {self.name!r} initialized in {time.perf_counter() - started:.2f}s")
+        return client
+
+    def _health_check(self) -> None:
+        try:
+            healthy = bool(self.probe(self._client))
+        except Exception as e:
+            logger.debug(f"Amazon client {self.name!r} probe failed: {e}")
+            healthy = False
+        self._last_health_check = time.monotonic()
+        if not healthy:
+            self._discard("failed health check")
+
+    def _discard(self, reason: str) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            logger.warning(f"Rebuilding Amazon client {self.name!r}: {reason}")
+            self.stats["rebuilds"] += 1
+            close_client(client)
+
+    def invalidate(self, reason: str = "invalidated") -> None:
+        """Drop the client; the next `get()` builds a new one (no backoff)."""
+        with self._lock:
+            self._discard(reason)
+            self._failed_at = None
+
+    def call(self, fn: Callable[[Any], Any]) -> Any:
+        """Run `fn(client)`, rebuilding the client and retrying once on an auth failure.
+
+        Returns None when no client can be built. A 401/403 from the retry is
+        returned (or raised) to the caller as-is.
+        """
+        client = self.get()
+        if client is None:
+            return None
+        try:
+            result = fn(client)
+        except Exception as e:
+            if not is_auth_failure(e):
+                raise
+            result = e
+        if not is_auth_failure(result):
+            return result
+        self.stats["auth_failures"] += 1
+        self.invalidate("authentication failed")
+        client = self.get()
+        if client is None:
+            if isinstance(result, BaseException):
+                raise result
+            return result
+        return fn(client)
+
+    async def get_async(self) -> Optional[Any]:
+        """`get()` in a worker thread, so a build or probe never blocks the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.get)
+
+    async def call_async(self, fn: Callable[[Any], Any]) -> Any:
+        """`call()` in a worker thread; use it from async code, since SDK calls block."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.call, fn)
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+            if client is not None:
+                close_client(client)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self._client is not None,
+            "age": round(time.monotonic() - self._built_at, 1) if self._client is not None else None,
+            "last_error": self._last_error,
+            **self.stats,
+        }
+
+
+class ClientRegistry:
+    """Named ManagedClients shared across the process."""
+
+    def __init__(self):
+        self._clients: Dict[str, ManagedClient] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any], **kwargs) -> ManagedClient:
+        """The client registered under `name`, registering `factory` for it if it is new."""
+        with self._lock:
+            if name not in self._clients:
+                self._clients[name] = ManagedClient(name, factory, **kwargs)
+            return self._clients[name]
+
+    def get(self, name: str) -> Optional[Any]:
+        managed = self._clients.get(name)
+        return managed.get() if managed is not None else None
+
+    def clients(self) -> Dict[str, ManagedClient]:
+        return dict(self._clients)
+
+    def close(self) -> None:
+        """Close every built client; each is rebuilt lazily if used again."""
+        for managed in self.clients().values():
+            managed.close()
+
+    def status(self) -> Dict[str, Any]:
+        return {name: managed.status() for name, managed in self.clients().items()}
+
+
+_client_registry: Optional[ClientRegistry] = None
+
+
+def get_client_registry() -> ClientRegistry:
+    """Return the process-wide client registry, creating it on first use."""
+    global _client_registry
+    if _client_registry is None:
+        _client_registry = ClientRegistry()
+    return _client_registry
+
+
+def close_client_registry() -> None:
+    """Close every client in the shared registry, if one was created."""
+    if _client_registry is not None:
+        _client_registry.close()
@@ -5,166 +5,857 @@ This scraper logs into Amazon and extracts real order data from your account.
 Requires AMAZON_EMAIL and AMAZON_PASSWORD environment variables.
 """
 import os
+import json
+import inspect
+import math
 import asyncio
-from typing import List, Dict, Optional
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Set, Callable, Awaitable, AsyncIterator, Any
 from datetime import datetime
 import logging
 from pathlib import Path
+from urllib.parse import urlencode
 
 try:
-    from playwright.async_api import async_playwright, Browser, Page
+    from playwright.async_api import async_playwright, Page, BrowserContext, ElementHandle, Error as PlaywrightError
     HAS_PLAYWRIGHT = True
 except ImportError:
     HAS_PLAYWRIGHT = False
+    PlaywrightError = Exception
+    ElementHandle = None
+
+try:
+    from bs4 import BeautifulSoup
+    HAS_BS4 = True
+except ImportError:
+    HAS_BS4 = False
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+from metrics import METRICS_ENABLED, REGISTRY, span, timed
+from resource_policy import RESOURCE_BLOCKING_ENABLED, ResourcePolicy
+from scrape_archive import LatencyProfile, ScrapeArchive
 
 logger = logging.getLogger("amazon-scraper")
 
+AMAZON_URL = "https://www.amazon.com"
+ORDER_HISTORY_URL = f"{AMAZON_URL}/gp/your-account/order-history"
+# Paginated listing addressed by startIndex / timeFilter query parameters
+ORDERS_LIST_URL = f"{AMAZON_URL}/your-orders/orders"
+ORDERS_PER_PAGE = 10
+# Hard cap on order-history pages per scrape, and pages fetched at once
+MAX_ORDER_PAGES = int(os.getenv("AMAZON_ORDER_PAGE_BUDGET", "50"))
+ORDER_PAGE_CONCURRENCY = int(os.getenv("AMAZON_ORDER_PAGE_CONCURRENCY", "3"))
+
+# Persistent Chromium profile holding the Amazon session cookies
+SESSION_DIR = Path.home() / ".aura" / "amazon-session"
+# When each account's session was last verified against the order-history page
+SESSION_STATE_FILE = Path.home() / ".aura" / "amazon-session-state.json"
+# How long a verified session is trusted before it is checked against Amazon again
+SESSION_VERIFY_TTL = float(os.getenv("AMAZON_SESSION_TTL", str(6 * 3600)))
+
+# Record every Amazon page load into a HAR file, or replay page loads from one
+# with no network access (see scrape_archive.py). Replayed responses can be
+# delayed by a latency profile, e.g. "recorded=1" or "base=0.2,jitter=0.1".
+SCRAPE_RECORD_PATH = os.getenv("AMAZON_SCRAPE_RECORD")
+SCRAPE_REPLAY_PATH = os.getenv("AMAZON_SCRAPE_REPLAY")
+SCRAPE_REPLAY_LATENCY = os.getenv("AMAZON_SCRAPE_REPLAY_LATENCY", "")
+
+# Cookies that carry the signed-in state; at least one must be present and unexpired
+AUTH_COOKIES = ("at-main", "sess-at-main", "x-main")
+
+ORDERS_READY_SELECTOR = "#ordersContainer, .your-orders-content-container, [data-order-id], .order-card"
+# How long an order-history page may take to show its order cards (or the empty list), in ms
+ORDERS_READY_TIMEOUT = float(os.getenv("AMAZON_ORDERS_READY_TIMEOUT", "15000"))
+SIGNIN_FORM_SELECTOR = "#ap_email, #ap_password, form[name='signIn']"
+EMAIL_SELECTORS = ["#ap_email", "input[name='email']", "input[type='email']", "input[autocomplete='username']"]
+PASSWORD_SELECTORS = ["#ap_password", "input[name='password']", "input[type='password']", "input[autocomplete='current-password']"]
+
+
+ORDER_CARD_SELECTOR = "div.a-box.group.order, .order-card, [data-order-id], div.order"
+ORDER_ITEM_SELECTOR = ".shipment .a-link-normal, a[href*='/dp/'], a[href*='/gp/product']"
+# Tried in order; after these, the first span containing "Ordered on" / "$"
+ORDER_DATE_SELECTORS = ["span.order-date-invoice-item", ".order-info .a-color-secondary"]
+ORDER_PRICE_SELECTORS = [".a-color-price", ".a-row .a-color-secondary .value"]
+
+EXTRACT_ORDERS_ARGS = {
+    "card": ORDER_CARD_SELECTOR,
+    "item": ORDER_ITEM_SELECTOR,
+    "dates": ORDER_DATE_SELECTORS,
+    "prices": ORDER_PRICE_SELECTORS,
+}
+
+# Same selector logic as AmazonScraper._extract_records_with_handles, run in the
+# page so a whole order-history page comes back in one round-trip.
+EXTRACT_ORDERS_JS = """
+(sel) => {
+  const text = (el) => (el ? (el.innerText || el.textContent || "") : "");
+  const spanWithText = (root, needle) =>
+    Array.from(root.querySelectorAll("span")).find((el) => text(el).includes(needle)) || null;
+
+  return Array.from(document.querySelectorAll(sel.card)).map((card) => {
+    let orderId = card.getAttribute("data-order-id") || "";
+    if (!orderId) {
+      const el = spanWithText(card, "Order #");
+      orderId = (el ? text(el) : "unknown").replace("Order #", "").trim();
+    }
+
+    let date = null;
+    for (const s of sel.dates) {
+      const el = card.querySelector(s);
+      if (el) { date = text(el); break; }
+    }
+    if (date === null) {
+      const el = spanWithText(card, "Ordered on");
+      date = el ? text(el) : "";
+    }
+
+    const priceTexts = [];
+    for (const s of sel.prices) {
+      const el = card.querySelector(s);
+      if (el) priceTexts.push(text(el));
+    }
+    const dollar = spanWithText(card, "$");
+    if (dollar) priceTexts.push(text(dollar));
+
+    const cardImg = card.querySelector("img");
+    const items = Array.from(card.querySelectorAll(sel.item)).map((a) => {
+      const img = a.querySelector("img") || cardImg;
+      return {
+        name: a.getAttribute("title") || text(a),
+        href: a.getAttribute("href"),
+        image: img ? img.getAttribute("src") : null,
+      };
+    });
+
+    return { order_id: orderId, order_date: date, price_texts: priceTexts, items: items };
+  });
+}
+"""
+
+
+# Where offline HTML parsing runs: "thread" or "process" pool, and its size
+PARSE_EXECUTOR = os.getenv("AMAZON_PARSE_EXECUTOR", "thread")
+PARSE_WORKERS = int(os.getenv("AMAZON_PARSE_WORKERS", "2"))
+_parse_executor: Optional[Executor] = None
+# Extraction used by scrape_orders unless told otherwise
+DEFAULT_EXTRACTION = "html" if HAS_BS4 else "evaluate"
+
+
+def _text(el) -> str:
+    return el.get_text(" ", strip=True) if el is not None else ""
+
+
+def _span_with_text(root, needle: str):
+    for el in root.find_all("span"):
+        if needle in el.get_text():
+            return el
+    return None
+
+
+def parse_order_history_records(html: str) -> List[Dict]:
+    """Parse an order-history page into structured order-card records.
+
+    Browser-free equivalent of EXTRACT_ORDERS_JS: same selectors, same
+    fallbacks, same record shape. Pure function of `html`, so it can run in a
+    thread or process pool.
+    """
+    if not HAS_BS4:
+        raise ImportError("beautifulsoup4 not installed. Run: pip install beautifulsoup4")
+    soup = BeautifulSoup(html, HTML_PARSER)
+    records = []
+    for card in soup.select(ORDER_CARD_SELECTOR):
+        order_id = card.get("data-order-id") or ""
+        if not order_id:
+            el = _span_with_text(card, "Order #")
+            order_id = (_text(el) if el else "unknown").replace("Order #", "").strip()
+
+        date = None
+        for sel in ORDER_DATE_SELECTORS:
+            el = card.select_one(sel)
+            if el is not None:
+                date = _text(el)
+                break
+        if date is None:
+            date = _text(_span_with_text(card, "Ordered on"))
+
+        price_texts = []
+        for sel in ORDER_PRICE_SELECTORS:
+            el = card.select_one(sel)
+            if el is not None:
+                price_texts.append(_text(el))
+        dollar = _span_with_text(card, "$")
+        if dollar is not None:
+            price_texts.append(_text(dollar))
+
+        card_img = card.find("img")
+        items = []
+        for a in card.select(ORDER_ITEM_SELECTOR):
+            img = a.find("img") or card_img
+            items.append({
+                "name": a.get("title") or _text(a),
+                "href": a.get("href"),
+                "image": img.get("src") if img is not None else None,
+            })
+
+        records.append({
+            "order_id": order_id,
+            "order_date": date,
+            "price_texts": price_texts,
+            "items": items,
+        })
+    return records
+
+
+def parse_order_history_html(html: str, max_orders: Optional[int] = None) -> List[Dict]:
+    """Parse an order-history page into one dict per ordered item, without a browser."""
+    return order_records_to_items(parse_order_history_records(html), max_orders)
+
+
+def get_parse_executor() -> Executor:
+    """Return the pool that order-page HTML is parsed in, off the event loop."""
+    global _parse_executor
+    if _parse_executor is None:
+        if PARSE_EXECUTOR == "process":
+            _parse_executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        else:
+            _parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="order-parse")
+    return _parse_executor
+
+
+def shutdown_parse_executor() -> None:
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
+
+
+async def parse_order_history_records_async(html: str) -> List[Dict]:
+    """Run parse_order_history_records in the parse executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), parse_order_history_records, html)
+
+
+def parse_price_text(price_str: Optional[str]) -> Optional[float]:
+    """Parse a price like "$1,299.99"; None if it is not a plain price."""
+    if not price_str:
+        return None
+    try:
+        return float(price_str.replace("$", "").replace(",", ""))
+    except ValueError:
+        return None
+
+
+def order_records_to_items(records: List[Dict], max_orders: Optional[int] = None) -> List[Dict]:
+    """Flatten structured order-card records into one dict per ordered item.
+
+    Each record is {"order_id", "order_date", "price_texts", "items": [{"name",
+    "href", "image"}]}, as produced by the extractors. The card's price is the
+    first candidate text that parses as a price.
+    """
+    orders = []
+    for record in records:
+        price = None
+        for price_str in record.get("price_texts") or []:
+            price = parse_price_text(price_str)
+            if price is not None:
+                break
+
+        for item in record.get("items") or []:
+            if max_orders is not None and len(orders) >= max_orders:
+                return orders
+            url = item.get("href")
+            # Extract ASIN from URL
+            asin = ""
+            if url and "/dp/" in url:
+                asin = url.split("/dp/")[1].split("/")[0]
+            orders.append({
+                "order_id": record.get("order_id") or "unknown",
+                "order_date": record.get("order_date") or "",
+                "asin": asin,
+                "name": (item.get("name") or "").strip(),
+                "price": price,
+                "image_url": item.get("image"),
+                "url": f"{AMAZON_URL}{url}" if url and url.startswith("/") else url,
+            })
+    return orders
+
+
+def order_history_page_url(start_index: int = 0, time_filter: Optional[str] = None) -> str:
+    """URL of the order-history page starting at order `start_index`."""
+    params = {"startIndex": start_index}
+    if time_filter:
+        params["timeFilter"] = time_filter
+    return f"{ORDERS_LIST_URL}?{urlencode(params)}"
+
+
+def order_time_filters(years: Optional[int] = None, today: Optional[datetime] = None) -> List[Optional[str]]:
+    """timeFilter values covering the last `years` calendar years, newest first.
+
+    [None] (Amazon's default listing) when no year budget is given.
+    """
+    if not years:
+        return [None]
+    year = (today or datetime.now()).year
+    return [f"year-{year - i}" for i in range(years)]
+
+
+def contains_known_order(records: List[Dict], known_order_ids: Optional[Set[str]]) -> bool:
+    """True if any order-card record is one we have already synced."""
+    return bool(known_order_ids) and any(r.get("order_id") in known_order_ids for r in records)
+
+
+def auth_cookies_valid(cookies: List[Dict], now: Optional[float] = None) -> bool:
+    """True if any Amazon auth cookie is present and not expired.
+
+    Cookies with `expires == -1` are session cookies and live as long as the
+    browser context, so they count as valid.
+    """
+    now = now or time.time()
+    for cookie in cookies:
+        if cookie.get("name") in AUTH_COOKIES:
+            expires = cookie.get("expires", -1)
+            if expires == -1 or expires > now:
+                return True
+    return False
+
+
+class OrderPageError(Exception):
+    """An order-history page loaded without an order list (sign-in, captcha or error page)."""
+
+
+class SessionState:
+    """Records when each account's persistent session was last verified.
+
+    Stored as JSON next to the browser profile so it survives restarts.
+    """
+
+    def __init__(self, path: Path = SESSION_STATE_FILE, ttl: float = SESSION_VERIFY_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._state: Optional[Dict[str, float]] = None
+
+    def _load(self) -> Dict[str, float]:
+        if self._state is None:
+            try:
+                self._state = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._state = {}
+        return self._state
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._state))
+        except OSError as e:
+            logger.warning(f"Could not save session state: {e}")
+
+    def recently_verified(self, email: str) -> bool:
+        verified_at = self._load().get(email)
+        return verified_at is not None and time.time() - verified_at < self.ttl
+
+    def mark_verified(self, email: str) -> None:
+        self._load()[email] = time.time()
+        self._save()
+
+    def invalidate(self, email: str) -> None:
+        if self._load().pop(email, None) is not None:
+            self._save()
+
+
+class BrowserPool:
+    """Long-lived persistent Chromium context shared by every scrape.
+
+    Chromium cannot open one profile directory from two browsers at once, so the
+    pool keeps a single persistent context on the session profile and leases
+    pages (tabs) from it, at most `max_tabs` at a time. The context is launched
+    lazily (or up front by `start()`), health-checked before leases, and
+    relaunched after `max_uses` leases, after a crash, or when it was closed.
+    """
+
+    def __init__(
+        self,
+        user_data_dir: Optional[Path] = None,
+        headless: bool = True,
+        max_uses: Optional[int] = None,
+        max_tabs: Optional[int] = None,
+        health_check_interval: float = 30.0,
+        on_launch: Optional[Callable[["BrowserContext"], Awaitable[None]]] = None,
+        archive: Optional[ScrapeArchive] = None,
+        resource_policy: Optional[ResourcePolicy] = None,
+    ):
+        self.user_data_dir = Path(user_data_dir or SESSION_DIR)
+        self.headless = headless
+        self.max_uses = max_uses or int(os.getenv("AMAZON_BROWSER_MAX_USES", "50"))
+        self.max_tabs = max_tabs or int(os.getenv("AMAZON_BROWSER_MAX_TABS", "4"))
+        self.health_check_interval = health_check_interval
+        # Called with each freshly launched context, e.g. to install routes
+        self.on_launch = on_launch
+        # Records page loads into, or replays them from, a HAR archive
+        self.archive = archive
+        # Aborts requests for resources the scraper never reads (images, fonts, ads)
+        self.resource_policy = resource_policy
+
+        self._playwright = None
+        self._context: Optional["BrowserContext"] = None
+        self._healthy = False
+        self._last_health_check = 0.0
+        self._uses = 0
+        self._active = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._tabs: Optional[asyncio.Semaphore] = None
+        self.stats = {"launches": 0, "leases": 0, "recycles": 0, "crashes": 0}
+
+    @property
+    def context(self) -> Optional["BrowserContext"]:
+        return self._context
+
+    @property
+    def running(self) -> bool:
+        return self._context is not None and self._healthy
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "active_leases": self._active,
+            "uses": self._uses,
+            "max_uses": self.max_uses,
+            "max_tabs": self.max_tabs,
+            **self.stats,
+            "archive": self.archive.status() if self.archive is not None else None,
+            "resource_policy": self.resource_policy.status() if self.resource_policy is not None else None,
+        }
+
+    def _primitives(self):
+        # Created on first use so they bind to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+            self._tabs = asyncio.Semaphore(self.max_tabs)
+        return self._lock, self._tabs
+
+    async def start(self) -> None:
+        """Launch the context ahead of the first lease (warmup)."""
+        if not HAS_PLAYWRIGHT:
+            raise ImportError("playwright not installed. Run: pip install playwright && playwright install")
+        lock, _ = self._primitives()
+        async with lock:
+            if self._context is None:
+                await self._launch()
+
+    async def stop(self) -> None:
+        """Close the context and stop the playwright driver."""
+        lock, _ = self._primitives()
+        async with lock:
+            await self._close()
+            if self.archive is not None:
+                self.archive.save()
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception as e:
+                    logger.debug(f"Error stopping playwright: {e}")
+                self._playwright = None
+
+    async def _launch(self) -> None:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self.user_data_dir.mkdir(parents=True, exist_ok=True)
+
+        started = time.perf_counter()
+        # launch_persistent_context manages browser+context together
+        with span("browser.launch"):
+            context = await self._playwright.chromium.launch_persistent_context(
+                user_data_dir=str(self.user_data_dir),
+                headless=self.headless,
+                viewport={"width": 1280, "height": 720},
+            )
+        context.on("close", lambda _: self._on_context_closed(context))
+        if self.on_launch:
+            await self.on_launch(context)
+        if self.archive is not None:
+            await self.archive.install(context)
+        # Installed last so it runs first; allowed requests fall back to the routes above
+        if self.resource_policy is not None:
+            await self.resource_policy.install(context)
+
+        self._context = context
+        self._healthy = True
+        self._last_health_check = time.monotonic()
+        self._uses = 0
+        self.stats["launches"] += 1
+        logger.info(f"Browser context launched in {time.perf_counter() - started:.2f}s")
+
+    async def _close(self) -> None:
+        context, self._context = self._context, None
+        self._healthy = False
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser context: {e}")
+
+    def _on_context_closed(self, context: "BrowserContext") -> None:
+        # Ignore close events from contexts we already retired ourselves
+        if context is self._context:
+            self._mark_unhealthy("context closed")
+
+    def _mark_unhealthy(self, reason: str) -> None:
+        if self._healthy:
+            logger.warning(f"Browser context unhealthy: {reason}")
+            self.stats["crashes"] += 1
+        self._healthy = False
+
+    async def health_check(self) -> bool:
+        """Cheap liveness probe: a round-trip to the browser for the context's cookies."""
+        if self._context is None or not self._healthy:
+            return False
+        try:
+            await asyncio.wait_for(self._context.cookies(), timeout=5)
+            self._last_health_check = time.monotonic()
+            return True
+        except Exception as e:
+            self._mark_unhealthy(f"health check failed: {e}")
+            return False
+
+    async def _acquire_context(self) -> "BrowserContext":
+        lock, _ = self._primitives()
+        async with lock:
+            if self._context is not None and self._healthy:
+                if time.monotonic() - self._last_health_check > self.health_check_interval:
+                    await self.health_check()
+            if self._context is None or not self._healthy:
+                await self._close()
+                await self._launch()
+            elif self._uses >= self.max_uses and self._active == 0:
+                logger.info(f"Recycling browser context after {self._uses} uses")
+                self.stats["recycles"] += 1
+                await self._close()
+                await self._launch()
+            self._active += 1
+            return self._context
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["Page"]:
+        """Lease a fresh page in the pooled context; it is closed on release."""
+        if not HAS_PLAYWRIGHT:
+            raise ImportError("playwright not installed. Run: pip install playwright && playwright install")
+        _, tabs = self._primitives()
+        async with tabs:
+            context = await self._acquire_context()
+            self.stats["leases"] += 1
+            page = None
+            try:
+                page = await context.new_page()
+                page.on("crash", lambda _: self._mark_unhealthy("page crashed"))
+                yield page
+            except PlaywrightError as e:
+                if "closed" in str(e).lower() or "crash" in str(e).lower():
+                    self._mark_unhealthy(str(e))
+                raise
+            finally:
+                self._active -= 1
+                self._uses += 1
+                if page is not None and self._healthy:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+
+
+_browser_pool: Optional[BrowserPool] = None
+
+
+def scrape_archive_from_env() -> Optional[ScrapeArchive]:
+    """The archive AMAZON_SCRAPE_REPLAY / AMAZON_SCRAPE_RECORD ask for, if any (replay wins)."""
+    if SCRAPE_REPLAY_PATH:
+        return ScrapeArchive(Path(SCRAPE_REPLAY_PATH), "replay", LatencyProfile.parse(SCRAPE_REPLAY_LATENCY))
+    if SCRAPE_RECORD_PATH:
+        return ScrapeArchive(Path(SCRAPE_RECORD_PATH), "record")
+    return None
+
+
+def resource_policy_from_env() -> Optional[ResourcePolicy]:
+    """The resource policy for new pools, unless AMAZON_BLOCK_RESOURCES turns blocking off."""
+    return ResourcePolicy() if RESOURCE_BLOCKING_ENABLED else None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, creating it on first use."""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(archive=scrape_archive_from_env(), resource_policy=resource_policy_from_env())
+    return _browser_pool
+
+
+async def start_browser_pool(pool: Optional[BrowserPool] = None) -> BrowserPool:
+    """Install `pool` (or the default pool) as the shared pool and warm it up."""
+    global _browser_pool
+    if pool is not None:
+        _browser_pool = pool
+    pool = get_browser_pool()
+    await pool.start()
+    return pool
+
+
+async def stop_browser_pool() -> None:
+    """Shut down the shared pool, if one was created."""
+    if _browser_pool is not None:
+        await _browser_pool.stop()
+
+
+PLAYWRIGHT_CALLS = REGISTRY.counter(
+    "aura_playwright_calls_total", "Awaited Playwright calls (browser round-trips) by method", labelnames=("method",)
+)
+SCRAPE_ROUNDTRIPS = REGISTRY.histogram(
+    "aura_scrape_playwright_roundtrips", "Playwright round-trips per order scrape",
+    buckets=(5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+
+
+class RoundTrips:
+    """Counts the Playwright calls one scrape makes.
+
+    Pages, contexts and element handles are wrapped in `_Counted` proxies;
+    every awaited method on them is one round-trip to the browser.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def wrap(self, target):
+        if target is None:
+            return None
+        return _Counted(target, self)
+
+    def _wrap_result(self, result):
+        if ElementHandle is not None:
+            if isinstance(result, ElementHandle):
+                return _Counted(result, self)
+            if isinstance(result, list) and result and isinstance(result[0], ElementHandle):
+                return [_Counted(handle, self) for handle in result]
+        return result
+
+
+class _Counted:
+    __slots__ = ("_target", "_trips")
+
+    def __init__(self, target, trips: RoundTrips):
+        self._target = target
+        self._trips = trips
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+        trips = self._trips
+
+        async def counted(*args, **kwargs):
+            trips.count += 1
+            PLAYWRIGHT_CALLS.inc((name,))
+            return trips._wrap_result(await attr(*args, **kwargs))
+        return counted
+
 
 class AmazonScraper:
-    """Scrapes Amazon order history using browser automation."""
+    """Scrapes Amazon order history using browser automation.
+
+    Pages are leased from a `BrowserPool`; by default the process-wide pool, so
+    the browser stays up between scrapes.
+    """
     
-    def __init__(self, email: str, password: str, headless: bool = True):
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        headless: bool = True,
+        pool: Optional[BrowserPool] = None,
+        session_state: Optional[SessionState] = None,
+        throttle: Optional[Callable[[], Awaitable[None]]] = None,
+    ):
         self.email = email
         self.password = password
         self.headless = headless
-        self.browser: Optional[Browser] = None
+        self.pool = pool
+        self.session_state = session_state or SessionState()
+        # Awaited before every page load (e.g. a rate limiter shared across scrapes)
+        self.throttle = throttle
+        # Set when a scrape finds itself on the sign-in page despite a trusted session
+        self.session_expired = False
+        # The error that ended the last iter_orders walk early, if any
+        self.last_error: Optional[Exception] = None
+        # Playwright calls made through this scraper, when metrics are enabled
+        self.roundtrips = RoundTrips() if METRICS_ENABLED else None
         self.context = None
         self.page: Optional[Page] = None
+        self._lease = None
+        self._owns_pool = False
         
     async def __aenter__(self):
-        """Context manager entry - launches browser."""
+        """Context manager entry - leases a page from the browser pool."""
         if not HAS_PLAYWRIGHT:
             raise ImportError("playwright not installed. Run: pip install playwright && playwright install")
         
-        playwright = await async_playwright().start()
-        # Create persistent context to save cookies
-        user_data_dir = Path.home() / ".aura" / "amazon-session"
-        user_data_dir.mkdir(parents=True, exist_ok=True)
-
-        # launch_persistent_context manages browser+context together
-        self.context = await playwright.chromium.launch_persistent_context(
-            user_data_dir=str(user_data_dir),
-            headless=self.headless,
-            viewport={"width": 1280, "height": 720},
-        )
-        self.browser = self.context.browser
-        self.page = await self.context.new_page()
+        if self.pool is None:
+            if self.headless:
+                self.pool = get_browser_pool()
+            else:
+                # A visible browser (e.g. for manual 2FA) gets its own short-lived pool
+                self.pool = BrowserPool(
+                    headless=False, archive=scrape_archive_from_env(), resource_policy=resource_policy_from_env()
+                )
+                self._owns_pool = True
+        self._lease = self.pool.lease()
+        self.page = self._counted(await self._lease.__aenter__())
+        self.context = self._counted(self.pool.context)
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - closes browser."""
-        if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
+        """Context manager exit - returns the page to the pool."""
+        if self._lease is not None:
+            lease, self._lease = self._lease, None
+            await lease.__aexit__(exc_type, exc_val, exc_tb)
+        if self._owns_pool:
+            await self.pool.stop()
+        elif self.pool.archive is not None:
+            self.pool.archive.save()
+        if self.roundtrips is not None:
+            SCRAPE_ROUNDTRIPS.observe(self.roundtrips.count)
+
+    def _counted(self, target):
+        """`target` wrapped to count its Playwright calls, or as-is with metrics disabled."""
+        return self.roundtrips.wrap(target) if self.roundtrips is not None else target
             
+    async def _before_page_load(self) -> None:
+        if self.throttle is not None:
+            await self.throttle()
+
+    async def session_is_valid(self) -> bool:
+        """True when the persistent session can be trusted without visiting Amazon.
+
+        Requires a recent successful verification for this account and
+        unexpired auth cookies in the browser context. Costs one cookie read.
+        """
+        if not self.session_state.recently_verified(self.email):
+            return False
+        try:
+            cookies = await self.context.cookies(AMAZON_URL)
+        except Exception as e:
+            logger.debug(f"Could not read session cookies: {e}")
+            return False
+        return auth_cookies_valid(cookies)
+
+    async def _wait_for_login_state(self, timeout: float = 15000) -> str:
+        """Wait until the page shows either the order list or a sign-in form.
+
+        Returns "orders", "signin" or "unknown" (nothing recognizable in time).
+        """
+        try:
+            handle = await self.page.wait_for_selector(
+                f"{ORDERS_READY_SELECTOR}, {SIGNIN_FORM_SELECTOR}",
+                state="attached",
+                timeout=timeout,
+            )
+            if await handle.evaluate("(el, sel) => el.matches(sel)", ORDERS_READY_SELECTOR):
+                return "orders"
+            return "signin"
+        except Exception as e:
+            logger.debug(f"No orders list or sign-in form appeared: {e}")
+            return "unknown"
+
+    async def _wait_for_orders(self, page: "Page") -> bool:
+        """Wait until `page` shows its order cards, or an order list with none.
+
+        Order-history pages are rendered server-side, so this returns as soon as
+        the list is in the DOM rather than waiting for the network to go idle.
+        """
+        try:
+            await page.wait_for_selector(
+                f"{ORDER_CARD_SELECTOR}, {ORDERS_READY_SELECTOR}",
+                state="attached",
+                timeout=ORDERS_READY_TIMEOUT,
+            )
+            return True
+        except Exception as e:
+            logger.debug(f"No order list appeared on {page.url}: {e}")
+            return False
+
+    async def _fill_first(self, selectors: List[str], value: str, timeout: float = 10000) -> bool:
+        """Wait for whichever of `selectors` appears first and fill it."""
+        try:
+            field = await self.page.wait_for_selector(", ".join(selectors), timeout=timeout)
+        except Exception as e:
+            logger.debug(f"None of {selectors} appeared: {e}")
+            return False
+        await field.fill(value)
+        return True
+
+    @timed("scrape.login")
     async def login(self) -> bool:
-        """Log into Amazon account."""
+        """Log into Amazon account, skipping the round-trip if the session is still valid."""
         try:
+            if self.pool.archive is not None and self.pool.archive.replaying:
+                logger.info(f"Replaying recorded pages from {self.pool.archive.path}, skipping login")
+                return True
+            if await self.session_is_valid():
+                logger.info(f"Session for {self.email} still valid, skipping login")
+                return True
+
             logger.info(f"Logging in as {self.email}...")
             
             # Go directly to orders page
-            orders_url = "https://www.amazon.com/gp/your-account/order-history"
-            logger.info(f"Navigating to {orders_url}")
+            logger.info(f"Navigating to {ORDER_HISTORY_URL}")
             
+            await self._before_page_load()
             try:
-                await self.page.goto(orders_url, wait_until="domcontentloaded", timeout=30000)
+                await self.page.goto(ORDER_HISTORY_URL, wait_until="domcontentloaded", timeout=30000)
             except Exception as nav_error:
                 logger.warning(f"Navigation timeout, trying signin directly: {nav_error}")
-                await self.page.goto("https://www.amazon.com/ap/signin", wait_until="domcontentloaded", timeout=30000)
-            
-            # Give page time to load
-            await asyncio.sleep(2)
+                await self.page.goto(f"{AMAZON_URL}/ap/signin", wait_until="domcontentloaded", timeout=30000)
             
             # Check if we're already logged in
-            try:
-                page_content = await self.page.content()
-                if "Your Orders" in page_content or "order-history" in self.page.url:
-                    logger.info("Already logged in!")
-                    return True
-            except:
-                pass
+            if await self._wait_for_login_state() == "orders":
+                logger.info("Already logged in!")
+                self.session_state.mark_verified(self.email)
+                return True
             
-            # Try to find and fill email field
             logger.info("Looking for email field...")
-            email_field = None
-            email_selectors = ["#ap_email", "input[name='email']", "input[type='email']", "input[autocomplete='username']"]
-            
-            for selector in email_selectors:
-                try:
-                    field = await self.page.query_selector(selector)
-                    if field:
-                        email_field = field
-                        logger.info(f"Found email field with selector: {selector}")
-                        await field.fill(self.email)
-                        await asyncio.sleep(1)
-                        break
-                except Exception as e:
-                    logger.debug(f"Email selector {selector} failed: {e}")
-                    continue
-            
-            if not email_field:
+            if not await self._fill_first(EMAIL_SELECTORS, self.email):
                 logger.error("Could not find email field on login page")
                 await self.page.screenshot(path="/tmp/amazon-email-field.png")
                 return False
             
-            # Click continue button
-            try:
-                continue_btn = await self.page.query_selector("input[type='submit']")
-                if continue_btn:
-                    await continue_btn.click()
-                    await asyncio.sleep(2)
-            except Exception as e:
-                logger.warning(f"Could not click continue button: {e}")
-            
-            # Try to find and fill password field
-            logger.info("Looking for password field...")
-            password_field = None
-            password_selectors = ["#ap_password", "input[name='password']", "input[type='password']", "input[autocomplete='current-password']"]
-            
-            for selector in password_selectors:
+            # Continue to the password step, unless it is on the same form
+            password_visible = await self.page.query_selector(", ".join(PASSWORD_SELECTORS))
+            if not password_visible:
                 try:
-                    field = await self.page.query_selector(selector)
-                    if field:
-                        password_field = field
-                        logger.info(f"Found password field with selector: {selector}")
-                        await field.fill(self.password)
-                        await asyncio.sleep(1)
-                        break
+                    await self.page.click("input[type='submit']")
                 except Exception as e:
-                    logger.debug(f"Password selector {selector} failed: {e}")
-                    continue
+                    logger.warning(f"Could not click continue button: {e}")
             
-            if not password_field:
+            logger.info("Looking for password field...")
+            if not await self._fill_first(PASSWORD_SELECTORS, self.password):
                 logger.warning("Could not find password field, but continuing anyway")
             
-            # Click sign in button
+            # Sign in and wait for the redirect back to the orders page
             try:
-                signin_btn = await self.page.query_selector("input[type='submit']")
-                if signin_btn:
-                    await signin_btn.click()
-                    await asyncio.sleep(3)
+                async with self.page.expect_navigation(wait_until="domcontentloaded", timeout=15000):
+                    await self.page.click("input[type='submit']")
             except Exception as e:
-                logger.warning(f"Could not click sign in button: {e}")
+                logger.warning(f"Sign-in did not navigate: {e}")
             
-            # Wait for redirect to orders page
-            try:
-                await self.page.wait_for_url("**/gp/your-account/**", timeout=15000)
+            if await self._wait_for_login_state() == "orders":
                 logger.info("Successfully navigated to account page!")
+                self.session_state.mark_verified(self.email)
                 return True
-            except:
-                logger.warning("Did not see account page redirect, checking content anyway...")
-            
-            # Check final page
-            try:
-                page_content = await self.page.content()
-                if "Your Orders" in page_content or "order" in page_content.lower():
-                    logger.info("Login appears successful based on page content")
-                    return True
-            except:
-                pass
             
             logger.error("Login verification failed")
+            self.session_state.invalidate(self.email)
             await self.page.screenshot(path="/tmp/amazon-login-fail.png")
             return False
                 
@@ -174,159 +865,338 @@ class AmazonScraper:
             logger.error(traceback.format_exc())
             return False
             
-    async def scrape_orders(self, max_orders: int = 50) -> List[Dict]:
-        """Scrape order history from Amazon."""
-        orders = []
+    async def _extract_records_with_evaluate(self, page: "Page") -> List[Dict]:
+        """Pull every order card on the page in a single page.evaluate round-trip."""
+        return await page.evaluate(EXTRACT_ORDERS_JS, EXTRACT_ORDERS_ARGS)
+
+    async def _extract_records_with_handles(self, page: "Page") -> List[Dict]:
+        """Walk order cards through element handles, one round-trip per field.
+
+        Kept as a fallback and as the baseline for the extraction benchmark.
+        """
+        records = []
+        order_cards = await page.query_selector_all(ORDER_CARD_SELECTOR)
+        for card in order_cards:
+            try:
+                # Extract order ID (attribute first, then text)
+                order_id = await card.get_attribute("data-order-id") or ""
+                if not order_id:
+                    order_id_elem = await card.query_selector("span:has-text('Order #')")
+                    order_id_text = await order_id_elem.inner_text() if order_id_elem else "unknown"
+                    order_id = order_id_text.replace("Order #", "").strip()
+
+                # Extract order date using multiple selectors
+                date_str = ""
+                for sel in ORDER_DATE_SELECTORS + ["span:has-text('Ordered on')"]:
+                    try:
+                        elem = await card.query_selector(sel)
+                        if elem:
+                            date_str = (await elem.inner_text()) or ""
+                            break
+                    except Exception:
+                        continue
+
+                # Price candidates (if available) from common selectors
+                price_texts = []
+                for psel in ORDER_PRICE_SELECTORS + ["span:has-text('$')"]:
+                    try:
+                        pelem = await card.query_selector(psel)
+                        if pelem:
+                            price_texts.append(await pelem.inner_text())
+                    except Exception:
+                        continue
+
+                items = []
+                for item_elem in await card.query_selector_all(ORDER_ITEM_SELECTOR):
+                    try:
+                        # Extract image (prefer within the item, then the card)
+                        img_elem = await item_elem.query_selector("img") or await card.query_selector("img")
+                        items.append({
+                            "name": await item_elem.get_attribute("title") or await item_elem.inner_text(),
+                            "href": await item_elem.get_attribute("href"),
+                            "image": await img_elem.get_attribute("src") if img_elem else None,
+                        })
+                    except Exception as e:
+                        logger.warning(f"Failed to parse item: {e}")
+
+                records.append({
+                    "order_id": order_id,
+                    "order_date": date_str,
+                    "price_texts": price_texts,
+                    "items": items,
+                })
+            except Exception as e:
+                logger.warning(f"Failed to parse order card: {e}")
+        return records
+
+    async def extract_page_records(self, extraction: str = DEFAULT_EXTRACTION, page: Optional["Page"] = None) -> List[Dict]:
+        """Extract the structured order records on `page` (default: the scraper's page)."""
+        page = page or self.page
+        with span(f"scrape.extract.{extraction}"):
+            if extraction == "html":
+                return await parse_order_history_records_async(await page.content())
+            if extraction == "evaluate":
+                return await self._extract_records_with_evaluate(page)
+            if extraction == "handles":
+                return await self._extract_records_with_handles(page)
+        raise ValueError(f"Unknown extraction mode: {extraction}")
+
+    async def _load_order_page(self, page: "Page", url: str, extraction: str) -> List[Dict]:
+        with span("scrape.page_load"):
+            await page.goto(url, wait_until="domcontentloaded")
+            ready = await self._wait_for_orders(page)
+        if not ready:
+            # A sign-in redirect, captcha or error page, not the end of the history
+            raise OrderPageError(f"No order list appeared on {page.url}")
+        return await self.extract_page_records(extraction, page)
+
+    async def _fetch_order_page(self, url: str, extraction: str) -> List[Dict]:
+        """Load one order-history page and extract it.
+
+        Uses a tab leased from the pool, or the scraper's own page when the
+        pool has a single tab. A failed load is retried once and then raised,
+        so only a page that really lists no orders ends the walk.
+        """
+        for attempt in (1, 2):
+            # Refusals (UpstreamUnavailable) are raised as-is, without a retry
+            await self._before_page_load()
+            try:
+                if self.pool.max_tabs < 2:
+                    return await self._load_order_page(self.page, url, extraction)
+                async with self.pool.lease() as tab:
+                    return await self._load_order_page(self._counted(tab), url, extraction)
+            except Exception as e:
+                if attempt == 2:
+                    raise
+                logger.warning(f"Failed to fetch order page {url}, retrying: {e}")
+
+    async def _dump_page_html(self, reason: str) -> None:
+        """Save the scraper's page HTML for debugging."""
+        try:
+            html_path = "/tmp/amazon-order-page.html"
+            content = await self.page.content()
+            with open(html_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            logger.warning(f"{reason}; saved page HTML to {html_path}")
+        except Exception as dump_err:
+            logger.warning(f"Failed to dump order page HTML: {dump_err}")
+
+    async def iter_orders(
+        self,
+        max_orders: int = 50,
+        extraction: str = DEFAULT_EXTRACTION,
+        max_pages: Optional[int] = None,
+        years: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        known_order_ids: Optional[Set[str]] = None,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+    ) -> AsyncIterator[Dict]:
+        """Scrape order history from Amazon, yielding each order item as its page is parsed.
+
+        Page URLs are computed from startIndex (and timeFilter when walking by
+        year), so after the first page, up to `concurrency` pages load in
+        parallel in separate tabs of the pooled context. Pages are yielded in
+        history order as soon as they and the pages before them are parsed;
+        closing the generator early cancels any page loads still in flight.
+
+        Args:
+            max_orders: Maximum order items to yield
+            extraction: "html" snapshots each page and parses it off the event
+                loop; "evaluate" reads each page in one page.evaluate call;
+                "handles" walks element handles field by field (slow, legacy)
+            max_pages: Page budget (default: enough pages for `max_orders`),
+                capped at AMAZON_ORDER_PAGE_BUDGET
+            years: Walk this many calendar years back (timeFilter=year-YYYY),
+                newest first; by default Amazon's default listing is walked
+            concurrency: Pages fetched at once (default AMAZON_ORDER_PAGE_CONCURRENCY)
+            known_order_ids: Orders already synced; the walk stops after the
+                first page containing one of them (incremental sync)
+            on_progress: Called with {"stage": "page", "pages", "items"} after
+                each page, and with {"stage": "end", "pages", "items",
+                "complete", "reached_known"} when the walk finishes
+        """
+        budget = min(max_pages or math.ceil(max_orders / ORDERS_PER_PAGE), MAX_ORDER_PAGES)
+        concurrency = max(1, concurrency or ORDER_PAGE_CONCURRENCY)
+        # The scraper holds one of the pool's tabs for the whole walk
+        concurrency = min(concurrency, max(1, self.pool.max_tabs - 1))
+        time_filters = order_time_filters(years)
+        pages_scraped = 0
+        yielded = 0
+        
+        def report() -> None:
+            if on_progress:
+                on_progress({"stage": "page", "pages": pages_scraped, "items": yielded})
         
         try:
-            logger.info("Navigating to order history...")
-            await self.page.goto("https://www.amazon.com/gp/your-account/order-history")
-            # Amazon DOM varies; give page time to render instead of failing fast
-            await self.page.wait_for_load_state("networkidle")
-            await self.page.wait_for_timeout(5000)
+            first_url = order_history_page_url(0, time_filters[0])
+            logger.info(f"Navigating to order history ({budget} page budget)...")
+            self.last_error = None
+            await self._before_page_load()
+            with span("scrape.page_load"):
+                await self.page.goto(first_url, wait_until="domcontentloaded")
+            if "/ap/signin" in self.page.url:
+                logger.warning("Redirected to sign-in, session is no longer valid")
+                self.session_state.invalidate(self.email)
+                self.session_expired = True
+                return
+            with span("scrape.first_page_settle"):
+                ready = await self._wait_for_orders(self.page)
+            if not ready:
+                await self._dump_page_html("No order list on the first order-history page")
+                raise OrderPageError(f"No order list appeared on {self.page.url}")
             
-            pages_scraped = 0
-            max_pages = 5  # Limit pagination
+            first_records = await self.extract_page_records(extraction)
+            pages_scraped = 1
+            reached_known = contains_known_order(first_records, known_order_ids)
+            for item in order_records_to_items(first_records, max_orders):
+                yielded += 1
+                yield item
+            report()
             
-            while len(orders) < max_orders and pages_scraped < max_pages:
-                # Extract orders from current page using multiple selectors
-                order_cards = await self.page.query_selector_all(
-                    "div.a-box.group.order, .order-card, [data-order-id], div.order" 
-                )
+            # Time filters walked to their last page
+            filters_done = 0
+            for n, time_filter in enumerate(time_filters):
+                if reached_known:
+                    break
+                if n == 0:
+                    if len(first_records) < ORDERS_PER_PAGE:
+                        filters_done += 1
+                        continue
+                    start_index = ORDERS_PER_PAGE
+                else:
+                    start_index = 0
                 
-                for card in order_cards:
-                    if len(orders) >= max_orders:
-                        break
-                        
+                exhausted = False
+                while not exhausted and pages_scraped < budget and yielded < max_orders:
+                    window = min(concurrency, budget - pages_scraped)
+                    tasks = [
+                        asyncio.ensure_future(self._fetch_order_page(
+                            order_history_page_url(start_index + i * ORDERS_PER_PAGE, time_filter),
+                            extraction,
+                        ))
+                        for i in range(window)
+                    ]
+                    start_index += window * ORDERS_PER_PAGE
                     try:
-                        # Extract order ID (attribute first, then text)
-                        order_id = await card.get_attribute("data-order-id") or ""
-                        if not order_id:
-                            order_id_elem = await card.query_selector("span:has-text('Order #')")
-                            order_id_text = await order_id_elem.inner_text() if order_id_elem else "unknown"
-                            order_id = order_id_text.replace("Order #", "").strip()
-
-                        # Extract order date using multiple selectors
-                        date_selectors = [
-                            "span.order-date-invoice-item",
-                            ".order-info .a-color-secondary",
-                            "span:has-text('Ordered on')",
-                        ]
-                        date_str = ""
-                        for sel in date_selectors:
-                            try:
-                                elem = await card.query_selector(sel)
-                                if elem:
-                                    date_str = (await elem.inner_text()) or ""
-                                    break
-                            except Exception:
-                                continue
-                        
-                        # Extract items
-                        item_elems = await card.query_selector_all(
-                            ".shipment .a-link-normal, a[href*='/dp/'], a[href*='/gp/product']"
-                        )
-                        
-                        for item_elem in item_elems:
-                            try:
-                                name = await item_elem.get_attribute("title") or await item_elem.inner_text()
-                                url = await item_elem.get_attribute("href")
-                                
-                                # Extract ASIN from URL
-                                asin = ""
-                                if url and "/dp/" in url:
-                                    asin = url.split("/dp/")[1].split("/")[0]
-                                
-                                # Extract image (prefer within the card)
-                                img_elem = await item_elem.query_selector("img") or await card.query_selector("img")
-                                image_url = await img_elem.get_attribute("src") if img_elem else None
-                                
-                                # Extract price (if available) from common selectors
-                                price_selectors = [
-                                    ".a-color-price",
-                                    ".a-row .a-color-secondary .value",
-                                    "span:has-text('$')",
-                                ]
-                                price = None
-                                for psel in price_selectors:
-                                    try:
-                                        pelem = await card.query_selector(psel)
-                                        if pelem:
-                                            price_str = await pelem.inner_text()
-                                            if price_str:
-                                                price = float(
-                                                    price_str.replace("$", "").replace(",", "")
-                                                )
-                                                break
-                                    except Exception:
-                                        continue
-                                
-                                orders.append({
-                                    "order_id": order_id,
-                                    "order_date": date_str,
-                                    "asin": asin,
-                                    "name": name.strip(),
-                                    "price": price,
-                                    "image_url": image_url,
-                                    "url": f"https://www.amazon.com{url}" if url and url.startswith("/") else url,
-                                })
-                                
-                            except Exception as e:
-                                logger.warning(f"Failed to parse item: {e}")
-                                continue
-                                
-                    except Exception as e:
-                        logger.warning(f"Failed to parse order card: {e}")
-                        continue
+                        for task in tasks:
+                            records = await task
+                            pages_scraped += 1
+                            for item in order_records_to_items(records, max_orders - yielded):
+                                yielded += 1
+                                yield item
+                            report()
+                            # A short page is the last one for this filter
+                            if len(records) < ORDERS_PER_PAGE:
+                                exhausted = True
+                                break
+                            if contains_known_order(records, known_order_ids):
+                                reached_known = exhausted = True
+                                break
+                    finally:
+                        # Pages past the end of history (or of an abandoned stream)
+                        for task in tasks:
+                            task.cancel()
+                if exhausted and not reached_known:
+                    filters_done += 1
                 
-                # Check for next page
-                pages_scraped += 1
-                next_button = await self.page.query_selector(".pagination-next:not(.disabled)")
-                if next_button and pages_scraped < max_pages:
-                    await next_button.click()
-                    await self.page.wait_for_load_state("networkidle")
-                else:
+                if pages_scraped >= budget or yielded >= max_orders:
                     break
                     
-            logger.info(f"Scraped {len(orders)} orders from {pages_scraped} pages")
-            if not orders:
-                # Dump page content for debugging
-                try:
-                    html_path = "/tmp/amazon-order-page.html"
-                    await self.page.wait_for_timeout(2000)
-                    content = await self.page.content()
-                    with open(html_path, "w", encoding="utf-8") as f:
-                        f.write(content)
-                    logger.warning(f"No orders parsed; saved page HTML to {html_path}")
-                except Exception as dump_err:
-                    logger.warning(f"Failed to dump order page HTML: {dump_err}")
-            return orders
+            logger.info(
+                f"Scraped {yielded} orders from {pages_scraped} pages"
+                + (" (stopped at already-synced orders)" if reached_known else "")
+            )
+            if not yielded:
+                await self._dump_page_html("No orders parsed")
+            if on_progress:
+                on_progress({
+                    "stage": "end",
+                    "pages": pages_scraped,
+                    "items": yielded,
+                    # The walk reached the end of the history it was asked for
+                    "complete": filters_done == len(time_filters),
+                    "reached_known": reached_known,
+                })
             
         except Exception as e:
             logger.error(f"Scraping error: {e}")
-            return orders
+            self.last_error = e
+
+    async def scrape_orders(self, max_orders: int = 50, **kwargs) -> List[Dict]:
+        """Scrape order history into a list; see iter_orders for the arguments."""
+        return [item async for item in self.iter_orders(max_orders, **kwargs)]
 
 
-async def scrape_amazon_orders(email: str, password: str, max_orders: int = 50) -> List[Dict]:
+async def iter_amazon_orders(
+    email: str,
+    password: str,
+    max_orders: int = 50,
+    pool: Optional[BrowserPool] = None,
+    max_pages: Optional[int] = None,
+    years: Optional[int] = None,
+    known_order_ids: Optional[Set[str]] = None,
+    on_progress: Optional[Callable[[Dict], None]] = None,
+    throttle: Optional[Callable[[], Awaitable[None]]] = None,
+) -> AsyncIterator[Dict]:
     """
-    Main function to scrape Amazon orders.
+    Log in and yield Amazon order items as each order-history page is parsed.
+    
+    A scrape that fails raises, after any items it already yielded, so callers
+    can tell an error (or a partial history) apart from a complete one.
     
     Args:
         email: Amazon account email
         password: Amazon account password
         max_orders: Maximum orders to fetch
-        
-    Returns:
-        List of order dictionaries
+        pool: Browser pool to lease from (default: the shared pool)
+        max_pages: Order-history page budget (default: enough for max_orders)
+        years: Calendar years of history to walk (default: Amazon's default listing)
+        known_order_ids: Already-synced order ids; scraping stops once it reaches them
+        on_progress: Called with progress events ({"stage": ...}) as the scrape advances
+        throttle: Awaited before every page load (rate limiting)
     """
     if not HAS_PLAYWRIGHT:
         raise ImportError("playwright not installed")
     
-    async with AmazonScraper(email, password) as scraper:
-        if await scraper.login():
-            return await scraper.scrape_orders(max_orders)
-        else:
+    yielded = 0
+    async with AmazonScraper(email, password, pool=pool, throttle=throttle) as scraper:
+        if on_progress:
+            on_progress({"stage": "login"})
+        if not await scraper.login():
             raise Exception("Failed to log into Amazon")
+        scrape = dict(
+            max_pages=max_pages,
+            years=years,
+            known_order_ids=known_order_ids,
+            on_progress=on_progress,
+        )
+        async for item in scraper.iter_orders(max_orders, **scrape):
+            yielded += 1
+            yield item
+        if scraper.session_expired:
+            # The cached session turned out to be stale before the first page
+            # was read, so nothing has been yielded yet; log in for real once
+            scraper.session_expired = False
+            if not await scraper.login():
+                raise Exception("Failed to log into Amazon")
+            async for item in scraper.iter_orders(max_orders, **scrape):
+                yielded += 1
+                yield item
+        if scraper.last_error is not None:
+            # Even after some pages were yielded: a partial history must not pass for a complete one
+            raise Exception(f"Order scrape failed after {yielded} items: {scraper.last_error}") from scraper.last_error
+
+
+async def scrape_amazon_orders(email: str, password: str, max_orders: int = 50, **kwargs) -> List[Dict]:
+    """
+    Main function to scrape Amazon orders.
+    
+    Takes the same arguments as iter_amazon_orders.
+        
+    Returns:
+        List of order dictionaries
+    """
+    return [item async for item in iter_amazon_orders(email, password, max_orders, **kwargs)]
 
 
 if __name__ == "__main__":
@@ -337,12 +1207,21 @@ if __name__ == "__main__":
     email = os.getenv("AMAZON_EMAIL")
     password = os.getenv("AMAZON_PASSWORD")
     
-    if not email or not password:
+    if SCRAPE_REPLAY_PATH:
+        # Replays never log in
+        email, password = email or "replay", password or "replay"
+    elif not email or not password:
         print("Error: Set AMAZON_EMAIL and AMAZON_PASSWORD in .env file")
         exit(1)
     
+    async def main():
+        try:
+            return await scrape_amazon_orders(email, password, max_orders=10)
+        finally:
+            await stop_browser_pool()
+
     print("Starting Amazon scraper...")
-    orders = asyncio.run(scrape_amazon_orders(email, password, max_orders=10))
+    orders = asyncio.run(main())
     
     print(f"\nFound {len(orders)} orders:")
     for order in orders[:5]:  # Show first 5
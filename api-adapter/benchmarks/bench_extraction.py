@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Order-page extraction benchmark: element handles vs page.evaluate vs HTML parsing.
+
+Loads order-history HTML into Chromium (network fully stubbed) and runs each
+of AmazonScraper's extraction modes over it ("html" is one page.content()
+round-trip plus the offline parser), counting Playwright round-trips
+(awaited calls into the browser) and wall time. By default the page is a
+generated 50-order fixture from fake_amazon.py; pass --html to use saved
+order-history dumps such as /tmp/amazon-order-page.html instead.
+
+Requires playwright with Chromium installed (playwright install chromium).
+
+Run with: python benchmarks/bench_extraction.py [--html page.html ...] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import amazon_scraper
+from amazon_scraper import AmazonScraper, ORDER_HISTORY_URL, order_records_to_items
+from fake_amazon import make_orders, render_order_history_page
+
+MODES = ["handles", "evaluate", "html"]
+
+
+class RoundTripCounter:
+    """Wraps a Playwright page so every awaited browser call is counted.
+
+    Element handles returned by counted calls are wrapped too, so calls made on
+    them (get_attribute, inner_text, ...) are counted as well.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def wrap(self, target):
+        return _Counted(target, self)
+
+    def wrap_result(self, result):
+        if isinstance(result, list):
+            return [self.wrap_result(r) for r in result]
+        if type(result).__name__ in ("ElementHandle", "JSHandle"):
+            return self.wrap(result)
+        return result
+
+
+class _Counted:
+    def __init__(self, target, counter: RoundTripCounter):
+        self._target = target
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        async def counted(*args, **kwargs):
+            self._counter.count += 1
+            return self._counter.wrap_result(await attr(*args, **kwargs))
+
+        return counted
+
+
+async def load(page, html: str) -> None:
+    async def handle(route):
+        if route.request.resource_type == "document":
+            await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html)
+        else:
+            await route.abort()
+
+    await page.unroute("**/*")
+    await page.route("**/*", handle)
+    await page.goto(ORDER_HISTORY_URL, wait_until="load")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--html", nargs="*", help="Saved order-history HTML files")
+    parser.add_argument("--orders-per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not amazon_scraper.HAS_PLAYWRIGHT:
+        sys.exit("playwright is not installed")
+    from playwright.async_api import async_playwright
+
+    if args.html:
+        fixtures = {path: open(path, encoding="utf-8").read() for path in args.html}
+    else:
+        orders = make_orders(args.orders_per_page)
+        fixtures = {
+            f"generated ({args.orders_per_page} orders)": render_order_history_page(
+                0, orders, page_size=args.orders_per_page
+            )
+        }
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch()
+        page = await browser.new_page()
+        scraper = AmazonScraper("bench@example.com", "bench")
+
+        for name, html in fixtures.items():
+            await load(page, html)
+            print(f"\n{name}")
+            for mode in MODES:
+                counter = RoundTripCounter()
+                scraper.page = counter.wrap(page)
+                timings = []
+                for _ in range(args.repeat):
+                    counter.count = 0
+                    start = time.perf_counter()
+                    records = await scraper.extract_page_records(mode)
+                    timings.append(time.perf_counter() - start)
+                items = order_records_to_items(records)
+                print(
+                    f"  {mode:>8}: {len(records):>3} cards {len(items):>4} items  "
+                    f"{counter.count:>5} round-trips  median {statistics.median(timings) * 1000:8.1f} ms"
+                )
+
+        await browser.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
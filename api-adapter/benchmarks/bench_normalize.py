@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Per-item cost of normalizing amazon-mcp search results into Product models.
+
+Generates a batch of synthetic upstream items (dicts shaped like amazon-mcp
+results, string prices included). It times the previous per-item normalizer,
+which did dict lookups for every candidate key, str.replace price parsing and
+Product(**kwargs), against the shared batch engine in normalize.py with
+TypeAdapter list validation and with model_construct. (model_construct runs in
+Python under pydantic v2 and loses to batch validation, which is why the
+adapter validates.)
+
+Run with: python benchmarks/bench_normalize.py [--items 10000] [--repeat 7]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from adapter import Product, normalize_amazon_mcp_results
+from normalize import MCP_PRODUCT_SPEC, PRODUCT_SPEC
+
+
+def make_items(count: int, seed: int = 1234) -> list:
+    rng = random.Random(seed)
+    items = []
+    for n in range(count):
+        asin = f"B0{n:08d}"
+        items.append({
+            "asin": asin,
+            "title": f"Product {n}",
+            "price": f"${rng.randint(1, 1500):,}.{rng.randint(0, 99):02d}",
+            "url": f"https://www.amazon.com/dp/{asin}",
+            "image_url": f"https://m.media-amazon.com/images/I/{asin}.jpg",
+            "rating": round(rng.uniform(1, 5), 1),
+            "review_count": rng.randint(0, 50000),
+            "is_prime": rng.random() < 0.5,
+            "department": "Clothing",
+        })
+    return items
+
+
+def legacy_normalize(item) -> Product:
+    """The per-item normalizer this benchmark compares against."""
+    raw = item if isinstance(item, dict) else (getattr(item, "__dict__", {}) or dict(item))
+    pid = raw.get("id") or raw.get("asin") or raw.get("product_id") or raw.get("url") or str(time.time())
+    name = raw.get("title") or raw.get("name") or raw.get("product_name") or "Unknown Product"
+    price = None
+    for k in ("price", "price_value", "price_amount", "offer_price", "current_price"):
+        try:
+            if k in raw and raw[k] is not None:
+                price_val = raw[k]
+                if isinstance(price_val, str):
+                    price_val = float(price_val.replace("$", "").replace(",", ""))
+                else:
+                    price_val = float(price_val)
+                price = price_val
+                break
+        except (ValueError, TypeError):
+            continue
+    return Product(
+        id=pid,
+        asin=raw.get("asin") or raw.get("id"),
+        name=name,
+        retailer="amazon",
+        category=raw.get("category") or raw.get("department"),
+        price=price,
+        description=raw.get("description") or raw.get("snippet") or raw.get("desc"),
+        url=raw.get("url") or raw.get("product_url"),
+        image=raw.get("image") or raw.get("image_url") or raw.get("thumbnail"),
+        rating=raw.get("rating") or raw.get("score"),
+        reviews=raw.get("reviews") or raw.get("review_count"),
+        prime=raw.get("prime") or raw.get("is_prime") or False,
+    )
+
+
+MODES = {
+    "legacy per-item": lambda items: [legacy_normalize(item) for item in items],
+    "plan + TypeAdapter": normalize_amazon_mcp_results,
+    "plan + model_construct": lambda items: [Product.model_construct(**row) for row in PRODUCT_SPEC.normalize(items)],
+    "plan only (dicts)": PRODUCT_SPEC.normalize,
+    "mcp_server dicts": MCP_PRODUCT_SPEC.normalize,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    assert [p.model_dump() for p in MODES["legacy per-item"](items[:100])] == \
+        [p.model_dump() for p in normalize_amazon_mcp_results(items[:100])], "normalizers disagree"
+
+    print(f"{args.items} items, best of {args.repeat}")
+    baseline = None
+    for name, normalize in MODES.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            normalize(items)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        baseline = baseline or best
+        print(
+            f"  {name:>22}: {best * 1000:8.1f} ms  {best / args.items * 1e6:6.2f} us/item  "
+            f"{baseline / best:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
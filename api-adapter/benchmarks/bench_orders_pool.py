@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Cold vs warm /orders latency with the pooled scraper browser.
+
+Drives the real /orders route and Playwright scraper in-process, with every
+amazon.com request answered by the fake order pages in fake_amazon.py, using a
+throwaway profile directory and order store. Each run uses a new account, so
+/orders has no snapshot: it answers 202 with a sync job, the job is followed
+to completion, and the run ends when /orders serves the synced orders. "Cold"
+stops the pool before each run so it pays the Chromium launch; "warm" reuses
+the running pool. The orders rate limit is off so page loads are not paced.
+
+Requires playwright with Chromium installed (playwright install chromium).
+
+Run with: python benchmarks/bench_orders_pool.py [--runs 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+
+import adapter
+import amazon_scraper
+import order_store
+from fake_amazon import install_fake_amazon
+
+
+async def sync_orders_through_api(client: httpx.AsyncClient, account: str, limit: int = 10) -> dict:
+    """GET /orders for an account without a snapshot, follow its sync job, then GET /orders again.
+
+    Returns the final OrdersResponse JSON. Raises if any step fails.
+    """
+    os.environ["AMAZON_EMAIL"] = account
+    resp = await client.get("/orders", params={"limit": limit})
+    if resp.status_code != 202:
+        raise RuntimeError(f"expected 202 with a sync job, got {resp.status_code}: {resp.text[:200]}")
+    job_id = resp.json()["job_id"]
+    # The job stream ends when the job finishes; its last line is the final status
+    events = (await client.get(f"/orders/jobs/{job_id}")).text.splitlines()
+    final = json.loads(events[-1])
+    if final.get("status") != "succeeded":
+        raise RuntimeError(f"sync job {final.get('status')}: {final.get('error')}")
+    resp = await client.get("/orders", params={"limit": limit})
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def time_orders(client: httpx.AsyncClient, account: str) -> float:
+    start = time.perf_counter()
+    await sync_orders_through_api(client, account)
+    return time.perf_counter() - start
+
+
+def summarize(label: str, samples: list) -> None:
+    print(
+        f"{label:>5}: median {statistics.median(samples) * 1000:8.1f} ms  "
+        f"min {min(samples) * 1000:8.1f} ms  max {max(samples) * 1000:8.1f} ms  (n={len(samples)})"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if not amazon_scraper.HAS_PLAYWRIGHT:
+        sys.exit("playwright is not installed")
+
+    os.environ.setdefault("AMAZON_PASSWORD", "bench")
+    adapter.ORDERS_UPSTREAM.bucket.rate = 0
+
+    with tempfile.TemporaryDirectory(prefix="aura-bench-profile-") as profile_dir:
+        order_store._order_store = order_store.OrderStore(Path(profile_dir) / "orders.db")
+        pool = amazon_scraper.BrowserPool(user_data_dir=Path(profile_dir) / "profile", on_launch=install_fake_amazon)
+        amazon_scraper._browser_pool = pool
+
+        transport = httpx.ASGITransport(app=adapter.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            cold = []
+            for n in range(args.runs):
+                await pool.stop()
+                cold.append(await time_orders(client, f"cold-{n}@example.com"))
+
+            await pool.start()
+            warm = [await time_orders(client, f"warm-{n}@example.com") for n in range(args.runs)]
+
+        await pool.stop()
+        order_store._order_store.close()
+        order_store._order_store = None
+
+    summarize("cold", cold)
+    summarize("warm", warm)
+    print(f"pool stats: {pool.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Browser-free benchmark of the offline order-history parser.
+
+Times parse_order_history_html on generated fake_amazon.py pages or on saved
+order-history dumps (such as the /tmp/amazon-order-page.html files the scraper
+writes when it finds no orders), with every available BeautifulSoup backend.
+
+Run with: python benchmarks/bench_parse_html.py [--html page.html ...] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import amazon_scraper
+from amazon_scraper import parse_order_history_html
+from fake_amazon import make_orders, render_order_history_page
+
+
+def available_parsers() -> list:
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.insert(0, "lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--html", nargs="*", help="Saved order-history HTML files")
+    parser.add_argument("--orders-per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.html:
+        fixtures = {path: open(path, encoding="utf-8").read() for path in args.html}
+    else:
+        orders = make_orders(args.orders_per_page)
+        fixtures = {
+            f"generated ({args.orders_per_page} orders)": render_order_history_page(
+                0, orders, page_size=args.orders_per_page
+            )
+        }
+
+    default_parser = amazon_scraper.HTML_PARSER
+    try:
+        for name, html in fixtures.items():
+            print(f"\n{name} ({len(html) / 1024:.0f} KiB)")
+            for backend in available_parsers():
+                amazon_scraper.HTML_PARSER = backend
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    items = parse_order_history_html(html)
+                    timings.append(time.perf_counter() - start)
+                median = statistics.median(timings)
+                print(
+                    f"  {backend:>11}: {len(items):>4} items  median {median * 1000:7.2f} ms/page  "
+                    f"{len(items) / median:9.0f} items/s"
+                )
+    finally:
+        amazon_scraper.HTML_PARSER = default_parser
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+p50/p99 latency of cache-hit /search traffic: model responses vs pre-encoded bytes.
+
+Seeds the search cache with a synthetic result set, then sends the same mix
+of page/sort/category views through two routes of the adapter app, calling
+the ASGI app directly so client overhead does not blur the difference.
+"before" is a benchmark-only route that builds a SearchResponse and lets
+FastAPI validate and serialize it through response_model, as /search used
+to. "after" is the real /search route, which returns the memoized
+pre-encoded body and its ETag.
+
+Run with: python benchmarks/bench_search_cache_hits.py [--requests 2000] [--products 100]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi import Query
+
+import adapter
+from adapter import Product, ResultSet, SearchResponse, cache_result_set, cached_result_set
+from fake_amazon import asgi_get
+
+QUERY = "black dress"
+VIEWS = [
+    {"page": 1, "limit": 20},
+    {"page": 2, "limit": 20},
+    {"page": 1, "limit": 50, "sort": "price_low"},
+    {"page": 1, "limit": 20, "sort": "rating", "category": "clothing"},
+]
+
+LEGACY_PATH = "/_bench/legacy-search"
+
+
+@adapter.app.get(LEGACY_PATH, response_model=SearchResponse)
+async def legacy_search(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    category: Optional[str] = None,
+    sort: Optional[str] = "relevance",
+):
+    result_set = await cached_result_set(q)
+    indices = result_set.view(sort, category)
+    start = (page - 1) * limit
+    return SearchResponse(
+        products=[result_set.products[i] for i in indices[start:start + limit]],
+        total=len(indices),
+        page=page,
+        limit=limit,
+    )
+
+
+def make_products(count: int) -> list:
+    return [
+        Product(
+            id=f"B0{n:08d}",
+            asin=f"B0{n:08d}",
+            name=f"Product {n} with a reasonably long marketing title",
+            category=("clothing", "beauty", "shoes")[n % 3],
+            price=round(5 + (n * 37) % 200 + 0.99, 2),
+            description="Soft, breathable fabric. Machine washable. " * 3,
+            url=f"https://www.amazon.com/dp/B0{n:08d}",
+            image=f"https://m.media-amazon.com/images/I/B0{n:08d}.jpg",
+            rating=round(1 + (n * 13) % 40 / 10, 1),
+            reviews=(n * 101) % 5000,
+            prime=n % 2 == 0,
+        )
+        for n in range(count)
+    ]
+
+
+
+async def measure(path: str, requests: int) -> list:
+    samples = []
+    for n in range(requests):
+        params = {"q": QUERY, **VIEWS[n % len(VIEWS)]}
+        start = time.perf_counter()
+        status = await asgi_get(adapter.app, path, params)
+        samples.append(time.perf_counter() - start)
+        assert status == 200, status
+    return samples
+
+
+def summarize(label: str, samples: list) -> None:
+    cuts = statistics.quantiles(samples, n=100)
+    print(
+        f"{label:>7}: p50 {cuts[49] * 1e6:8.0f} us  p99 {cuts[98] * 1e6:8.0f} us  "
+        f"mean {statistics.mean(samples) * 1e6:8.0f} us  (n={len(samples)})"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--products", type=int, default=100)
+    args = parser.parse_args()
+
+    await cache_result_set(ResultSet(QUERY, make_products(args.products)))
+    # Warm both paths (route compilation, memoized views) before timing
+    await measure(LEGACY_PATH, 50)
+    await measure("/search", 50)
+
+    print(f"{args.products} cached products, views cycling through {len(VIEWS)} page/sort/category combinations")
+    summarize("before", await measure(LEGACY_PATH, args.requests))
+    summarize("after", await measure("/search", args.requests))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for /search under concurrent load.
+
+Runs the FastAPI app in-process (httpx ASGI transport) against a stubbed
+`amazon_search` that sleeps for a fixed upstream latency, and reports
+requests/sec at 10, 100 and 1000 concurrent clients. Every request uses a
+unique query so each one goes upstream. While the burst is running a probe
+hits /health to show it is not starved by in-flight searches. The upstream
+rate limit is turned off (pass --rate to keep one) so the numbers reflect
+the adapter and its adaptive concurrency limit.
+
+Run with: python benchmarks/bench_search_concurrency.py [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+
+import adapter
+from fake_amazon import make_search_stub
+
+
+async def run_level(client: httpx.AsyncClient, clients: int, requests_per_client: int) -> dict:
+    await adapter.SEARCH_CACHE.clear()
+    counter = iter(range(clients * requests_per_client))
+    health_latencies = []
+    done = asyncio.Event()
+
+    async def worker():
+        for _ in range(requests_per_client):
+            resp = await client.get("/search", params={"q": f"bench query {next(counter)}"})
+            resp.raise_for_status()
+
+    async def health_probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/health")
+            health_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.05)
+
+    probe = asyncio.create_task(health_probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe
+
+    total = clients * requests_per_client
+    return {
+        "clients": clients,
+        "requests": total,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "health_max_ms": round(max(health_latencies, default=0) * 1000, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.2, help="Stubbed upstream latency in seconds")
+    parser.add_argument("--requests-per-client", type=int, default=3)
+    parser.add_argument("--levels", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rate", type=float, default=0, help="Upstream rate limit in calls/sec (0 = none)")
+    args = parser.parse_args()
+
+    adapter.HAS_AMAZON_MCP = True
+    adapter.amazon_search = make_search_stub(args.latency)
+    adapter.SEARCH_UPSTREAM.bucket.rate = args.rate
+
+    upstream = adapter.SEARCH_UPSTREAM.concurrency
+    print(
+        f"upstream latency={args.latency}s concurrency limit={int(upstream.limit)} "
+        f"(adapts up to {upstream.max_limit})"
+    )
+    transport = httpx.ASGITransport(app=adapter.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for level in args.levels:
+            result = await run_level(client, level, args.requests_per_client)
+            print(
+                f"{result['clients']:>5} clients  {result['requests']:>5} req  "
+                f"{result['seconds']:>7.3f}s  {result['rps']:>8.1f} req/s  "
+                f"/health max {result['health_max_ms']} ms  limit now {int(upstream.limit)}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+p50/p99 /search latency for popular queries as cache entries expire.
+
+Replays Zipf-distributed traffic over a set of queries against a stubbed
+`amazon_search` with a fixed upstream latency. The cache TTL is scaled down
+so entries expire several times during the run. Three configurations:
+
+- hard expiry: no stale window and no prefetch. The first request after
+  expiry waits for upstream.
+- stale-while-revalidate: requests inside the stale window get the cached
+  results at once and trigger a background refresh.
+- SWR + prefetch: the hot-key tracker also refreshes the top queries
+  before they go stale.
+
+Every query is cached before timing starts, so only expiry shows up in the
+numbers. Latency is reported for the top-N queries; "stale" is the share of their
+requests that found the entry past its soft TTL (or gone).
+
+Run with: python benchmarks/bench_search_prefetch.py [--seconds 20] [--ttl 5] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import adapter
+from fake_amazon import asgi_get, make_search_stub
+
+
+
+async def run(label: str, args, stale_ttl: float, prefetch: bool) -> None:
+    adapter.SEARCH_CACHE_TTL = args.ttl
+    adapter.SEARCH_CACHE_STALE_TTL = stale_ttl
+    adapter.SEARCH_PREFETCH_INTERVAL = args.ttl / 8
+    adapter.SEARCH_PREFETCH_LEAD = args.ttl / 4
+    adapter.SEARCH_PREFETCH_TOP_N = args.top
+    adapter.HOT_QUERIES = adapter.HotKeyTracker(capacity=4 * args.top, half_life=0)
+    await adapter.SEARCH_CACHE.clear()
+
+    rng = random.Random(42)
+    queries = [f"query {n}" for n in range(args.queries)]
+    weights = [1 / (n + 1) for n in range(args.queries)]
+    popular = set(queries[:args.top])
+    samples, stale = [], 0
+
+    await asyncio.gather(*(adapter.singleflight_search(query) for query in queries))
+    for key in ("misses", "refreshes", "prefetches"):
+        adapter.SEARCH_STATS[key] = 0
+
+    async def one_request(query: str):
+        nonlocal stale
+        if query in popular:
+            entry = await adapter.SEARCH_CACHE.peek(adapter.search_cache_key(query))
+            stale += entry is None or entry.is_stale()
+        start = time.perf_counter()
+        status = await asgi_get(adapter.app, "/search", {"q": query})
+        if query in popular:
+            samples.append(time.perf_counter() - start)
+        assert status == 200, status
+
+    prefetcher = asyncio.ensure_future(adapter.prefetch_hot_searches()) if prefetch else None
+    pending = set()
+    start = time.perf_counter()
+    while time.perf_counter() - start < args.seconds:
+        task = asyncio.ensure_future(one_request(rng.choices(queries, weights)[0]))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        await asyncio.sleep(1 / args.rate)
+    await asyncio.gather(*pending)
+    if prefetcher is not None:
+        prefetcher.cancel()
+        await asyncio.gather(prefetcher, return_exceptions=True)
+
+    cuts = statistics.quantiles(samples, n=100)
+    upstream = sum(adapter.SEARCH_STATS[key] for key in ("misses", "refreshes", "prefetches"))
+    print(
+        f"{label:>24}: p50 {cuts[49] * 1000:7.2f} ms  p99 {cuts[98] * 1000:7.2f} ms  "
+        f"stale {stale / len(samples):6.1%}  "
+        f"upstream {upstream:5d} calls"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--ttl", type=float, default=5.0, help="soft TTL in seconds")
+    parser.add_argument("--latency", type=float, default=0.2, help="upstream latency in seconds")
+    parser.add_argument("--rate", type=float, default=200, help="requests per second")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top", type=int, default=10, help="popular queries to report on and prefetch")
+    args = parser.parse_args()
+
+    adapter.HAS_AMAZON_MCP = True
+    adapter.amazon_search = make_search_stub(args.latency)
+    # Measure cache expiry alone, not the upstream rate limit
+    adapter.SEARCH_UPSTREAM.bucket.rate = 0
+    print(
+        f"{args.rate:.0f} req/s over {args.queries} queries for {args.seconds:.0f}s, TTL {args.ttl}s, "
+        f"upstream {args.latency * 1000:.0f} ms; latency of the top {args.top} queries"
+    )
+    await run("hard expiry", args, stale_ttl=0, prefetch=False)
+    await run("stale-while-revalidate", args, stale_ttl=args.ttl, prefetch=False)
+    await run("SWR + prefetch", args, stale_ttl=args.ttl, prefetch=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
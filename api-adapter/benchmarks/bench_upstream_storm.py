@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+What a traffic spike does to upstream, with and without the upstream guards.
+
+The stubbed `amazon_search` serves at most --capacity calls at once and
+answers the rest with 429 (after the same latency, like a real throttling
+front end). A spike of unique queries then hits /search, so every request
+goes upstream. Two runs:
+
+- unguarded: no rate limit, a concurrency limit too high to matter and a
+  breaker that never opens, so upstream takes the whole spike
+- guarded: the adapter's defaults (token bucket, AIMD concurrency, circuit
+  breaker)
+
+Reports the upstream calls made, how many were throttled (429), and how
+the requests ended: 200 with results, 200 empty (upstream throttled),
+or refused fast with 429/503 plus Retry-After.
+
+Run with: python benchmarks/bench_upstream_storm.py [--requests 500] [--capacity 10] [--latency 0.1]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+
+import adapter
+from resilience import Upstream
+
+
+def make_throttling_stub(capacity: int, latency: float, counters: Counter):
+    inflight = 0
+
+    async def stub_amazon_search(query: str):
+        nonlocal inflight
+        inflight += 1
+        counters["calls"] += 1
+        try:
+            await asyncio.sleep(latency)
+            if inflight > capacity:
+                counters["throttled"] += 1
+                return 429, []
+            return 200, [{"asin": f"B{i:09d}", "title": f"{query} {i}", "price": f"${i}.99"} for i in range(10)]
+        finally:
+            inflight -= 1
+
+    return stub_amazon_search
+
+
+async def run(label: str, args, upstream: Upstream) -> None:
+    adapter.SEARCH_UPSTREAM = upstream
+    await adapter.SEARCH_CACHE.clear()
+    counters: Counter = Counter()
+    adapter.amazon_search = make_throttling_stub(args.capacity, args.latency, counters)
+    outcomes: Counter = Counter()
+    latencies = []
+
+    transport = httpx.ASGITransport(app=adapter.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def one(n: int):
+            start = time.perf_counter()
+            resp = await client.get("/search", params={"q": f"{label} spike {n}"})
+            latencies.append(time.perf_counter() - start)
+            if resp.status_code == 200:
+                outcomes["ok" if resp.json()["products"] else "empty"] += 1
+            else:
+                outcomes[str(resp.status_code)] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(n) for n in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    cuts = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:>10}: {counters['calls']:4d} upstream calls, {counters['throttled']:4d} throttled  |  "
+        f"{outcomes['ok']:4d} ok  {outcomes['empty']:4d} empty  "
+        f"{outcomes['429'] + outcomes['503']:4d} refused  |  p50 {cuts[49] * 1000:6.0f} ms  "
+        f"p99 {cuts[98] * 1000:6.0f} ms  {elapsed:5.2f}s"
+    )
+    status = upstream.status()
+    print(
+        f"{'':>10}  circuit {status['circuit']}, concurrency limit {status['concurrency_limit']}, "
+        f"{status['rejected']} rejected by breaker, {status['rate_limited']} by rate limit"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--capacity", type=int, default=10, help="upstream calls served at once before 429s")
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    adapter.HAS_AMAZON_MCP = True
+    print(f"{args.requests} concurrent unique searches, upstream capacity {args.capacity}, latency {args.latency}s")
+    await run("unguarded", args, Upstream(
+        "search", rate=0, burst=1, concurrency=10_000, failure_threshold=10**9,
+    ))
+    await run("guarded", args, Upstream(
+        "search",
+        rate=float(os.getenv("AMAZON_SEARCH_RATE", "10")),
+        burst=float(os.getenv("AMAZON_SEARCH_BURST", "20")),
+        concurrency=adapter.SEARCH_CONCURRENCY,
+        max_concurrency=4 * adapter.SEARCH_CONCURRENCY,
+    ))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
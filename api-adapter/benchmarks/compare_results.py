@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare two run_benchmarks.py result files and flag regressions.
+
+For every scenario present in both files, prints the base and new value of
+each metric and the relative change. Throughput is better when higher;
+latency percentiles and microseconds per operation are better when lower. A
+change worse than --threshold (default 10%) is a regression, and the script
+exits with status 1 if there is any, so it can gate CI.
+
+Latency scenarios driven by a fixed-latency stub are dominated by that
+latency; compare runs made with the same config (shown in each file's meta).
+
+Run with: python benchmarks/compare_results.py base.json new.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict
+
+# Metric -> +1 if higher is better, -1 if lower is better
+METRICS = {
+    "throughput_rps": 1,
+    "p50_ms": -1,
+    "p95_ms": -1,
+    "p99_ms": -1,
+    "per_op_us": -1,
+}
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def describe_meta(label: str, meta: Dict[str, Any]) -> str:
+    commit = (meta.get("commit") or "unknown")[:12]
+    dirty = " (dirty)" if meta.get("dirty") else ""
+    return f"{label}: {commit}{dirty} at {meta.get('timestamp')}, python {meta.get('python')}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    base, new = load_report(args.base), load_report(args.new)
+    print(describe_meta("base", base.get("meta", {})))
+    print(describe_meta(" new", new.get("meta", {})))
+    if base.get("meta", {}).get("config") != new.get("meta", {}).get("config"):
+        print("warning: the runs used different configs; differences may not be comparable")
+
+    regressions = []
+    for scenario, new_result in new["results"].items():
+        base_result = base["results"].get(scenario)
+        if base_result is None:
+            print(f"{scenario:>24}: new scenario")
+            continue
+        if "skipped" in base_result or "skipped" in new_result:
+            print(f"{scenario:>24}: skipped in {'base' if 'skipped' in base_result else 'new'} run")
+            continue
+        for metric, direction in METRICS.items():
+            old_value, new_value = base_result.get(metric), new_result.get(metric)
+            if not old_value or new_value is None:
+                continue
+            change = (new_value - old_value) / old_value
+            regressed = change * direction < -args.threshold
+            improved = change * direction > args.threshold
+            flag = "  REGRESSION" if regressed else ("  improved" if improved else "")
+            print(f"{scenario:>24} {metric:>15}: {old_value:12.3f} -> {new_value:12.3f}  {change:+7.1%}{flag}")
+            if regressed:
+                regressions.append(f"{scenario}.{metric} {change:+.1%}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Deterministic stand-ins for Amazon: order-history pages, search results and
+the amazon-mcp client.
+
+`render_order_history_page` produces HTML shaped like Amazon's order cards
+(the markup the scraper's selectors target). `install_fake_amazon` routes a
+Playwright browser context so every amazon.com request is answered from these
+pages instead of the network; given a `FakeAmazonServer` (see
+`serve_fake_amazon`), requests are proxied to that local HTTP server instead,
+so page loads go through a real socket and can be given server-side latency.
+
+`make_search_stub` and `FakeAmazonClient` replace amazon-mcp's `amazon_search`
+and `Amazon()` with seeded, fixed-latency fakes. `asgi_get` sends a request
+straight into an ASGI app, so benchmarks time the adapter without client or
+socket overhead.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import urlencode, urlparse, parse_qs
+
+PAGE_SIZE = 10
+
+# 1x1 transparent GIF served for every image request
+PIXEL_GIF = (
+    b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00"
+    b"\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+)
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+PRODUCT_NAMES = [
+    "Women's High Waist Yoga Pants with Pockets",
+    "Maybelline Fit Me Matte + Poreless Foundation",
+    "Revlon One-Step Hair Dryer & Volumizer",
+    "Satin Lace-Up Corset Top",
+    "Pleated Tennis Skirt",
+    "Cat Eye Sunglasses",
+    "Silk Sleep Mask",
+    "Rose Gold Makeup Brush Set",
+]
+
+
+def make_orders(total_orders: int = 50, seed: int = 1234) -> list:
+    """Generate `total_orders` orders, newest first, each with 1-3 items."""
+    rng = random.Random(seed)
+    orders = []
+    for n in range(total_orders):
+        # Roughly one order every three days going backwards from Dec 28, 2025
+        day_offset = n * 3
+        month_index = 11 - (day_offset // 28) % 12
+        year = 2025 - (day_offset // 28) // 12
+        day = 28 - day_offset % 28
+        items = []
+        for _ in range(rng.randint(1, 3)):
+            asin = "B0" + "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(8))
+            items.append({
+                "asin": asin,
+                "name": rng.choice(PRODUCT_NAMES),
+                "image": f"https://m.media-amazon.com/images/I/{asin}._AC_SL1500_.jpg",
+            })
+        orders.append({
+            "order_id": f"112-{1000000 + n:07d}-{rng.randint(1000000, 9999999)}",
+            "date": f"{MONTHS[month_index]} {day}, {year}",
+            "total": f"${rng.randint(5, 120)}.{rng.randint(0, 99):02d}",
+            "items": items,
+        })
+    return orders
+
+
+def render_order_card(order: dict) -> str:
+    items = "\n".join(
+        f"""        <div class="a-fixed-left-grid item-box">
+          <a class="a-link-normal" href="/dp/{item['asin']}/ref=ppx_yo_dt_b_asin_title" title="{item['name']}">
+            <img alt="{item['name']}" src="{item['image']}">
+          </a>
+          <div class="yohtmlc-product-title">{item['name']}</div>
+        </div>"""
+        for item in order["items"]
+    )
+    return f"""    <div class="a-box-group a-spacing-base order order-card" data-order-id="{order['order_id']}">
+      <div class="a-box a-color-offset-background order-info">
+        <span class="a-color-secondary label">Order placed</span>
+        <span class="order-date-invoice-item">{order['date']}</span>
+        <span class="a-color-secondary label">Total</span>
+        <span class="a-color-price">{order['total']}</span>
+        <span class="a-color-secondary">Order # {order['order_id']}</span>
+      </div>
+      <div class="a-box shipment">
+{items}
+      </div>
+    </div>"""
+
+
+def render_order_history_page(start_index: int = 0, orders: list = None, page_size: int = PAGE_SIZE) -> str:
+    """Render the order-history page that starts at `start_index`."""
+    orders = orders if orders is not None else make_orders()
+    page_orders = orders[start_index:start_index + page_size]
+    has_next = start_index + page_size < len(orders)
+    next_link = (
+        f'<li class="a-last pagination-next"><a href="/gp/your-account/order-history?startIndex={start_index + page_size}">Next</a></li>'
+        if has_next
+        else '<li class="a-disabled a-last pagination-next disabled">Next</li>'
+    )
+    cards = "\n".join(render_order_card(order) for order in page_orders)
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+  <title>Your Orders</title>
+  <link rel="stylesheet" href="https://m.media-amazon.com/images/I/orders.css">
+  <script src="https://images-na.ssl-images-amazon.com/images/I/orders.js"></script>
+</head>
+<body>
+  <h1>Your Orders</h1>
+  <div id="ordersContainer" class="your-orders-content-container">
+{cards}
+  </div>
+  <ul class="a-pagination">
+    {next_link}
+  </ul>
+</body>
+</html>"""
+
+
+def order_history_start_index(url: str) -> int:
+    query = parse_qs(urlparse(url).query)
+    try:
+        return int(query.get("startIndex", ["0"])[0])
+    except ValueError:
+        return 0
+
+
+async def install_fake_amazon(context, orders: list = None, server: "FakeAmazonServer" = None) -> None:
+    """Answer every request in `context` from the fake Amazon pages, or proxy it to `server`."""
+    orders = orders if orders is not None else make_orders()
+
+    async def handle(route):
+        request = route.request
+        if server is not None:
+            parsed = urlparse(request.url)
+            local = f"{server.url}{parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
+            await route.fulfill(response=await route.fetch(url=local))
+            return
+        if request.resource_type == "image":
+            await route.fulfill(status=200, content_type="image/gif", body=PIXEL_GIF)
+        elif request.resource_type == "document":
+            html = render_order_history_page(order_history_start_index(request.url), orders)
+            await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html)
+        else:
+            await route.fulfill(status=200, body="")
+
+    await context.route("**/*", handle)
+
+
+class _FakeAmazonHandler(BaseHTTPRequestHandler):
+    server_version = "FakeAmazon/1.0"
+
+    def do_GET(self):
+        fake = self.server.fake
+        if fake.latency:
+            time.sleep(fake.latency)
+        fake.requests += 1
+        path = urlparse(self.path).path
+        if path.startswith("/images/") or path.endswith((".jpg", ".png", ".gif")):
+            body, content_type = PIXEL_GIF, "image/gif"
+        elif path.endswith((".css", ".js")):
+            body, content_type = b"", "text/plain"
+        else:
+            # Every document is an order-history page: the listing, the legacy
+            # order-history URL and the post-login redirect all land here
+            html = render_order_history_page(order_history_start_index(self.path), fake.orders)
+            body, content_type = html.encode(), "text/html; charset=utf-8"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeAmazonServer:
+    """Order-history pages on a local HTTP server, in a background thread."""
+
+    def __init__(self, orders: list = None, latency: float = 0.0, port: int = 0):
+        self.orders = orders if orders is not None else make_orders()
+        self.latency = latency
+        self.requests = 0
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _FakeAmazonHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def serve_fake_amazon(orders: list = None, latency: float = 0.0, port: int = 0) -> FakeAmazonServer:
+    """Start a FakeAmazonServer; every page load waits `latency` seconds server-side."""
+    return FakeAmazonServer(orders, latency, port)
+
+
+def make_search_results(query: str, count: int = 20) -> list:
+    """amazon-mcp shaped search results for `query`, the same on every call."""
+    rng = random.Random(query)
+    results = []
+    for n in range(count):
+        asin = "B0" + "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(8))
+        results.append({
+            "asin": asin,
+            "title": f"{query} {rng.choice(PRODUCT_NAMES)}",
+            "price": f"${rng.randint(5, 300)}.{rng.randint(0, 99):02d}",
+            "url": f"https://www.amazon.com/dp/{asin}",
+            "image_url": f"https://m.media-amazon.com/images/I/{asin}._AC_SL1500_.jpg",
+            "rating": round(rng.uniform(1, 5), 1),
+            "review_count": rng.randint(0, 5000),
+            "category": rng.choice(["clothing", "beauty", "accessories"]),
+        })
+    return results
+
+
+def make_search_stub(latency: float = 0.05, count: int = 20, calls: list = None):
+    """A fake `amazon_search`: sleeps `latency`, then returns (200, results).
+
+    Queries are appended to `calls`, when given, so callers can count upstream hits.
+    """
+    async def fake_amazon_search(query: str):
+        if calls is not None:
+            calls.append(query)
+        await asyncio.sleep(latency)
+        return 200, make_search_results(query, count)
+    return fake_amazon_search
+
+
+async def asgi_get(app, path: str, params: Dict[str, Any]) -> int:
+    """Send one GET through the ASGI `app`, drain the response and return its status."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": urlencode(params).encode(), "headers": [],
+        "server": ("bench", 80), "client": ("bench", 1), "root_path": "",
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+class FakeOrdersResponse:
+    """The slice of httpx.Response that callers of get_user_orders() use."""
+
+    status_code = 200
+
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class FakeAmazonClient:
+    """Stand-in for amazon_mcp.server.Amazon serving the same orders as the fake pages."""
+
+    def __init__(self, *args, orders: list = None, **kwargs):
+        self.orders = orders if orders is not None else make_orders()
+
+    def get_user_orders(self) -> FakeOrdersResponse:
+        return FakeOrdersResponse({"orders": [
+            {
+                "orderId": order["order_id"],
+                "orderDate": order["date"],
+                "items": [
+                    {"asin": item["asin"], "title": item["name"], "image": item["image"], "price": order["total"].lstrip("$")}
+                    for item in order["items"]
+                ],
+            }
+            for order in self.orders
+        ]})
+
+
+def make_order_records(orders: list = None) -> list:
+    """The structured records the scraper's extractors produce for these orders' cards."""
+    orders = orders if orders is not None else make_orders()
+    return [
+        {
+            "order_id": order["order_id"],
+            "order_date": order["date"],
+            "price_texts": [order["total"]],
+            "items": [
+                {"name": item["name"], "href": f"/dp/{item['asin']}/ref=ppx_yo_dt_b_asin_title", "image": item["image"]}
+                for item in order["items"]
+            ],
+        }
+        for order in orders
+    ]
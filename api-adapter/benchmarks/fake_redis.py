@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Minimal in-process Redis-protocol (RESP2) server for exercising the redis
+search cache backend without a real Redis.
+
+Supports the commands RedisCacheBackend and redis-py's connection setup use:
+HELLO, PING, GET, SET (with EX/PX), DEL, SCAN (MATCH), FLUSHDB, SELECT, CLIENT
+and ECHO. Keys expire lazily on read.
+
+Use `start_fake_redis()` from a benchmark, or run standalone:
+python benchmarks/fake_redis.py --port 6390
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, args: List[bytes], session: Dict[str, int]) -> bytes:
+        self.commands += 1
+        command = args[0].upper()
+        if command == b"PING":
+            return b"+PONG\r\n"
+        if command == b"HELLO":
+            # Only nulls differ between RESP2 and RESP3 in the replies below
+            proto = session["proto"] = int(args[1]) if len(args) > 1 else 2
+            if proto == 3:
+                return b"%1\r\n+proto\r\n:3\r\n"
+            return b"*2\r\n+proto\r\n:2\r\n"
+        if command == b"ECHO":
+            return bulk(args[1], session)
+        if command in (b"SELECT", b"CLIENT", b"FLUSHDB"):
+            if command == b"FLUSHDB":
+                self.data.clear()
+            return b"+OK\r\n"
+        if command == b"GET":
+            return bulk(self._live(args[1]), session)
+        if command == b"SET":
+            expires_at = None
+            options = [arg.upper() for arg in args[3:]]
+            for n, option in enumerate(options):
+                if option == b"PX":
+                    expires_at = time.time() + int(args[3 + n + 1]) / 1000
+                elif option == b"EX":
+                    expires_at = time.time() + int(args[3 + n + 1])
+            self.data[args[1]] = (args[2], expires_at)
+            return b"+OK\r\n"
+        if command == b"DEL":
+            removed = sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+            return b":%d\r\n" % removed
+        if command == b"SCAN":
+            pattern = b"*"
+            for n, arg in enumerate(args):
+                if arg.upper() == b"MATCH":
+                    pattern = args[n + 1]
+            keys = [key for key in list(self.data) if self._live(key) is not None and fnmatch.fnmatchcase(key, pattern)]
+            return b"*2\r\n" + bulk(b"0", session) + b"*%d\r\n" % len(keys) + b"".join(bulk(key, session) for key in keys)
+        return b"-ERR unknown command '%s'\r\n" % command
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = {"proto": 2}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.startswith(b"*"):
+                    # Inline command (e.g. from redis-cli or telnet)
+                    args = line.split()
+                else:
+                    args = []
+                    for _ in range(int(line[1:])):
+                        size = int((await reader.readline())[1:])
+                        args.append((await reader.readexactly(size + 2))[:-2])
+                if args:
+                    writer.write(self.execute(args, session))
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> "FakeRedis":
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def bulk(value: Optional[bytes], session: Dict[str, int]) -> bytes:
+    if value is None:
+        return b"_\r\n" if session["proto"] == 3 else b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+async def start_fake_redis(port: int = 0) -> FakeRedis:
+    """Start a fake Redis on 127.0.0.1 (an ephemeral port by default)."""
+    return await FakeRedis().start(port=port)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    fake = await start_fake_redis(args.port)
+    print(f"fake redis listening on {fake.url}")
+    await fake.server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
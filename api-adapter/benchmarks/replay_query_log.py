@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Replay a search query log and compare cache hit rates across query keyings.
+
+Feeds every query in the log through a simulated search cache (an entry
+lives for TTL + stale window seconds after its upstream fetch) once per
+keying scheme: the raw query string, the previous strip + casefold key, and
+canonical_query() with and without stop-word and plural folding. Reports
+each scheme's distinct keys, hit rate and upstream calls, followed by the
+canonical keys that merged the most spellings.
+
+Accepted log lines (mixed freely):
+- JSON objects with "q" or "query" and optional "ts"/"timestamp" (epoch
+  seconds), e.g. the adapter's own AMAZON_SEARCH_QUERY_LOG output
+- access log lines containing "/search?q=..."
+- plain text, one query per line
+
+Lines without a timestamp are spaced 1/--rate seconds apart; without
+--rate, such entries never expire.
+
+Run with: python benchmarks/replay_query_log.py queries.jsonl [--ttl 300] [--stale-ttl 60]
+Try it without a log: python benchmarks/replay_query_log.py --synthetic 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from search_query import canonical_query
+
+SEARCH_URL = re.compile(r"/search\?(\S+)")
+
+SCHEMES: Dict[str, Callable[[str], str]] = {
+    "raw": lambda q: q,
+    "strip + casefold": lambda q: q.strip().casefold(),
+    "canonical": lambda q: canonical_query(q),
+    "+ stop words": lambda q: canonical_query(q, fold_stop_words=True),
+    "+ plurals": lambda q: canonical_query(q, fold_plurals=True),
+    "+ stop words + plurals": lambda q: canonical_query(q, True, True),
+}
+
+
+def parse_line(line: str) -> Optional[Tuple[Optional[float], str]]:
+    """(timestamp or None, query) from one log line, or None if it has no query."""
+    line = line.rstrip("\n")
+    if not line.strip():
+        return None
+    if line.lstrip().startswith("{"):
+        try:
+            record = json.loads(line)
+            q = record.get("q") or record.get("query")
+            ts = record.get("ts") or record.get("timestamp")
+            return (float(ts) if ts is not None else None, q) if q else None
+        except (ValueError, TypeError, AttributeError):
+            pass
+    match = SEARCH_URL.search(line)
+    if match:
+        q = parse_qs(match.group(1)).get("q")
+        return (None, q[0]) if q else None
+    return None, line
+
+
+def read_log(path: str, rate: Optional[float]) -> List[Tuple[float, str]]:
+    entries = []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for n, line in enumerate(f):
+            parsed = parse_line(line)
+            if parsed is None:
+                continue
+            ts, q = parsed
+            if ts is None:
+                ts = n / rate if rate else 0.0
+            entries.append((ts, q))
+    entries.sort(key=lambda entry: entry[0])
+    return entries
+
+
+def synthetic_log(count: int, seed: int = 7) -> List[Tuple[float, str]]:
+    """Zipf-distributed queries typed with variation in case, spacing, articles and plurals."""
+    rng = random.Random(seed)
+    base = [
+        "pink corset", "black dress", "white sneakers", "summer dress", "denim jacket",
+        "silk scarf", "gold hoop earrings", "leather boots", "yoga leggings", "linen shirt",
+        "dress for the beach", "running shoes", "wool sweater", "maxi skirt", "sun hat",
+    ] + [f"item {n}" for n in range(300)]
+    weights = [1 / (n + 1) for n in range(len(base))]
+
+    def variant(q: str) -> str:
+        roll = rng.random()
+        if roll < 0.15:
+            q = q.title()
+        elif roll < 0.2:
+            q = q.upper()
+        if rng.random() < 0.1:
+            q = q.replace(" ", "  ")
+        if rng.random() < 0.1:
+            q += " "
+        if rng.random() < 0.05:
+            q = q.replace(" ", "\u00a0", 1)
+        if rng.random() < 0.08 and not q.endswith("s"):
+            q += "s"
+        if rng.random() < 0.05:
+            q = "a " + q
+        return q
+
+    return [(n * 0.5, variant(rng.choices(base, weights)[0])) for n in range(count)]
+
+
+def replay(entries: List[Tuple[float, str]], key: Callable[[str], str], lifetime: float) -> Dict[str, float]:
+    fetched_at: Dict[str, float] = {}
+    hits = 0
+    for ts, q in entries:
+        k = key(q)
+        last = fetched_at.get(k)
+        if last is not None and ts - last < lifetime:
+            hits += 1
+        else:
+            fetched_at[k] = ts
+    return {
+        "keys": len(fetched_at),
+        "hits": hits,
+        "upstream": len(entries) - hits,
+        "hit_rate": hits / len(entries) if entries else 0.0,
+    }
+
+
+def merged_spellings(entries: List[Tuple[float, str]], key: Callable[[str], str]) -> Iterator[Tuple[str, List[str]]]:
+    spellings = defaultdict(set)
+    for _, q in entries:
+        spellings[key(q)].add(q)
+    ranked = sorted(spellings.items(), key=lambda item: len(item[1]), reverse=True)
+    for k, variants in ranked:
+        if len(variants) > 1:
+            yield k, sorted(variants)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("log", nargs="?", help="query log file")
+    parser.add_argument("--ttl", type=float, default=float(os.getenv("AMAZON_SEARCH_CACHE_TTL", "300")))
+    parser.add_argument("--stale-ttl", type=float, default=float(os.getenv("AMAZON_SEARCH_CACHE_STALE_TTL", "60")))
+    parser.add_argument("--rate", type=float, help="requests/sec to assume for lines without timestamps")
+    parser.add_argument("--synthetic", type=int, help="replay N generated queries instead of a log")
+    parser.add_argument("--examples", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        entries = synthetic_log(args.synthetic)
+    elif args.log:
+        entries = read_log(args.log, args.rate)
+    else:
+        parser.error("give a log file or --synthetic N")
+    if not entries:
+        sys.exit("no queries found")
+
+    lifetime = args.ttl + args.stale_ttl
+    print(f"{len(entries)} queries, entries live {lifetime:.0f}s")
+    baseline = None
+    for name, key in SCHEMES.items():
+        result = replay(entries, key, lifetime)
+        baseline = baseline or result
+        saved = 1 - result["upstream"] / baseline["upstream"]
+        print(
+            f"  {name:>24}: {result['keys']:7d} keys  hit rate {result['hit_rate']:6.1%}  "
+            f"{result['upstream']:7d} upstream calls ({saved:6.1%} fewer than raw)"
+        )
+
+    print("Most-merged canonical keys:")
+    for k, variants in list(merged_spellings(entries, SCHEMES["canonical"]))[:args.examples]:
+        shown = ", ".join(repr(v) for v in variants[:4])
+        print(f"  {k!r} <- {len(variants)} spellings: {shown}{', ...' if len(variants) > 4 else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+"""
+Adapter benchmark suite: one run, every scenario, JSON results for comparing commits.
+
+Runs the FastAPI app in-process against the deterministic fakes in
+fake_amazon.py. Requests go straight into the ASGI app (no client or socket
+overhead), with a fixed-latency `amazon_search` stub and a throwaway order
+store. Upstream rate limits are off so the numbers reflect the adapter.
+
+Scenarios:
+
+- search_cold: unique queries, empty cache; every request goes upstream
+- search_warm: a mix of page/sort/category views over cached queries
+- search_warm_sqlite, search_warm_redis: search_warm with the result sets
+  in the shared SQLite or Redis backend (a local fake_redis server); every
+  search scenario reports the cache backend's hit rate
+- orders_warm: /orders served from a stored snapshot
+- orders_cold: /orders for a new account with a stopped browser pool: the 202,
+  the sync job (Chromium driving the fake order pages on a local HTTP
+  server) and the final 200
+- orders_sync_warm: the same with the pool already running
+- orders_replay: a full scrape (navigation, extraction, paging) replayed
+  from a HAR archive of the fake order pages, with --page-latency per response
+- normalize_results, canonical_query, result_set_build, parse_order_page,
+  orders_snapshot_encode, hot_query_record, resource_policy, upstream_guards:
+  microbenchmarks (best of --repeat runs); resource_policy first checks the
+  policy's decisions on a table of known requests, and upstream_guards steps
+  the rate limiter, AIMD limit and circuit breaker through a fake clock
+
+Latency scenarios report throughput and p50/p95/p99; microbenchmarks report
+microseconds per operation. Scenarios that cannot run here (no Chromium,
+no BeautifulSoup) are recorded as skipped with the reason.
+
+Run with: python benchmarks/run_benchmarks.py [--output results.json] [--quick] [--only search_cold,orders_warm]
+Compare:  python benchmarks/compare_results.py base.json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+
+import adapter
+import amazon_scraper
+import order_store
+from adapter import ResultSet, normalize_amazon_mcp_results
+from amazon_scraper import order_history_page_url, order_records_to_items, parse_order_history_html, scrape_amazon_orders
+from bench_orders_pool import sync_orders_through_api
+from cache_backends import HAS_REDIS
+from fake_amazon import (
+    PAGE_SIZE,
+    FakeAmazonClient,
+    asgi_get,
+    install_fake_amazon,
+    make_order_records,
+    make_orders,
+    make_search_results,
+    make_search_stub,
+    render_order_history_page,
+    serve_fake_amazon,
+)
+from fake_redis import start_fake_redis
+from resilience import AdaptiveConcurrency, CircuitBreaker, TokenBucket, Upstream, UpstreamUnavailable
+from resource_policy import DEFAULT_BLOCKED_TYPES, ResourcePolicy
+from scrape_archive import LatencyProfile, ScrapeArchive
+from search_query import canonical_query
+
+ACCOUNT = "bench@example.com"
+SEARCH_VIEWS = [
+    {"page": 1, "limit": 10},
+    {"page": 2, "limit": 10},
+    {"page": 1, "limit": 20, "sort": "price_low"},
+    {"page": 1, "limit": 10, "sort": "rating", "category": "clothing"},
+]
+
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, max(0, int(len(ordered) * q + 0.5) - 1))]
+
+
+def latency_result(latencies: List[float], statuses: Counter, elapsed: float, concurrency: int) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "kind": "latency",
+        "requests": len(ordered),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(len(ordered) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def load(path: str, requests: List[Dict[str, Any]], concurrency: int) -> Dict[str, Any]:
+    """Send `requests` (query params) to `path` from `concurrency` clients; latency summary."""
+    pending = iter(requests)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    async def client():
+        for params in pending:
+            start = time.perf_counter()
+            statuses[await asgi_get(adapter.app, path, params)] += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latency_result(latencies, statuses, time.perf_counter() - start, concurrency)
+
+
+def per_op(fn: Callable[[], Any], ops_per_call: int, number: int, repeat: int) -> Dict[str, Any]:
+    """Best-of-`repeat` microseconds per operation for `fn`, which does `ops_per_call` operations."""
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    return {
+        "kind": "micro",
+        "per_op_us": round(best / (number * ops_per_call) * 1e6, 3),
+        "ops": number * ops_per_call,
+        "repeat": repeat,
+    }
+
+
+async def reset_search(args) -> List[str]:
+    """Empty the search cache and install a fresh stub; returns the list upstream calls are logged to."""
+    await adapter.SEARCH_CACHE.clear()
+    adapter.SEARCH_CACHE.stats.update(dict.fromkeys(adapter.SEARCH_CACHE.stats, 0))
+    adapter._decoded_result_sets.clear()
+    calls: List[str] = []
+    adapter.amazon_search = make_search_stub(args.upstream_latency, args.products, calls)
+    return calls
+
+
+async def bench_search_cold(args) -> Dict[str, Any]:
+    calls = await reset_search(args)
+    requests = [{"q": f"cold query {n}"} for n in range(args.requests)]
+    result = await load("/search", requests, args.concurrency)
+    result["upstream_calls"] = len(calls)
+    result["cache"] = adapter.SEARCH_CACHE.status()
+    return result
+
+
+async def bench_search_warm(args) -> Dict[str, Any]:
+    calls = await reset_search(args)
+    queries = [f"warm query {n}" for n in range(args.queries)]
+    for q in queries:
+        await adapter.load_result_set(q)
+    warmed = len(calls)
+    requests = [
+        {"q": queries[n % len(queries)], **SEARCH_VIEWS[n // len(queries) % len(SEARCH_VIEWS)]}
+        for n in range(args.requests)
+    ]
+    result = await load("/search", requests, args.concurrency)
+    result["upstream_calls"] = len(calls) - warmed
+    result["cache"] = adapter.SEARCH_CACHE.status()
+    return result
+
+
+async def bench_search_warm_on(args, kind: str, path: Path = None, url: str = None) -> Dict[str, Any]:
+    """search_warm with the search cache swapped for a new `kind` backend."""
+    configured = adapter.SEARCH_CACHE_PATH, adapter.SEARCH_CACHE_URL
+    adapter.SEARCH_CACHE_PATH, adapter.SEARCH_CACHE_URL = path, url
+    try:
+        backend = adapter.build_search_cache(kind)
+    finally:
+        adapter.SEARCH_CACHE_PATH, adapter.SEARCH_CACHE_URL = configured
+    if backend.name != kind:
+        return {"skipped": f"the {kind} cache backend could not be built"}
+    previous, adapter.SEARCH_CACHE = adapter.SEARCH_CACHE, backend
+    try:
+        return await bench_search_warm(args)
+    finally:
+        adapter.SEARCH_CACHE = previous
+        await backend.close()
+
+
+async def bench_search_warm_sqlite(args) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="aura-bench-cache-") as tmp:
+        return await bench_search_warm_on(args, "sqlite", path=Path(tmp) / "search-cache.db")
+
+
+async def bench_search_warm_redis(args) -> Dict[str, Any]:
+    if not HAS_REDIS:
+        return {"skipped": "the redis package is not installed"}
+    server = await start_fake_redis()
+    try:
+        return await bench_search_warm_on(args, "redis", url=server.url)
+    finally:
+        await server.stop()
+
+
+def seed_order_snapshot(account: str, orders: list) -> int:
+    store = order_store.get_order_store()
+    rows = adapter.scraped_order_rows(order_records_to_items(make_order_records(orders)))
+    store.upsert_items(account, rows)
+    # The whole (fake) history, so every /orders request is served from it
+    store.mark_synced(account, {"covered_items": len(rows), "complete": True})
+    return len(rows)
+
+
+async def bench_orders_warm(args) -> Dict[str, Any]:
+    if not adapter.HAS_PLAYWRIGHT:
+        return {"skipped": "playwright is not installed, /orders has no snapshot path"}
+    os.environ["AMAZON_EMAIL"] = ACCOUNT
+    items = seed_order_snapshot(ACCOUNT, make_orders(args.orders))
+    requests = [{"limit": (10, 50, 200)[n % 3]} for n in range(args.requests)]
+    result = await load("/orders", requests, args.concurrency)
+    result["stored_items"] = items
+    return result
+
+
+async def bench_orders_browser(args, cold: bool) -> Dict[str, Any]:
+    if not amazon_scraper.HAS_PLAYWRIGHT:
+        return {"skipped": "playwright is not installed"}
+    orders = make_orders(args.orders)
+    server = serve_fake_amazon(orders, latency=args.page_latency)
+    with tempfile.TemporaryDirectory(prefix="aura-bench-profile-") as profile_dir:
+        pool = amazon_scraper.BrowserPool(
+            user_data_dir=Path(profile_dir),
+            on_launch=lambda context: install_fake_amazon(context, orders, server=server),
+            resource_policy=amazon_scraper.resource_policy_from_env(),
+        )
+        amazon_scraper._browser_pool = pool
+        try:
+            await pool.start()
+        except Exception as e:
+            server.stop()
+            return {"skipped": f"browser unavailable: {str(e).strip().splitlines()[0]}"}
+
+        latencies: List[float] = []
+        statuses: Counter = Counter()
+        transport = httpx.ASGITransport(app=adapter.app)
+        start = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                for n in range(args.runs):
+                    if cold:
+                        await pool.stop()
+                    run_start = time.perf_counter()
+                    body = await sync_orders_through_api(client, f"{'cold' if cold else 'warm'}-{n}@example.com", 50)
+                    latencies.append(time.perf_counter() - run_start)
+                    statuses[200] += 1
+                    served = len(body["orders"])
+        finally:
+            await pool.stop()
+            server.stop()
+        result = latency_result(latencies, statuses, time.perf_counter() - start, 1)
+        # Every request that reached the fake server: documents plus unblocked subresources
+        result["page_loads"] = server.requests
+        if pool.resource_policy is not None:
+            result["resource_policy"] = pool.resource_policy.status()
+        result["orders_served"] = served
+        return result
+
+
+async def bench_orders_cold(args) -> Dict[str, Any]:
+    return await bench_orders_browser(args, cold=True)
+
+
+async def bench_orders_sync_warm(args) -> Dict[str, Any]:
+    return await bench_orders_browser(args, cold=False)
+
+
+def write_fake_archive(path: Path, orders: list) -> None:
+    """A HAR archive of every fake order-history page, at the URLs the scraper requests."""
+    archive = ScrapeArchive(path, "record")
+    headers = [("Content-Type", "text/html; charset=utf-8")]
+    for start in range(0, len(orders) + PAGE_SIZE, PAGE_SIZE):
+        html = render_order_history_page(start, orders).encode()
+        archive.add(order_history_page_url(start), 200, headers, html, elapsed=0.05)
+    archive.save()
+
+
+async def bench_orders_replay(args) -> Dict[str, Any]:
+    if not amazon_scraper.HAS_PLAYWRIGHT:
+        return {"skipped": "playwright is not installed"}
+    orders = make_orders(args.orders)
+    with tempfile.TemporaryDirectory(prefix="aura-bench-replay-") as tmp:
+        har_path = Path(tmp) / "orders.har"
+        write_fake_archive(har_path, orders)
+        archive = ScrapeArchive(har_path, "replay", LatencyProfile(base=args.page_latency))
+        pool = amazon_scraper.BrowserPool(
+            user_data_dir=Path(tmp) / "profile", archive=archive,
+            resource_policy=amazon_scraper.resource_policy_from_env(),
+        )
+        try:
+            await pool.start()
+        except Exception as e:
+            return {"skipped": f"browser unavailable: {str(e).strip().splitlines()[0]}"}
+        latencies: List[float] = []
+        start = time.perf_counter()
+        try:
+            for _ in range(args.runs):
+                run_start = time.perf_counter()
+                items = await scrape_amazon_orders("replay@example.com", "replay", max_orders=args.orders, pool=pool)
+                latencies.append(time.perf_counter() - run_start)
+        finally:
+            await pool.stop()
+        result = latency_result(latencies, Counter({200: len(latencies)}), time.perf_counter() - start, 1)
+        result["items"] = len(items)
+        result["archive"] = archive.status()
+        return result
+
+
+async def bench_normalize_results(args) -> Dict[str, Any]:
+    items = [item for n in range(50) for item in make_search_results(f"normalize {n}", 20)]
+    return per_op(lambda: normalize_amazon_mcp_results(items), len(items), args.number, args.repeat)
+
+
+async def bench_canonical_query(args) -> Dict[str, Any]:
+    raw = canonical_query.__wrapped__
+    queries = [
+        f"{word} {'Dress' if n % 2 else 'dresses'}  {'fors' if n % 4 == 0 else 'for'} the {'Beach' if n % 3 else 'ｂｅａｃｈ'} {n}"
+        for n, word in enumerate(["Pink", "black", "WHITE", "summer", "linen"] * 200)
+    ]
+    # Canonical keys are fed back in (e.g. by the prefetcher), so they must be fixed points
+    for q in queries:
+        key = raw(q, True, True)
+        if raw(key, True, True) != key:
+            raise AssertionError(f"canonical_query is not idempotent for {q!r}: {key!r}")
+
+    def run():
+        for q in queries:
+            raw(q, True, True)
+    return per_op(run, len(queries), args.number, args.repeat)
+
+
+async def bench_result_set_build(args) -> Dict[str, Any]:
+    products = normalize_amazon_mcp_results(make_search_results("build", args.products))
+    return per_op(lambda: ResultSet("build", products), 1, args.number * 10, args.repeat)
+
+
+async def bench_parse_order_page(args) -> Dict[str, Any]:
+    if not amazon_scraper.HAS_BS4:
+        return {"skipped": "beautifulsoup4 is not installed"}
+    html = render_order_history_page(0, make_orders(10))
+    return per_op(lambda: parse_order_history_html(html), 1, args.number, args.repeat)
+
+
+async def bench_orders_snapshot_encode(args) -> Dict[str, Any]:
+    seed_order_snapshot(ACCOUNT, make_orders(args.orders))
+    store = order_store.get_order_store()
+    key = adapter.orders_snapshot_key(ACCOUNT, store.sync_state(ACCOUNT), 50, None)
+
+    def run():
+        adapter.ORDERS_BODY_CACHE.clear()
+        adapter.render_orders_snapshot(store, key)
+    return per_op(run, 1, args.number, args.repeat)
+
+
+async def bench_hot_query_record(args) -> Dict[str, Any]:
+    keys = [f"hot query {n % 500}" for n in range(5000)]
+
+    def run():
+        for key in keys:
+            adapter.HOT_QUERIES.record(key, key)
+    return per_op(run, len(keys), max(1, args.number // 10), args.repeat)
+
+
+# (request URL, resource type, page URL) -> expected block reason (None: allowed)
+RESOURCE_POLICY_CASES = [
+    ("https://m.media-amazon.com/images/I/x.jpg", "image", "https://www.amazon.com/your-orders/orders", "image"),
+    ("https://m.media-amazon.com/images/I/x.css", "stylesheet", "https://www.amazon.com/your-orders/orders", None),
+    ("https://www.googletagmanager.com/gtm.js", "script", "https://www.amazon.com/your-orders/orders", "third_party"),
+    ("https://aax-us-east.amazon-adsystem.com/e/dtb", "script", "https://www.amazon.com/ap/signin", "ads"),
+    # Captcha images on the sign-in page come from S3, outside Amazon's own domains
+    ("https://opfcaptcha-prod.s3.amazonaws.com/abc.jpg", "image", "https://www.amazon.com/ap/signin", None),
+    ("https://opfcaptcha-prod.s3.amazonaws.com/abc.jpg", "image", "https://www.amazon.com/ap/cvf/request", None),
+]
+
+
+async def bench_resource_policy(args) -> Dict[str, Any]:
+    policy = ResourcePolicy(blocked_types={kind: types.split(",") for kind, types in DEFAULT_BLOCKED_TYPES.items()})
+    for url, resource_type, page_url, expected in RESOURCE_POLICY_CASES:
+        reason = policy.block_reason(url, resource_type, page_url)
+        if reason != expected:
+            raise AssertionError(f"resource policy gave {reason!r} for {resource_type} {url} on {page_url}, expected {expected!r}")
+
+    def run():
+        for url, resource_type, page_url, _ in RESOURCE_POLICY_CASES:
+            policy.block_reason(url, resource_type, page_url)
+    return per_op(run, len(RESOURCE_POLICY_CASES), args.number * 10, args.repeat)
+
+
+class FakeClock:
+    """A monotonic clock that only moves when told to."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def check(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+
+def check_token_bucket() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+    check([bucket.reserve(), bucket.reserve()] == [0.0, 0.0], "a full bucket should serve its burst at once")
+    check(bucket.reserve(max_wait=0.4) is None, "a wait over max_wait should be refused")
+    check(bucket.tokens == 0, "a refused reservation should not take a token")
+    # Reservations queue in arrival order, each waiting one more token interval
+    check([bucket.reserve(max_wait=0.5), bucket.reserve()] == [0.5, 1.0], "reservations should queue FIFO")
+    clock.advance(1.5)
+    check(bucket.reserve() == 0.0, "refilled tokens should pay off the queued reservations first")
+    clock.advance(60)
+    check(bucket.tokens == 2, "refill should stop at the burst size")
+    check(TokenBucket(rate=0, burst=1, clock=clock).reserve(max_wait=0) == 0.0, "rate 0 should not limit")
+
+
+async def check_adaptive_concurrency() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveConcurrency(initial=2, max_limit=4, cooldown=1.0, clock=clock)
+    await limiter.acquire()
+    await limiter.acquire()
+    order: List[str] = []
+
+    async def waiter(name: str) -> None:
+        await limiter.acquire()
+        order.append(name)
+
+    tasks = {name: asyncio.ensure_future(waiter(name)) for name in "abcd"}
+    await asyncio.sleep(0)
+    check(limiter.queued == 4 and limiter.inflight == 2, "callers over the limit should queue")
+    limiter.release(None)
+    await asyncio.sleep(0)
+    check(order == ["a"], f"a freed slot should go to the first waiter, got {order}")
+    tasks["b"].cancel()
+    await asyncio.sleep(0)
+    check(limiter.queued == 2, "a cancelled waiter should leave the queue")
+    # Granted and cancelled before it ran: the slot passes to the next waiter
+    limiter.release(None)
+    tasks["c"].cancel()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    check(order == ["a", "d"] and limiter.inflight == 2, f"a cancelled grant should be handed on, got {order}")
+
+    # Additive increase: about one slot per window of successes, capped at max_limit
+    limiter.release(True)
+    check(limiter.limit == 2.5, f"a success should add 1/limit, got {limiter.limit}")
+    for _ in range(20):
+        limiter.inflight += 1
+        limiter.release(True)
+    check(limiter.limit == 4, f"the limit should stop at max_limit, got {limiter.limit}")
+    # Multiplicative decrease, at most once per cooldown
+    limiter.inflight += 2
+    limiter.release(False)
+    limiter.release(False)
+    check(limiter.limit == 2, f"a burst of overloads should halve the limit once, got {limiter.limit}")
+    clock.advance(1.0)
+    for _ in range(3):
+        limiter.inflight += 1
+        limiter.release(False)
+        clock.advance(1.0)
+    check(limiter.limit == 1, f"the limit should not drop below min_limit, got {limiter.limit}")
+    check(limiter.inflight == 1, f"inflight should balance acquires and releases, got {limiter.inflight}")
+
+
+def check_circuit_breaker() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for outcome in (False, False, True, False, False):
+        check(breaker.allow(), "a closed circuit should allow calls")
+        breaker.record(outcome)
+    check(breaker.state == "closed", "a success should reset the consecutive failure count")
+    breaker.record(False)
+    check(breaker.state == "open" and breaker.opened_count == 1, "the threshold should open the circuit")
+    check(not breaker.allow() and breaker.is_open, "an open circuit should refuse calls")
+    clock.advance(4)
+    check(breaker.retry_after() == 6, f"retry_after should count down, got {breaker.retry_after()}")
+    clock.advance(6)
+    check(breaker.allow(), "after reset_timeout one probe should be allowed")
+    check(breaker.state == "half_open" and not breaker.allow(), "only one probe at a time")
+    breaker.record(None)
+    check(breaker.allow(), "a cancelled probe should free the probe slot")
+    breaker.record(False)
+    check(breaker.state == "open" and breaker.opened_count == 2, "a failed probe should reopen the circuit")
+    check(breaker.retry_after() == 10, "a failed probe should restart the timeout")
+    clock.advance(10)
+    check(breaker.allow(), "a new probe should be allowed after the timeout")
+    breaker.record(True)
+    check(breaker.state == "closed" and breaker.failures == 0, "a successful probe should close the circuit")
+
+
+async def check_upstream() -> None:
+    clock = FakeClock()
+    upstream = Upstream("check", rate=1, burst=1, concurrency=2, failure_threshold=2, max_wait=0.5, clock=clock)
+    calls: List[str] = []
+
+    async def fn(status: int) -> int:
+        calls.append(status)
+        return status
+
+    check(await upstream.call(fn, 200) == 200, "an allowed call should return its result")
+    try:
+        await upstream.call(fn, 200)
+        raise AssertionError("a call needing a token beyond max_wait should be refused")
+    except UpstreamUnavailable as e:
+        check(e.reason == "rate_limited" and calls == [200], "a rate-limited call should not reach upstream")
+    check(upstream.breaker.failures == 0, "a rate-limited refusal should not count as a failure")
+    for _ in range(2):
+        clock.advance(1)
+        await upstream.call(fn, 429, overloaded=lambda status: status != 200)
+    check(upstream.stats["overloads"] == 2 and upstream.breaker.state == "open", "overloads should open the circuit")
+    check(upstream.concurrency.limit == 1, f"overloads should shrink the limit, got {upstream.concurrency.limit}")
+    clock.advance(1)
+    try:
+        await upstream.call(fn, 200)
+        raise AssertionError("an open circuit should refuse calls")
+    except UpstreamUnavailable as e:
+        check(e.reason == "circuit_open" and len(calls) == 3, "a refused call should not reach upstream")
+
+
+async def bench_upstream_guards(args) -> Dict[str, Any]:
+    check_token_bucket()
+    await check_adaptive_concurrency()
+    check_circuit_breaker()
+    await check_upstream()
+
+    upstream = Upstream("bench", rate=0, burst=1, concurrency=8)
+
+    async def noop() -> None:
+        return None
+
+    calls = args.number * 50
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await upstream.call(noop)
+        best = min(best, time.perf_counter() - start)
+    return {"kind": "micro", "per_op_us": round(best / calls * 1e6, 3), "ops": calls, "repeat": args.repeat}
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "search_cold": bench_search_cold,
+    "search_warm": bench_search_warm,
+    "search_warm_sqlite": bench_search_warm_sqlite,
+    "search_warm_redis": bench_search_warm_redis,
+    "orders_warm": bench_orders_warm,
+    "orders_cold": bench_orders_cold,
+    "orders_sync_warm": bench_orders_sync_warm,
+    "orders_replay": bench_orders_replay,
+    "normalize_results": bench_normalize_results,
+    "canonical_query": bench_canonical_query,
+    "result_set_build": bench_result_set_build,
+    "parse_order_page": bench_parse_order_page,
+    "orders_snapshot_encode": bench_orders_snapshot_encode,
+    "hot_query_record": bench_hot_query_record,
+    "resource_policy": bench_resource_policy,
+    "upstream_guards": bench_upstream_guards,
+}
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*argv: str) -> str:
+        return subprocess.run(
+            ["git", *argv], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--", ".."))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def describe(result: Dict[str, Any]) -> str:
+    if "skipped" in result:
+        return f"skipped ({result['skipped']})"
+    if result["kind"] == "micro":
+        return f"{result['per_op_us']:10.2f} us/op"
+    line = (
+        f"{result['throughput_rps']:8.1f} req/s  p50 {result['p50_ms']:8.2f} ms  "
+        f"p95 {result['p95_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  {result['status']}"
+    )
+    if "cache" in result:
+        line += f"  {result['cache']['backend']} hit rate {result['cache']['hit_rate']}"
+    return line
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default="benchmark-results.json", help="JSON results file")
+    parser.add_argument("--only", help="comma-separated scenarios (default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller runs, for a smoke check")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per latency scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=50, help="cached queries in search_warm")
+    parser.add_argument("--products", type=int, default=50, help="results per upstream search")
+    parser.add_argument("--orders", type=int, default=50, help="orders in the fake account")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="amazon_search stub latency (s)")
+    parser.add_argument("--page-latency", type=float, default=0.05, help="fake order page latency (s)")
+    parser.add_argument("--runs", type=int, default=3, help="scrapes per browser scenario")
+    parser.add_argument("--number", type=int, default=20, help="calls per microbenchmark repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if args.quick:
+        args.requests, args.runs, args.number, args.repeat = 200, 1, 3, 3
+
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    adapter.HAS_AMAZON_MCP = True
+    adapter.Amazon = FakeAmazonClient
+    adapter.SEARCH_UPSTREAM.bucket.rate = 0
+    adapter.ORDERS_UPSTREAM.bucket.rate = 0
+    os.environ.setdefault("AMAZON_PASSWORD", "bench")
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="aura-bench-") as tmp:
+        order_store._order_store = order_store.OrderStore(Path(tmp) / "orders.db")
+        try:
+            for name in names:
+                results[name] = await SCENARIOS[name](args)
+                print(f"{name:>24}: {describe(results[name])}")
+        finally:
+            await adapter.ORDER_JOBS.shutdown()
+            order_store._order_store.close()
+            order_store._order_store = None
+
+    report = {
+        "meta": {
+            **git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cache_backend": adapter.SEARCH_CACHE.name,
+            "metrics_enabled": adapter.METRICS_ENABLED,
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "only")},
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
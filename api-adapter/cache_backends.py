@@ -0,0 +1,323 @@
+"""
+Pluggable backends for the search result cache.
+
+Every backend stores entries with two deadlines: `fresh_until` (the TTL) and
+`expires_at` (TTL plus a stale-while-revalidate window). get() returns
+an entry until it expires, marked stale once it is past `fresh_until`, so the
+caller can serve it immediately and refresh it in the background.
+
+- memory: in-process TTLCache bounded by bytes (the default; one per worker)
+- sqlite: a file on local disk shared by every worker on the host, read
+  through SQLite's mmap
+- redis: any Redis-protocol server shared across hosts (needs the redis
+  package; benchmarks/fake_redis.py stands in locally)
+
+Shared backends store and return bytes (callers encode values and may keep
+their own decoded copies keyed on `stored_at`); the memory backend keeps live
+objects. Each backend counts its own hits, stale hits, misses, sets and
+errors for /health.
+"""
+import asyncio
+import logging
+import sqlite3
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from cachetools import TTLCache
+
+try:
+    import redis.asyncio as aioredis
+    HAS_REDIS = True
+except ImportError:
+    aioredis = None
+    HAS_REDIS = False
+
+logger = logging.getLogger("aura-cache")
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float
+    fresh_until: float
+    expires_at: float
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) >= self.fresh_until
+
+
+class CacheBackend(ABC):
+    """Base class: counting and TTL bookkeeping around `_load` / `_store`.
+
+    Subclasses implement `_load`, `_store`, `delete` and `clear`; one missing
+    any of them cannot be instantiated.
+
+    Backend failures are logged and counted, and reads fall back to a miss, so
+    a broken shared cache degrades to calling upstream instead of failing
+    requests.
+    """
+
+    name = "base"
+    shared = False
+
+    def __init__(self):
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "sets": 0, "errors": 0}
+
+    @abstractmethod
+    async def _load(self, key: str) -> Optional[CacheEntry]:
+        """The stored entry for `key`, expired or not, or None."""
+
+    @abstractmethod
+    async def _store(self, key: str, entry: CacheEntry) -> None:
+        """Store `entry` under `key`, replacing any previous entry."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the entry for `key`, if any."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry."""
+
+    async def close(self) -> None:
+        pass
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """The entry for `key` if it has not expired; check `is_stale()` on it."""
+        try:
+            entry = await self._load(key)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"{self.name} cache read failed for {key!r}: {e}")
+            entry = None
+        now = time.time()
+        if entry is None or entry.expires_at <= now:
+            self.stats["misses"] += 1
+            return None
+        self.stats["stale_hits" if entry.is_stale(now) else "hits"] += 1
+        return entry
+
+    async def peek(self, key: str) -> Optional[CacheEntry]:
+        """Like get(), but not counted in the stats (for housekeeping such as prefetch)."""
+        try:
+            entry = await self._load(key)
+        except Exception:
+            return None
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry
+
+    async def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0) -> Optional[CacheEntry]:
+        """Store `value`, fresh for `ttl` seconds and servable stale for `stale_ttl` more.
+
+        Returns the stored entry, or None if the backend could not store it.
+        """
+        now = time.time()
+        entry = CacheEntry(value, now, now + ttl, now + ttl + stale_ttl)
+        try:
+            await self._store(key, entry)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"{self.name} cache write failed for {key!r}: {e}")
+            return None
+        self.stats["sets"] += 1
+        return entry
+
+    def status(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"]
+        served = self.stats["hits"] + self.stats["stale_hits"]
+        return {
+            "backend": self.name,
+            "shared": self.shared,
+            **self.stats,
+            "hit_rate": round(served / lookups, 4) if lookups else None,
+        }
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process TTLCache holding live objects, bounded by `getsizeof` bytes."""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int, max_ttl: float, getsizeof: Callable[[Any], int]):
+        super().__init__()
+        # TTLCache expires at the longest lifetime we hand out; get() checks each entry's own deadlines
+        self._cache = TTLCache(maxsize=max_bytes, ttl=max_ttl, getsizeof=lambda entry: getsizeof(entry.value))
+
+    async def _load(self, key: str) -> Optional[CacheEntry]:
+        return self._cache.get(key)
+
+    async def _store(self, key: str, entry: CacheEntry) -> None:
+        self._cache[key] = entry
+
+    async def delete(self, key: str) -> None:
+        self._cache.pop(key, None)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+
+class SqliteCacheBackend(CacheBackend):
+    """File cache shared by every worker process on one host.
+
+    Reads go through SQLite's memory-mapped I/O, so a hit is a page-cache read
+    rather than a syscall per page. Expired rows are purged and the file is
+    trimmed to `max_bytes` (oldest first) every PURGE_EVERY writes. SQLite
+    calls run on a single worker thread, off the event loop.
+    """
+
+    name = "sqlite"
+    shared = True
+    PURGE_EVERY = 64
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache (
+        key          TEXT PRIMARY KEY,
+        value        BLOB NOT NULL,
+        stored_at    REAL NOT NULL,
+        fresh_until  REAL NOT NULL,
+        expires_at   REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS cache_by_age ON cache (stored_at);
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5)
+        # Calls are serialized by the lock anyway; one thread keeps them off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aura-cache-sqlite")
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(f"PRAGMA mmap_size={max(max_bytes * 2, 64 * 1024 * 1024)}")
+            self._conn.executescript(self.SCHEMA)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _load(self, key: str) -> Optional[CacheEntry]:
+        return await self._run(self._load_sync, key)
+
+    def _load_sync(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, fresh_until, expires_at FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(*row)
+
+    async def _store(self, key: str, entry: CacheEntry) -> None:
+        await self._run(self._store_sync, key, entry)
+
+    def _store_sync(self, key: str, entry: CacheEntry) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, fresh_until, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, *entry),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._purge()
+
+    def _purge(self) -> None:
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache").fetchone()[0]
+        if total > self.max_bytes:
+            # Drop the oldest entries until the file is back under budget
+            excess = total - self.max_bytes
+            for key, size in self._conn.execute("SELECT key, LENGTH(value) FROM cache ORDER BY stored_at").fetchall():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                excess -= size
+                if excess <= 0:
+                    break
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._execute, "DELETE FROM cache WHERE key = ?", (key,))
+
+    async def clear(self) -> None:
+        await self._run(self._execute, "DELETE FROM cache", ())
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(sql, params)
+
+    async def close(self) -> None:
+        await self._run(self._close_sync)
+        self._executor.shutdown(wait=False)
+
+    def _close_sync(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache on a Redis-protocol server, shared by every worker that points at it.
+
+    Each entry is one key holding a 24-byte header (stored_at, fresh_until,
+    expires_at as doubles) followed by the value bytes, written with a PX
+    expiry at `expires_at`, so a hit is a single GET.
+    """
+
+    name = "redis"
+    shared = True
+    HEADER = struct.Struct("!ddd")
+
+    def __init__(self, url: str, prefix: str = "aura:"):
+        super().__init__()
+        if not HAS_REDIS:
+            raise ImportError("redis not installed (pip install redis)")
+        self.url = url
+        self.prefix = prefix
+        self._client = aioredis.from_url(url)
+
+    async def _load(self, key: str) -> Optional[CacheEntry]:
+        blob = await self._client.get(self.prefix + key)
+        if blob is None:
+            return None
+        return CacheEntry(blob[self.HEADER.size:], *self.HEADER.unpack_from(blob))
+
+    async def _store(self, key: str, entry: CacheEntry) -> None:
+        blob = self.HEADER.pack(entry.stored_at, entry.fresh_until, entry.expires_at) + entry.value
+        ttl_ms = max(1, int((entry.expires_at - time.time()) * 1000))
+        await self._client.set(self.prefix + key, blob, px=ttl_ms)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self._client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_cache_backend(
+    kind: str,
+    *,
+    max_bytes: int,
+    max_ttl: float,
+    getsizeof: Callable[[Any], int],
+    path: Optional[Path] = None,
+    url: Optional[str] = None,
+) -> CacheBackend:
+    """Build the backend named by `kind` ("memory", "sqlite" or "redis")."""
+    if kind == "memory":
+        return MemoryCacheBackend(max_bytes, max_ttl, getsizeof)
+    if kind == "sqlite":
+        return SqliteCacheBackend(path, max_bytes)
+    if kind == "redis":
+        return RedisCacheBackend(url or "redis://localhost:6379/0")
+    raise ValueError(f"Unknown cache backend: {kind}")
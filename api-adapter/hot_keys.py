@@ -0,0 +1,114 @@
+"""
+Hot-key tracking for proactive search cache refresh.
+
+A count-min sketch estimates how often each normalized query is requested in
+fixed memory, however many distinct queries arrive. Alongside it, a small
+candidate table keeps the queries with the highest estimates, so the top-N
+can be read without scanning the sketch. Counts are halved every half-life,
+so the top-N follows current traffic rather than all-time totals.
+"""
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+class CountMinSketch:
+    """Approximate per-key counts in `depth` x `width` counters.
+
+    Estimates never undercount; with conservative update they overcount by at
+    most a small fraction of the total for all but a 1 / 2**depth share of
+    keys.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("L", [0]) * width for _ in range(depth)]
+
+    def _indexes(self, key: str) -> List[int]:
+        # Double hashing off the built-in string hash: counts only live in this
+        # process, so per-process hash randomization does not matter
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + n * h2) % self.width for n in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Count `key` and return its new estimate."""
+        cells = list(zip(self.rows, self._indexes(key)))
+        estimate = min([row[i] for row, i in cells]) + count
+        # Conservative update: only raise counters that are below the new estimate
+        for row, i in cells:
+            if row[i] < estimate:
+                row[i] = estimate
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min([row[i] for row, i in zip(self.rows, self._indexes(key))])
+
+    def halve(self) -> None:
+        for n, row in enumerate(self.rows):
+            self.rows[n] = array("L", (count >> 1 for count in row))
+
+
+class HotKeyTracker:
+    """The most frequently requested keys, by count-min sketch estimate.
+
+    Args:
+        capacity: Candidate keys tracked; keep a few times the top-N you read
+        half_life: Seconds between halving every count (0 disables decay)
+    """
+
+    def __init__(self, capacity: int = 128, half_life: float = 600, width: int = 2048, depth: int = 4):
+        self.capacity = capacity
+        self.half_life = half_life
+        self.sketch = CountMinSketch(width, depth)
+        self._candidates: Dict[str, int] = {}
+        # Latest original spelling of each candidate, used when re-fetching it
+        self._queries: Dict[str, str] = {}
+        self._floor = 0
+        self._decayed_at = time.time()
+        self.recorded = 0
+
+    def record(self, key: str, query: Optional[str] = None) -> int:
+        """Count one request for `key` and return its estimated frequency."""
+        now = time.time()
+        if self.half_life and now - self._decayed_at >= self.half_life:
+            self._decay(now)
+        self.recorded += 1
+        estimate = self.sketch.add(key)
+        if key not in self._candidates and len(self._candidates) >= self.capacity:
+            if estimate <= self._floor:
+                return estimate
+            # Displace the coldest candidate. The floor (lowest candidate count) only
+            # moves here, so keys below it are rejected without scanning
+            coldest = min(self._candidates, key=self._candidates.get)
+            if estimate <= self._candidates[coldest]:
+                self._floor = self._candidates[coldest]
+                return estimate
+            del self._candidates[coldest]
+            del self._queries[coldest]
+            self._candidates[key] = estimate
+            self._floor = min(self._candidates.values())
+        else:
+            self._candidates[key] = estimate
+        self._queries[key] = query or key
+        return estimate
+
+    def _decay(self, now: float) -> None:
+        self.sketch.halve()
+        self._candidates = {key: count >> 1 for key, count in self._candidates.items() if count > 1}
+        self._queries = {key: self._queries[key] for key in self._candidates}
+        self._floor = min(self._candidates.values(), default=0)
+        self._decayed_at = now
+
+    def top(self, n: int, min_count: int = 1) -> List[Tuple[str, str, int]]:
+        """The `n` hottest keys seen at least `min_count` times, as (key, query, estimate)."""
+        ranked = sorted(self._candidates.items(), key=lambda item: item[1], reverse=True)
+        return [(key, self._queries[key], count) for key, count in ranked[:n] if count >= min_count]
+
+    def status(self, n: int = 5) -> Dict[str, object]:
+        return {
+            "recorded": self.recorded,
+            "tracked": len(self._candidates),
+            "top": [{"query": key, "estimate": count} for key, _, count in self.top(n)],
+        }
@@ -10,7 +10,6 @@ Run with: python mcp_server.py
 
 import json
 import logging
-from typing import Any
 import sys
 import os
 from datetime import datetime
@@ -18,6 +17,9 @@ from datetime import datetime
 # Add parent directory to path for relative imports
 sys.path.insert(0, os.path.dirname(__file__))
 
+from normalize import MCP_ORDER_SPEC, MCP_PRODUCT_SPEC
+from amazon_clients import get_client_registry
+
 try:
     import anthropic
 except ImportError:
@@ -30,6 +32,7 @@ try:
     from amazon_mcp.client import AmazonClient
     HAS_AMAZON_MCP = True
 except ImportError:
+    AmazonClient = None
     try:
         import amazon_mcp
         HAS_AMAZON_MCP = True
@@ -44,20 +47,30 @@ class AuraAmazonMCPServer:
     """MCP server for Amazon product search and order history in Aura."""
 
     def __init__(self):
-        self.client = None
+        # Shared with every other server instance in the process (see amazon_clients.py)
+        self.clients = get_client_registry().register("mcp", self._new_client)
         self.initialize_client()
 
+    @staticmethod
+    def _new_client() -> "AmazonClient":
+        if AmazonClient is None:
+            raise ImportError("amazon_mcp.client.AmazonClient is not available")
+        return AmazonClient()
+
+    @property
+    def client(self):
+        """The shared Amazon MCP client, or None while it cannot be built."""
+        return self.clients.get() if HAS_AMAZON_MCP else None
+
     def initialize_client(self):
-        """Initialize the Amazon MCP client."""
+        """Initialize the Amazon MCP client (once per process; later servers reuse it)."""
         if not HAS_AMAZON_MCP:
             logger.error("amazon-mcp not installed. Install with: pip install amazon-mcp")
             return
 
-        try:
-            self.client = AmazonClient()
+        if self.client is not None:
             logger.info("Amazon MCP client initialized successfully")
-        except Exception as e:
-            logger.warning(f"Failed to initialize Amazon client: {e}")
+        else:
             logger.info("Some features may be unavailable without valid Amazon credentials")
 
     def search_products(self, query: str, category: str = None, limit: int = 10) -> dict:
@@ -81,7 +94,8 @@ class AuraAmazonMCPServer:
             if category:
                 params["category"] = category
 
-            results = self.client.search(**params)
+            # A 401/403 rebuilds the client and retries once
+            results = self.clients.call(lambda client: client.search(**params))
 
             # Normalize results
             if isinstance(results, dict):
@@ -98,7 +112,7 @@ class AuraAmazonMCPServer:
                 "query": query,
                 "category": category,
                 "total": total,
-                "results": [self._normalize_product(item) for item in items],
+                "results": MCP_PRODUCT_SPEC.normalize(items),
             }
         except Exception as e:
             logger.error(f"Search failed: {e}")
@@ -120,7 +134,7 @@ class AuraAmazonMCPServer:
 
         try:
             logger.info(f"Fetching Amazon orders (limit {limit})")
-            orders = self.client.get_orders(limit=limit)
+            orders = self.clients.call(lambda client: client.get_orders(limit=limit))
 
             if not orders:
                 return {"total": 0, "orders": []}
@@ -138,67 +152,12 @@ class AuraAmazonMCPServer:
 
             return {
                 "total": total,
-                "orders": [self._normalize_order(order) for order in items],
+                "orders": MCP_ORDER_SPEC.normalize(items),
             }
         except Exception as e:
             logger.error(f"Order fetch failed: {e}")
             return {"error": str(e), "orders": []}
 
-    def _normalize_product(self, item: Any) -> dict:
-        """Normalize product item to standard format."""
-        if isinstance(item, dict):
-            raw = item
-        else:
-            raw = getattr(item, "__dict__", {})
-
-        return {
-            "id": raw.get("id") or raw.get("asin"),
-            "asin": raw.get("asin"),
-            "title": raw.get("title") or raw.get("name"),
-            "price": self._parse_price(raw.get("price")),
-            "category": raw.get("category"),
-            "rating": raw.get("rating"),
-            "reviews": raw.get("reviews"),
-            "url": raw.get("url") or raw.get("product_url"),
-            "image": raw.get("image") or raw.get("image_url"),
-            "prime": raw.get("prime", False),
-        }
-
-    def _normalize_order(self, order: Any) -> dict:
-        """Normalize order item to standard format."""
-        if isinstance(order, dict):
-            raw = order
-        else:
-            raw = getattr(order, "__dict__", {})
-
-        return {
-            "order_id": raw.get("order_id") or raw.get("id"),
-            "order_date": raw.get("order_date") or raw.get("date"),
-            "asin": raw.get("asin") or raw.get("product_id"),
-            "title": raw.get("title") or raw.get("name"),
-            "price": self._parse_price(raw.get("price")),
-            "quantity": int(raw.get("quantity", 1)),
-            "category": raw.get("category"),
-            "url": raw.get("url") or raw.get("product_url"),
-            "image": raw.get("image") or raw.get("image_url"),
-        }
-
-    @staticmethod
-    def _parse_price(price_val: Any) -> float:
-        """Parse price from various formats."""
-        if price_val is None:
-            return None
-        try:
-            if isinstance(price_val, (int, float)):
-                return float(price_val)
-            if isinstance(price_val, str):
-                # Remove currency symbols and commas
-                cleaned = price_val.replace("$", "").replace(",", "").strip()
-                return float(cleaned)
-        except (ValueError, TypeError):
-            pass
-        return None
-
 
 def run_mcp_server():
     """Run the MCP server with Claude as the LLM."""
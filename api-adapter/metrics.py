@@ -0,0 +1,259 @@
+"""
+Lightweight metrics for the adapter: stage spans, histograms, counters and
+Prometheus text exposition for GET /metrics.
+
+    with span("search.normalize"):
+        ...
+
+    @timed("scrape.login")
+    async def login(...): ...
+
+Every span is recorded in the `aura_stage_seconds{stage=...}` histogram.
+Other modules register their own histograms and counters, plus callback
+metrics that read existing stats dicts at scrape time, so hot paths do no
+extra bookkeeping for them.
+
+Set AMAZON_METRICS=false to disable. span() then returns a shared no-op
+context manager, @timed leaves functions undecorated, and observe() and
+inc() return immediately.
+"""
+import bisect
+import logging
+import math
+import os
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+logger = logging.getLogger("aura-metrics")
+
+METRICS_ENABLED = os.getenv("AMAZON_METRICS", "true").lower() not in ("0", "false", "no")
+
+# Seconds; spans range from sub-millisecond cache hits to multi-second scrapes
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+Labels = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label-value tuple."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        if not METRICS_ENABLED:
+            return
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> Iterable[str]:
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Counter:
+    """Monotonic counter, one series per label-value tuple."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        if not METRICS_ENABLED:
+            return
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class CallbackMetric:
+    """A gauge or counter whose samples are read from `collect()` at scrape time.
+
+    `collect` returns a number (for a metric without labels) or a dict of
+    label-value tuples to numbers; None values are skipped.
+    """
+
+    def __init__(self, name: str, kind: str, help: str, collect: Callable[[], Any], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.collect = collect
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> Iterable[str]:
+        samples = self.collect()
+        if not isinstance(samples, dict):
+            samples = {(): samples}
+        for labels, value in samples.items():
+            if value is not None:
+                yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+
+    def register(self, metric):
+        """Add `metric`; registering the same name again returns the existing one."""
+        return self._metrics.setdefault(metric.name, metric)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def callback(self, name: str, kind: str, help: str, collect: Callable[[], Any], labelnames: Sequence[str] = ()) -> CallbackMetric:
+        return self.register(CallbackMetric(name, kind, help, collect, labelnames))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            try:
+                samples = list(metric.render())
+            except Exception as e:
+                logger.warning(f"Failed to collect metric {metric.name}: {e}")
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "aura_stage_seconds", "Time spent per processing stage", labelnames=("stage",)
+)
+
+
+class _Span:
+    __slots__ = ("labels", "start")
+
+    def __init__(self, stage: str):
+        self.labels = (stage,)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, self.labels)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(stage: str):
+    """Context manager timing a block into aura_stage_seconds{stage=`stage`}."""
+    if not METRICS_ENABLED:
+        return _NOOP_SPAN
+    return _Span(stage)
+
+
+def timed(stage: str):
+    """Decorator timing every call of an async function as stage `stage`."""
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - start, (stage,))
+        return wrapper
+    return decorate
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template and status.
+
+    Routes are labelled by their path template ("/orders/jobs/{job_id}"),
+    so per-request ids do not create new series. For streamed responses the
+    time covers the whole stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.requests = REGISTRY.histogram(
+            "aura_http_request_seconds", "HTTP request latency by route and status", labelnames=("route", "status")
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            self.requests.observe(time.perf_counter() - start, (path, str(status)))
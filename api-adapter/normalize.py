@@ -0,0 +1,186 @@
+"""
+Batch normalization of amazon-mcp items into Aura's product/order shapes.
+
+Upstream items arrive as dicts or objects with whichever field names that
+amazon-mcp version uses ("title" vs "name", "price" vs "offer_price", ...).
+A NormalizationSpec says, per output field, which source keys to try in
+order. The first time a given set of source keys is seen, the spec is
+compiled into a plan, a generated function that reads only the keys actually
+present. The plan is then applied to every item of that shape in a batch.
+
+Used by the FastAPI adapter (validated into Product models in one
+TypeAdapter call) and by the MCP server (plain dicts).
+"""
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger("aura-normalize")
+
+# Compiled plans kept per spec; upstream only ever produces a handful of shapes
+MAX_PLANS = 64
+
+def parse_price(value: Any) -> Optional[float]:
+    """Parse a price given as a number or a string like "$1,299.99"; None if unparseable."""
+    if isinstance(value, str):
+        # Two str.replace calls beat str.translate and re.sub for strings this short
+        try:
+            return float(value.replace("$", "").replace(",", ""))
+        except ValueError:
+            return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+def as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Field(NamedTuple):
+    """One output field: source keys tried in order, plus optional parsing.
+
+    Without `parse`, the first truthy source value wins (the `a or b or c`
+    idiom). With `parse`, the first source whose parsed value is not None
+    wins. `default` (a value, or a zero-argument callable) fills the field
+    when no source matches.
+    """
+    name: str
+    sources: Tuple[str, ...]
+    parse: Optional[Callable[[Any], Any]] = None
+    default: Any = None
+
+
+class NormalizationSpec:
+    """A named set of Fields plus per-shape compiled plans."""
+
+    def __init__(self, name: str, fields: Sequence[Field], constants: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.fields = tuple(fields)
+        self.constants = dict(constants or {})
+        self._plans: Dict[Tuple[str, ...], Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+    @property
+    def plan_count(self) -> int:
+        """Distinct upstream shapes compiled so far."""
+        return len(self._plans)
+
+    def plan_for(self, shape: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """The compiled plan for items whose keys are `shape`.
+
+        The plan is a generated function that builds the output dict in one
+        expression, reading only the source keys present in `shape`.
+        """
+        plan = self._plans.get(shape)
+        if plan is None:
+            if len(self._plans) >= MAX_PLANS:
+                self._plans.clear()
+            plan = self._compile(shape)
+            self._plans[shape] = plan
+            logger.debug(f"Compiled {self.name} plan for shape {shape}")
+        return plan
+
+    def _compile(self, shape: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        present = set(shape)
+        namespace: Dict[str, Any] = {}
+        entries = []
+        for name, value in self.constants.items():
+            namespace[f"_c_{len(namespace)}"] = value
+            entries.append(f"{name!r}: _c_{len(namespace) - 1}")
+        for n, field in enumerate(self.fields):
+            keys = [key for key in field.sources if key in present]
+            default = f"_d{n}"
+            namespace[default] = field.default
+            if callable(field.default):
+                default += "()"
+            if field.parse is None:
+                expr = " or ".join([f"raw[{key!r}]" for key in keys] + [default])
+            else:
+                namespace[f"_p{n}"] = field.parse
+                expr = default
+                for key in reversed(keys):
+                    expr = f"(_v{n} if (_v{n} := _p{n}(raw[{key!r}])) is not None else {expr})"
+            entries.append(f"{field.name!r}: {expr}")
+        source = "def plan(raw):\n    return {" + ", ".join(entries) + "}\n"
+        exec(compile(source, f"<{self.name} plan>", "exec"), namespace)
+        return namespace["plan"]
+
+    def normalize(self, items: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Map a batch of upstream items (dicts or objects) to output dicts."""
+        rows = []
+        last_shape = None
+        plan = None
+        for item in items:
+            raw = as_raw_dict(item)
+            shape = tuple(raw)
+            if shape != last_shape:
+                plan = self.plan_for(shape)
+                last_shape = shape
+            rows.append(plan(raw))
+        return rows
+
+
+def as_raw_dict(item: Any) -> Dict[str, Any]:
+    """An upstream item as a dict: dicts as-is, objects via __dict__ or dict()."""
+    if isinstance(item, dict):
+        return item
+    try:
+        return getattr(item, "__dict__", None) or dict(item)
+    except Exception:
+        return {}
+
+
+# Aura Product fields (adapter.Product) from amazon-mcp search results
+PRODUCT_SPEC = NormalizationSpec(
+    "product",
+    [
+        Field("id", ("id", "asin", "product_id", "url"), default=lambda: str(time.time())),
+        Field("asin", ("asin", "id")),
+        Field("name", ("title", "name", "product_name"), default="Unknown Product"),
+        Field("category", ("category", "department")),
+        Field("price", ("price", "price_value", "price_amount", "offer_price", "current_price"), parse=parse_price),
+        Field("description", ("description", "snippet", "desc")),
+        Field("url", ("url", "product_url")),
+        Field("image", ("image", "image_url", "thumbnail")),
+        Field("rating", ("rating", "score")),
+        Field("reviews", ("reviews", "review_count")),
+        Field("prime", ("prime", "is_prime"), default=False),
+    ],
+    constants={"retailer": "amazon"},
+)
+
+# MCP tool output for search results
+MCP_PRODUCT_SPEC = NormalizationSpec(
+    "mcp_product",
+    [
+        Field("id", ("id", "asin")),
+        Field("asin", ("asin",)),
+        Field("title", ("title", "name")),
+        Field("price", ("price",), parse=parse_price),
+        Field("category", ("category",)),
+        Field("rating", ("rating",)),
+        Field("reviews", ("reviews",)),
+        Field("url", ("url", "product_url")),
+        Field("image", ("image", "image_url")),
+        Field("prime", ("prime",), default=False),
+    ],
+)
+
+# MCP tool output for order history
+MCP_ORDER_SPEC = NormalizationSpec(
+    "mcp_order",
+    [
+        Field("order_id", ("order_id", "id")),
+        Field("order_date", ("order_date", "date")),
+        Field("asin", ("asin", "product_id")),
+        Field("title", ("title", "name")),
+        Field("price", ("price",), parse=parse_price),
+        Field("quantity", ("quantity",), parse=as_int, default=1),
+        Field("category", ("category",)),
+        Field("url", ("url", "product_url")),
+        Field("image", ("image", "image_url")),
+    ],
+)
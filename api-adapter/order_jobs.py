@@ -0,0 +1,166 @@
+"""
+Background order-sync jobs.
+
+Scrapes run as queued jobs instead of inside HTTP requests. Each account gets
+a single worker, so scrapes against that account's browser profile run one
+at a time, and every job keeps a log of progress events that clients can
+follow while it runs.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger("aura-order-jobs")
+
+# Finished jobs kept around for GET /orders/jobs/{id}
+MAX_FINISHED_JOBS = 100
+
+
+class OrderSyncJob:
+    """One queued order scrape and its progress log."""
+
+    def __init__(self, account: str, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.account = account
+        self.params = params
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.events: list = []
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Append a progress event and wake everyone following the job."""
+        self.events.append({"job_id": self.id, "time": time.time(), **event})
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def set_status(self, status: str, **details: Any) -> None:
+        self.status = status
+        if status == "running":
+            self.started_at = time.time()
+        elif self.finished:
+            self.finished_at = time.time()
+        self.publish({"type": "status", "status": status, **details})
+
+    async def follow(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every event so far, then new ones as they happen, until the job finishes."""
+        sent = 0
+        while True:
+            changed = self._changed
+            while sent < len(self.events):
+                yield self.events[sent]
+                sent += 1
+            if self.finished:
+                return
+            await changed.wait()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+            "events": len(self.events),
+        }
+
+
+class OrderJobQueue:
+    """Per-account FIFO of order-sync jobs, each drained by a single worker task.
+
+    `run_job` does the actual work for a job and returns its result summary;
+    it may call `job.publish` to report progress.
+    """
+
+    def __init__(self, run_job: Callable[[OrderSyncJob], Awaitable[Optional[Dict[str, Any]]]]):
+        self.run_job = run_job
+        self._jobs: "OrderedDict[str, OrderSyncJob]" = OrderedDict()
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._active: Dict[str, OrderSyncJob] = {}
+
+    def get(self, job_id: str) -> Optional[OrderSyncJob]:
+        return self._jobs.get(job_id)
+
+    def queue_depth(self, account: Optional[str] = None) -> int:
+        """Jobs waiting to start, for one account or all of them."""
+        if account is not None:
+            queue = self._queues.get(account)
+            return queue.qsize() if queue else 0
+        return sum(queue.qsize() for queue in self._queues.values())
+
+    def pending_job(self, account: str, params: Dict[str, Any]) -> Optional[OrderSyncJob]:
+        """A queued or running job for `account` with the same parameters, if any."""
+        active = self._active.get(account)
+        if active is not None and active.params == params:
+            return active
+        for job in reversed(self._jobs.values()):
+            if job.account == account and job.status == "queued" and job.params == params:
+                return job
+        return None
+
+    def enqueue(self, account: str, params: Dict[str, Any]) -> OrderSyncJob:
+        """Queue a sync for `account`, or return an identical one already pending."""
+        job = self.pending_job(account, params)
+        if job is not None:
+            return job
+
+        job = OrderSyncJob(account, params)
+        self._jobs[job.id] = job
+        self._prune()
+        if account not in self._queues:
+            self._queues[account] = asyncio.Queue()
+        self._queues[account].put_nowait(job)
+        worker = self._workers.get(account)
+        if worker is None or worker.done():
+            self._workers[account] = asyncio.ensure_future(self._worker(account))
+        job.set_status("queued", position=self._queues[account].qsize())
+        return job
+
+    async def _worker(self, account: str) -> None:
+        queue = self._queues[account]
+        while True:
+            job = await queue.get()
+            self._active[account] = job
+            try:
+                job.set_status("running")
+                job.result = await self.run_job(job)
+                job.set_status("succeeded", result=job.result)
+            except asyncio.CancelledError:
+                job.error = "cancelled"
+                job.set_status("failed", error=job.error)
+                raise
+            except Exception as e:
+                logger.exception(f"Order sync job {job.id} failed: {e}")
+                job.error = str(e)
+                job.set_status("failed", error=job.error)
+            finally:
+                self._active.pop(account, None)
+                queue.task_done()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    async def shutdown(self) -> None:
+        """Cancel every worker; queued jobs are dropped."""
+        workers = list(self._workers.values())
+        self._workers.clear()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,220 @@
+"""
+Local SQLite store of scraped Amazon order items.
+
+Records every (order_id, asin) pair the scraper has seen per account, plus
+when each account was last synced, so /orders can be answered from the store
+with only a delta scrape of orders placed since the last sync.
+
+The database lives at ~/.aura/orders.db (override with AMAZON_ORDER_STORE).
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+ORDER_STORE_PATH = Path(os.getenv("AMAZON_ORDER_STORE", str(Path.home() / ".aura" / "orders.db")))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS order_items (
+    account     TEXT NOT NULL,
+    order_id    TEXT NOT NULL,
+    asin        TEXT NOT NULL,
+    order_date  TEXT,
+    name        TEXT NOT NULL,
+    category    TEXT,
+    price       REAL,
+    quantity    INTEGER NOT NULL DEFAULT 1,
+    image_url   TEXT,
+    url         TEXT,
+    first_seen  REAL NOT NULL,
+    PRIMARY KEY (account, order_id, asin)
+);
+CREATE INDEX IF NOT EXISTS order_items_by_date ON order_items (account, order_date DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account            TEXT PRIMARY KEY,
+    newest_order_date  TEXT,
+    last_sync          REAL NOT NULL
+);
+"""
+
+# What the last completed sync walked (see OrderStore.mark_synced); added to
+# stores created before coverage was recorded
+COVERAGE_COLUMNS = {
+    "pages": "INTEGER",
+    "years": "INTEGER",
+    "covered_items": "INTEGER",
+    "covered_since": "TEXT",
+    "complete": "INTEGER NOT NULL DEFAULT 0",
+}
+
+ITEM_COLUMNS = ("order_id", "asin", "order_date", "name", "category", "price", "quantity", "image_url", "url")
+
+
+def _iso(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value or None
+
+
+class OrderStore:
+    """SQLite-backed high-water-mark store of order items, keyed per account.
+
+    Methods are synchronous and cheap (indexed lookups, one transaction per
+    write); a lock serializes access to the shared connection.
+    """
+
+    def __init__(self, path: Path = ORDER_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(sync_state)")}
+            for column, decl in COVERAGE_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE sync_state ADD COLUMN {column} {decl}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def known_order_ids(self, account: str) -> Set[str]:
+        """Every order id already stored for `account`."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT order_id FROM order_items WHERE account = ?", (account,)
+            ).fetchall()
+        return {row["order_id"] for row in rows}
+
+    def upsert_items(self, account: str, items: Iterable[Dict[str, Any]]) -> int:
+        """Insert or refresh order items; returns the number of rows written."""
+        now = time.time()
+        rows = [
+            (account, *(_iso(item.get(col)) if col == "order_date" else item.get(col) for col in ITEM_COLUMNS), now)
+            for item in items
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"""
+                INSERT INTO order_items (account, {", ".join(ITEM_COLUMNS)}, first_seen)
+                VALUES (?, {", ".join("?" for _ in ITEM_COLUMNS)}, ?)
+                ON CONFLICT (account, order_id, asin) DO UPDATE SET
+                    order_date = COALESCE(excluded.order_date, order_items.order_date),
+                    name = excluded.name,
+                    price = COALESCE(excluded.price, order_items.price),
+                    image_url = COALESCE(excluded.image_url, order_items.image_url),
+                    url = COALESCE(excluded.url, order_items.url)
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def mark_synced(self, account: str, coverage: Optional[Dict[str, Any]] = None) -> None:
+        """Record a completed sync, the newest order date now stored, and what the sync covered.
+
+        Args:
+            account: Account that was synced
+            coverage: {"pages", "years", "covered_items", "covered_since",
+                "complete"}: pages walked, calendar years walked (None for
+                Amazon's default listing), how many of the newest items are
+                stored without gaps and the oldest order date among them, and
+                whether the walk reached the end of the history
+        """
+        coverage = coverage or {}
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO sync_state (
+                    account, newest_order_date, last_sync,
+                    pages, years, covered_items, covered_since, complete
+                )
+                VALUES (?, (SELECT MAX(order_date) FROM order_items WHERE account = ?), ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (account) DO UPDATE SET
+                    newest_order_date = excluded.newest_order_date,
+                    last_sync = excluded.last_sync,
+                    pages = excluded.pages,
+                    years = excluded.years,
+                    covered_items = excluded.covered_items,
+                    covered_since = excluded.covered_since,
+                    complete = excluded.complete
+                """,
+                (
+                    account, account, time.time(),
+                    coverage.get("pages"), coverage.get("years"), coverage.get("covered_items"),
+                    _iso(coverage.get("covered_since")), int(bool(coverage.get("complete"))),
+                ),
+            )
+
+    def sync_state(self, account: str) -> Optional[Dict[str, Any]]:
+        """{"newest_order_date", "last_sync", coverage fields} for `account`, or None if never synced."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT newest_order_date, last_sync, {', '.join(COVERAGE_COLUMNS)} FROM sync_state WHERE account = ?",
+                (account,),
+            ).fetchone()
+        if not row:
+            return None
+        state = dict(row)
+        state["covered_since"] = datetime.fromisoformat(state["covered_since"]) if state["covered_since"] else None
+        state["complete"] = bool(state["complete"])
+        return state
+
+    def count_items(self, account: str, since: Optional[datetime] = None) -> int:
+        query = "SELECT COUNT(*) FROM order_items WHERE account = ?"
+        params: list = [account]
+        if since is not None:
+            query += " AND order_date >= ?"
+            params.append(since.isoformat())
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def oldest_order_date(self, account: str) -> Optional[datetime]:
+        with self._lock:
+            value = self._conn.execute(
+                "SELECT MIN(order_date) FROM order_items WHERE account = ?", (account,)
+            ).fetchone()[0]
+        return datetime.fromisoformat(value) if value else None
+
+    def list_items(
+        self,
+        account: str,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Stored items for `account`, newest first, optionally since a date."""
+        query = f"SELECT {', '.join(ITEM_COLUMNS)} FROM order_items WHERE account = ?"
+        params: list = [account]
+        if since is not None:
+            query += " AND order_date >= ?"
+            params.append(since.isoformat())
+        query += " ORDER BY order_date IS NULL, order_date DESC, order_id, asin"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        items = []
+        for row in rows:
+            item = dict(row)
+            item["order_date"] = datetime.fromisoformat(item["order_date"]) if item["order_date"] else None
+            items.append(item)
+        return items
+
+
+_order_store: Optional[OrderStore] = None
+
+
+def get_order_store() -> OrderStore:
+    """Return the process-wide order store, opening it on first use."""
+    global _order_store
+    if _order_store is None:
+        _order_store = OrderStore()
+    return _order_store
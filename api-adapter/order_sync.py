@@ -0,0 +1,251 @@
+"""
+Bulk ingestion of order items pushed to /sync/orders.
+
+Items are written in batches with one statement per batch, never one round-trip
+per row. With DATABASE_URL pointing at Postgres (the auradb from
+docker-compose.yml) and asyncpg installed, each batch is a single multi-row
+INSERT ... SELECT FROM unnest(...) ON CONFLICT upsert over a pooled async
+connection. Otherwise a local SQLite file stands in (AURA_SYNC_DB, default
+~/.aura/orders_sync.db) with the same table and the same counting semantics.
+
+Upserts are idempotent: re-sending a batch inserts nothing and only rewrites
+rows whose fields changed, so every batch reports inserted / updated /
+unchanged counts.
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+try:
+    import asyncpg
+    HAS_ASYNCPG = True
+except ImportError:
+    asyncpg = None
+    HAS_ASYNCPG = False
+
+logger = logging.getLogger("aura-order-sync")
+
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+SYNC_SQLITE_PATH = Path(os.getenv("AURA_SYNC_DB", str(Path.home() / ".aura" / "orders_sync.db")))
+# Items written per upsert statement
+ORDER_SYNC_BATCH_SIZE = int(os.getenv("ORDER_SYNC_BATCH_SIZE", "1000"))
+ORDER_SYNC_POOL_SIZE = int(os.getenv("ORDER_SYNC_POOL_SIZE", "5"))
+
+SYNC_COLUMNS = ("order_id", "asin", "order_date", "name", "category", "price", "quantity", "image_url", "url")
+# Columns an upsert may change; a row whose values all match is left untouched
+UPDATE_COLUMNS = SYNC_COLUMNS[2:]
+
+POSTGRES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS amazon_order_items (
+    user_id     TEXT NOT NULL,
+    order_id    TEXT NOT NULL,
+    asin        TEXT NOT NULL,
+    order_date  TIMESTAMPTZ,
+    name        TEXT NOT NULL,
+    category    TEXT,
+    price       DOUBLE PRECISION,
+    quantity    INTEGER NOT NULL DEFAULT 1,
+    image_url   TEXT,
+    url         TEXT,
+    synced_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (user_id, order_id, asin)
+);
+CREATE INDEX IF NOT EXISTS amazon_order_items_by_date ON amazon_order_items (user_id, order_date DESC);
+"""
+
+POSTGRES_UPSERT = f"""
+INSERT INTO amazon_order_items AS t (user_id, {", ".join(SYNC_COLUMNS)})
+SELECT $1, * FROM unnest(
+    $2::text[], $3::text[], $4::timestamptz[], $5::text[], $6::text[],
+    $7::float8[], $8::int[], $9::text[], $10::text[]
+)
+ON CONFLICT (user_id, order_id, asin) DO UPDATE SET
+    {", ".join(f"{col} = EXCLUDED.{col}" for col in UPDATE_COLUMNS)},
+    synced_at = now()
+WHERE ({", ".join(f"t.{col}" for col in UPDATE_COLUMNS)})
+    IS DISTINCT FROM ({", ".join(f"EXCLUDED.{col}" for col in UPDATE_COLUMNS)})
+RETURNING (xmax = 0) AS inserted
+"""
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS amazon_order_items (
+    user_id     TEXT NOT NULL,
+    order_id    TEXT NOT NULL,
+    asin        TEXT NOT NULL,
+    order_date  TEXT,
+    name        TEXT NOT NULL,
+    category    TEXT,
+    price       REAL,
+    quantity    INTEGER NOT NULL DEFAULT 1,
+    image_url   TEXT,
+    url         TEXT,
+    synced_at   TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, order_id, asin)
+);
+CREATE INDEX IF NOT EXISTS amazon_order_items_by_date ON amazon_order_items (user_id, order_date DESC);
+"""
+
+SQLITE_INSERT = f"""
+INSERT INTO amazon_order_items (user_id, {", ".join(SYNC_COLUMNS)})
+VALUES (?, {", ".join("?" for _ in SYNC_COLUMNS)})
+ON CONFLICT (user_id, order_id, asin) DO NOTHING
+"""
+
+SQLITE_UPDATE = f"""
+UPDATE amazon_order_items SET
+    {", ".join(f"{col} = ?" for col in UPDATE_COLUMNS)},
+    synced_at = CURRENT_TIMESTAMP
+WHERE user_id = ? AND order_id = ? AND asin = ?
+    AND ({" OR ".join(f"{col} IS NOT ?" for col in UPDATE_COLUMNS)})
+"""
+
+
+def dedupe_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Collapse repeated (order_id, asin) keys in a batch, keeping the last one.
+
+    A single upsert statement cannot touch the same row twice.
+    """
+    return list({(item["order_id"], item["asin"]): item for item in items}.values())
+
+
+def asyncpg_dsn(url: str) -> str:
+    """Drop Prisma-only query parameters (?schema=...) that asyncpg rejects."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "schema"]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class PostgresOrderSync:
+    """Batched order upserts into Postgres over an asyncpg connection pool."""
+
+    backend = "postgres"
+
+    def __init__(self, dsn: str, pool_size: int = ORDER_SYNC_POOL_SIZE):
+        self.dsn = asyncpg_dsn(dsn)
+        self.pool_size = pool_size
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self):
+        async with self._pool_lock:
+            if self._pool is None:
+                self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.pool_size)
+                async with self._pool.acquire() as conn:
+                    await conn.execute(POSTGRES_SCHEMA)
+                logger.info(f"Connected order sync to Postgres (pool of {self.pool_size})")
+        return self._pool
+
+    async def upsert_batch(self, user_id: str, items: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert one batch in a single statement; returns its counts."""
+        items = dedupe_batch(items)
+        columns = [[item.get(col) for item in items] for col in SYNC_COLUMNS]
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            written = await conn.fetch(POSTGRES_UPSERT, user_id, *columns)
+        inserted = sum(1 for row in written if row["inserted"])
+        return {
+            "inserted": inserted,
+            "updated": len(written) - inserted,
+            "unchanged": len(items) - len(written),
+        }
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+class SqliteOrderSync:
+    """SQLite stand-in for PostgresOrderSync with the same table and counts.
+
+    Each batch is two executemany calls in one transaction, run off the event
+    loop: insert new keys, then rewrite only the existing rows that differ.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path = SYNC_SQLITE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SQLITE_SCHEMA)
+
+    def _upsert(self, user_id: str, items: List[Dict[str, Any]]) -> Dict[str, int]:
+        values = [
+            [item["order_date"].isoformat() if col == "order_date" and item.get(col) else item.get(col)
+             for col in SYNC_COLUMNS]
+            for item in items
+        ]
+        with self._lock, self._conn:
+            inserted = self._conn.executemany(SQLITE_INSERT, [(user_id, *row) for row in values]).rowcount
+            updated = self._conn.executemany(
+                SQLITE_UPDATE,
+                [(*row[2:], user_id, row[0], row[1], *row[2:]) for row in values],
+            ).rowcount
+        return {"inserted": inserted, "updated": updated, "unchanged": len(items) - inserted - updated}
+
+    async def upsert_batch(self, user_id: str, items: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert one batch in a single transaction; returns its counts."""
+        items = dedupe_batch(items)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._upsert, user_id, items)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_order_sync = None
+
+
+def get_order_sync():
+    """Return the process-wide sync target: Postgres when configured, else SQLite."""
+    global _order_sync
+    if _order_sync is None:
+        if DATABASE_URL.startswith(("postgres://", "postgresql://")):
+            if HAS_ASYNCPG:
+                _order_sync = PostgresOrderSync(DATABASE_URL)
+            else:
+                logger.warning("DATABASE_URL is set but asyncpg is not installed; syncing orders to SQLite")
+        if _order_sync is None:
+            _order_sync = SqliteOrderSync()
+    return _order_sync
+
+
+async def close_order_sync() -> None:
+    global _order_sync
+    if _order_sync is not None:
+        await _order_sync.close()
+        _order_sync = None
+
+
+async def sync_order_batches(
+    user_id: str,
+    items: List[Dict[str, Any]],
+    batch_size: int = ORDER_SYNC_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Upsert `items` for `user_id` in batches of `batch_size`.
+
+    Returns the totals and one {"batch", "received", "inserted", "updated",
+    "unchanged"} entry per batch.
+    """
+    target = get_order_sync()
+    batches = []
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        counts = await target.upsert_batch(user_id, batch)
+        # Keys repeated within the batch count as unchanged
+        counts["unchanged"] += len(batch) - sum(counts.values())
+        batches.append({"batch": len(batches), "received": len(batch), **counts})
+        for key in totals:
+            totals[key] += counts[key]
+    return {"backend": target.backend, "received": len(items), **totals, "batches": batches}
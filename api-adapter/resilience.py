@@ -0,0 +1,306 @@
+"""
+Guards around calls to Amazon: rate limiting, adaptive concurrency and a
+circuit breaker, combined per upstream (search vs. orders) by `Upstream`.
+
+- TokenBucket: at most `rate` calls per second with bursts up to `burst`.
+  A caller that would wait longer than `max_wait` for a token is rejected
+  instead of queueing behind the spike.
+- AdaptiveConcurrency: an AIMD limit on calls in flight. Each success
+  raises the limit by about one per window of calls. An overload signal
+  (HTTP 429/503, a non-200 amazon_search status, an error or timeout)
+  halves it, at most once per `cooldown`.
+- CircuitBreaker: after `failure_threshold` consecutive failures, calls fail
+  fast for `reset_timeout` seconds; then a single probe call decides whether
+  to close the circuit again.
+
+Callers see UpstreamUnavailable when a call is refused, and can serve
+cached data instead of waiting for a timeout. Each guard reads time from a
+`clock` (time.monotonic by default), so a fake clock can drive it in checks.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger("aura-resilience")
+
+# Status codes that mean "slow down" rather than "this request is bad"
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+
+
+class UpstreamUnavailable(Exception):
+    """A call was refused without reaching upstream ("circuit_open" or "rate_limited")."""
+
+    def __init__(self, upstream: str, reason: str, retry_after: float):
+        super().__init__(f"{upstream} upstream unavailable ({reason}), retry in {retry_after:.1f}s")
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Token-bucket rate limiter; `rate` <= 0 disables it."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        if self.rate <= 0:
+            return float("inf")
+        self._refill(self.clock())
+        return self._tokens
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take a token, returning how long to wait before using it; None if that exceeds `max_wait`.
+
+        Tokens are reserved up front (the balance may go negative), so
+        concurrent callers queue in arrival order without polling.
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._refill(self.clock())
+        wait = max(0.0, (1 - self._tokens) / self.rate)
+        if max_wait is not None and wait > max_wait:
+            return None
+        self._tokens -= 1
+        return wait
+
+    async def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """Wait for a token; False (without taking one) if it would take longer than `max_wait`."""
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit with a FIFO queue of waiting callers."""
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.clock = clock
+        self.inflight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._decreased_at = float("-inf")
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as we were cancelled: hand it on
+                self.release(None)
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, succeeded: Optional[bool]) -> None:
+        """Free a slot. True grows the limit, False (overload) shrinks it, None leaves it."""
+        self.inflight -= 1
+        if succeeded:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        elif succeeded is False:
+            now = self.clock()
+            # One decrease per cooldown: a burst of failures from calls that
+            # started together is one overload signal, not many
+            if now - self._decreased_at >= self.cooldown:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self._decreased_at = now
+                logger.info(f"Upstream overloaded, concurrency limit now {int(self.limit)}")
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker: closed -> open -> half_open -> closed."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opened_count = 0
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be refused (open and not yet due for a probe)."""
+        if self.state == "open":
+            return self.clock() - self.opened_at < self.reset_timeout
+        return self.state == "half_open" and self._probing
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - self.clock())
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now; in half_open, only one probe at a time."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if self.clock() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record(self, succeeded: Optional[bool]) -> None:
+        """Outcome of an allowed call; None (e.g. cancelled) just frees the probe slot."""
+        self._probing = False
+        if succeeded:
+            if self.state != "closed":
+                logger.info("Circuit closed")
+            self.state = "closed"
+            self.failures = 0
+        elif succeeded is False:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opened_count += 1
+                    logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+                self.state = "open"
+                self.opened_at = self.clock()
+
+
+class Upstream:
+    """Rate limit, adaptive concurrency and circuit breaker for one upstream.
+
+    Args:
+        name: Label for logs, errors and /health
+        rate: Calls per second (<= 0 for no rate limit)
+        burst: Calls allowed back to back before `rate` applies
+        concurrency: Initial concurrent-call limit
+        max_concurrency: Ceiling the adaptive limit may grow to
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open before a probe
+        max_wait: Longest a call waits for a rate-limit token before being refused
+        clock: Time source for all three guards (default: time.monotonic)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        concurrency: int,
+        max_concurrency: Optional[int] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_wait: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.concurrency = AdaptiveConcurrency(concurrency, max_limit=max_concurrency, clock=clock)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock)
+        self.max_wait = max_wait
+        self.stats = {"calls": 0, "failures": 0, "overloads": 0, "rejected": 0, "rate_limited": 0}
+
+    @property
+    def available(self) -> bool:
+        return not self.breaker.is_open
+
+    def _refuse(self, reason: str, retry_after: float) -> UpstreamUnavailable:
+        self.stats["rejected" if reason == "circuit_open" else "rate_limited"] += 1
+        return UpstreamUnavailable(self.name, reason, retry_after)
+
+    async def throttle(self) -> None:
+        """Take a rate-limit token for one request made outside call() (e.g. a page load)."""
+        if not await self.bucket.acquire(self.max_wait):
+            raise self._refuse("rate_limited", 1 / self.bucket.rate)
+
+    async def call(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        overloaded: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Await `fn(*args)` under this upstream's guards.
+
+        `overloaded(result)` marks a returned result as an overload signal
+        (for APIs that report throttling in their return value); raised
+        exceptions always count as failures.
+
+        Raises:
+            UpstreamUnavailable: The circuit is open or no token came within max_wait
+        """
+        if not self.breaker.allow():
+            raise self._refuse("circuit_open", self.breaker.retry_after())
+        succeeded: Optional[bool] = None
+        try:
+            # Take the token first: max_wait then bounds the whole wait, and
+            # callers beyond what the rate can serve in time are refused at once
+            await self.throttle()
+            await self.concurrency.acquire()
+            try:
+                self.stats["calls"] += 1
+                result = await fn(*args)
+                succeeded = not (overloaded and overloaded(result))
+                if not succeeded:
+                    self.stats["overloads"] += 1
+                return result
+            except Exception:
+                self.stats["failures"] += 1
+                succeeded = False
+                raise
+            finally:
+                self.concurrency.release(succeeded)
+        finally:
+            self.breaker.record(succeeded)
+
+    def status(self) -> Dict[str, Any]:
+        tokens = self.bucket.tokens
+        return {
+            "circuit": "open" if self.breaker.is_open else self.breaker.state,
+            "retry_after": round(self.breaker.retry_after(), 1) if self.breaker.state == "open" else 0,
+            "consecutive_failures": self.breaker.failures,
+            "concurrency_limit": int(self.concurrency.limit),
+            "inflight": self.concurrency.inflight,
+            "queued": self.concurrency.queued,
+            "tokens": None if tokens == float("inf") else round(tokens, 2),
+            **self.stats,
+        }
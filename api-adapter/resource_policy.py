@@ -0,0 +1,142 @@
+"""
+Block resources the scraper never reads.
+
+A ResourcePolicy is installed as a route on the scraper's browser context and
+aborts requests by resource type and host, with separate rules per page type:
+
+- orders: order-history pages. Only the HTML is read (image URLs come from
+  `img.src`, not the downloaded image), so images, media and fonts are
+  blocked.
+- signin: the sign-in flow. Images stay allowed so a captcha can be solved
+  in a visible browser. Hosts outside Amazon's own domains are allowed too,
+  since captcha and auth assets come from e.g. opfcaptcha-prod.s3.amazonaws.com.
+- other: any other page. It gets the same rules as orders.
+
+On every page, requests to ad and telemetry hosts are blocked. Outside the
+sign-in flow, so are scripts, XHR and other subresources from hosts outside
+Amazon's own domains.
+Allowed requests fall back to the routes installed before the policy, such as
+a ScrapeArchive or the benchmark's fake Amazon.
+"""
+import logging
+import os
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from metrics import REGISTRY
+
+logger = logging.getLogger("aura-resource-policy")
+
+# Set AMAZON_BLOCK_RESOURCES=false to load every resource (e.g. to debug a page)
+RESOURCE_BLOCKING_ENABLED = os.getenv("AMAZON_BLOCK_RESOURCES", "true").lower() not in ("0", "false", "no")
+
+# Hosts serving Amazon's own pages, scripts, styles and images
+FIRST_PARTY_HOST_SUFFIXES = ("amazon.com", "media-amazon.com", "ssl-images-amazon.com")
+# First-party hosts that only serve ads and telemetry
+BLOCKED_HOST_SUFFIXES = ("amazon-adsystem.com", "fls-na.amazon.com", "unagi.amazon.com", "unagi-na.amazon.com")
+
+# Resource types blocked per page type unless AMAZON_BLOCKED_RESOURCES_<PAGE_TYPE>
+# overrides them (comma-separated Playwright resource types, empty for none)
+DEFAULT_BLOCKED_TYPES = {
+    "orders": "image,media,font",
+    "signin": "media,font",
+    "other": "image,media,font",
+}
+
+# Page types whose subresources must come from FIRST_PARTY_HOST_SUFFIXES
+THIRD_PARTY_BLOCKED_PAGE_TYPES = frozenset({"orders", "other"})
+
+BLOCKED_REQUESTS = REGISTRY.counter(
+    "aura_browser_blocked_requests_total",
+    "Browser requests aborted by the resource policy",
+    labelnames=("page_type", "reason"),
+)
+
+
+def page_type(url: str) -> str:
+    """Classify a page URL as "orders", "signin" or "other"."""
+    path = urlparse(url).path
+    if path.startswith("/ap/"):
+        return "signin"
+    if path.startswith(("/gp/your-account/order-history", "/your-orders/", "/gp/css/order-history")):
+        return "orders"
+    return "other"
+
+
+def host_matches(host: str, suffixes: Iterable[str]) -> bool:
+    """Whether `host` is one of `suffixes` or a subdomain of one (not merely ending in it)."""
+    return any(host == suffix or host.endswith("." + suffix) for suffix in suffixes)
+
+
+class ResourcePolicy:
+    """Aborts non-essential requests in a Playwright browser context.
+
+    Args:
+        blocked_types: Page type -> resource types to abort on such pages
+            (default: DEFAULT_BLOCKED_TYPES, overridable from the environment)
+        block_third_party: Abort subresources from hosts outside
+            FIRST_PARTY_HOST_SUFFIXES on THIRD_PARTY_BLOCKED_PAGE_TYPES pages
+    """
+
+    def __init__(self, blocked_types: Optional[Dict[str, Iterable[str]]] = None, block_third_party: bool = True):
+        if blocked_types is None:
+            blocked_types = {
+                kind: os.getenv(f"AMAZON_BLOCKED_RESOURCES_{kind.upper()}", default).split(",")
+                for kind, default in DEFAULT_BLOCKED_TYPES.items()
+            }
+        self.blocked_types = {
+            kind: frozenset(t.strip() for t in types if t.strip()) for kind, types in blocked_types.items()
+        }
+        self.block_third_party = block_third_party
+        self.stats = {"allowed": 0, "blocked": 0}
+
+    def block_reason(self, url: str, resource_type: str, page_url: str) -> Optional[str]:
+        """Why a request for `url` from the page at `page_url` should be aborted, or None to allow it."""
+        host = urlparse(url).hostname or ""
+        if host_matches(host, BLOCKED_HOST_SUFFIXES):
+            return "ads"
+        if resource_type == "document":
+            return None
+        kind = page_type(page_url)
+        if resource_type in self.blocked_types.get(kind, ()):
+            return resource_type
+        if (
+            self.block_third_party
+            and kind in THIRD_PARTY_BLOCKED_PAGE_TYPES
+            and not host_matches(host, FIRST_PARTY_HOST_SUFFIXES)
+        ):
+            return "third_party"
+        return None
+
+    async def install(self, context) -> None:
+        """Route every request in a Playwright browser context through this policy.
+
+        Install it after any other routes: Playwright runs the most recently
+        added route first, and allowed requests fall back to the earlier ones.
+        """
+        await context.route("**/*", self._route)
+
+    async def _route(self, route) -> None:
+        request = route.request
+        try:
+            # Subresources follow the rules of the page that loads them
+            page_url = request.url if request.is_navigation_request() else request.frame.url
+        except Exception:
+            # Service worker requests have no frame
+            page_url = request.url
+        reason = self.block_reason(request.url, request.resource_type, page_url)
+        if reason is None:
+            self.stats["allowed"] += 1
+            await route.fallback()
+            return
+        self.stats["blocked"] += 1
+        BLOCKED_REQUESTS.inc((page_type(page_url), reason))
+        logger.debug(f"Blocked {request.resource_type} {request.url} ({reason})")
+        await route.abort("blockedbyclient")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "blocked_types": {kind: sorted(types) for kind, types in self.blocked_types.items()},
+            "block_third_party": self.block_third_party,
+            **self.stats,
+        }
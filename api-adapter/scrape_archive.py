@@ -0,0 +1,238 @@
+"""
+Record Amazon page loads once, replay them offline.
+
+A ScrapeArchive is installed as a route on the scraper's browser context:
+
+- record: GET documents and XHR/fetch calls to amazon.com are fetched
+  normally and saved, and everything else falls back to the routes
+  installed before the archive (or the network). The archive is
+  written as a HAR 1.2 file (response bodies embedded, Set-Cookie dropped);
+  recording into an existing file adds to it.
+- replay: every request is answered from the archive, and anything not in
+  it is aborted, so a scrape runs with no network access. A LatencyProfile
+  can add per-response delays to simulate a real connection.
+
+Replay reads any HAR with embedded bodies, including ones saved by
+Playwright (`record_har_content="embed"`) or browser devtools.
+
+Archives hold personal order history; keep them out of version control.
+"""
+import asyncio
+import base64
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag, urlparse
+
+from resource_policy import host_matches
+
+logger = logging.getLogger("aura-scrape-archive")
+
+# Resource types worth recording; images, fonts, styles and scripts are not read by the scraper
+RECORDED_RESOURCE_TYPES = frozenset({"document", "xhr", "fetch"})
+# Hosts recorded, with their subdomains (matched as in resource_policy)
+RECORDED_HOST_SUFFIXES = ("amazon.com",)
+# Response headers that are not replayed: session cookies, and framing that no
+# longer matches the stored (decoded) body
+DROPPED_HEADERS = frozenset({"set-cookie", "content-length", "content-encoding", "transfer-encoding"})
+
+
+def _entry_key(method: str, url: str) -> Tuple[str, str]:
+    return method.upper(), urldefrag(url)[0]
+
+
+class LatencyProfile:
+    """Delay added to every replayed response.
+
+    Args:
+        base: Seconds added to each response
+        jitter: Up to this many further seconds, uniformly random (seeded)
+        recorded: Multiple of each entry's recorded time to add (1.0 = as recorded)
+        seed: Random seed, so jittered runs are repeatable
+    """
+
+    def __init__(self, base: float = 0.0, jitter: float = 0.0, recorded: float = 0.0, seed: int = 0):
+        self.base = base
+        self.jitter = jitter
+        self.recorded = recorded
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> "LatencyProfile":
+        """Build a profile from "key=value" pairs, e.g. "recorded=1" or "base=0.2,jitter=0.1"."""
+        options: Dict[str, float] = {}
+        for part in (spec or "").split(","):
+            if not part.strip():
+                continue
+            key, _, value = part.partition("=")
+            key = key.strip()
+            if key not in ("base", "jitter", "recorded", "seed"):
+                raise ValueError(f"Unknown latency profile option: {key!r}")
+            options[key] = float(value)
+        if "seed" in options:
+            options["seed"] = int(options["seed"])
+        return cls(**options)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.base or self.jitter or self.recorded)
+
+    def delay(self, entry: Dict[str, Any]) -> float:
+        delay = self.base + self.recorded * max(0.0, entry.get("time", 0.0)) / 1000
+        if self.jitter:
+            delay += self._rng.uniform(0, self.jitter)
+        return delay
+
+
+class ScrapeArchive:
+    """Page loads recorded to, or replayed from, a HAR file.
+
+    Args:
+        path: HAR file to write (record) or read (replay)
+        mode: "record" or "replay"
+        latency: Delays for replayed responses (default: none, full speed)
+    """
+
+    def __init__(self, path: Path, mode: str, latency: Optional[LatencyProfile] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown archive mode: {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency or LatencyProfile()
+        self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "missed": 0, "passed_through": 0}
+        self._unsaved = False
+        # Recording into an existing archive adds to it (and replaces re-recorded pages)
+        if mode == "replay" or self.path.exists():
+            self.load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            har = json.load(f)
+        for entry in har["log"]["entries"]:
+            request = entry["request"]
+            # Later entries win, so a re-recorded page replaces the older copy
+            self.entries[_entry_key(request["method"], request["url"])] = entry
+        logger.info(f"Loaded {len(self.entries)} recorded responses from {self.path}")
+
+    def save(self) -> None:
+        """Write the archive (atomically) if anything was recorded since the last save."""
+        if not self._unsaved:
+            return
+        har = {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "aura-amazon-scraper", "version": "1.0"},
+                "entries": list(self.entries.values()),
+            }
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(har, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = False
+        logger.info(f"Saved {len(self.entries)} recorded responses to {self.path}")
+
+    def add(
+        self,
+        url: str,
+        status: int,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        elapsed: float = 0.0,
+        method: str = "GET",
+    ) -> None:
+        """Store one response (`elapsed` in seconds) as a HAR entry."""
+        mime_type = next((value for name, value in headers if name.lower() == "content-type"), "")
+        try:
+            content = {"size": len(body), "mimeType": mime_type, "text": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            content = {
+                "size": len(body), "mimeType": mime_type,
+                "text": base64.b64encode(body).decode("ascii"), "encoding": "base64",
+            }
+        entry = {
+            "startedDateTime": datetime.now(timezone.utc).isoformat(),
+            "time": round(elapsed * 1000, 3),
+            "request": {
+                "method": method, "url": url, "httpVersion": "HTTP/1.1",
+                "headers": [], "queryString": [], "cookies": [], "headersSize": -1, "bodySize": 0,
+            },
+            "response": {
+                "status": status, "statusText": "", "httpVersion": "HTTP/1.1",
+                "headers": [{"name": name, "value": value} for name, value in headers if name.lower() not in DROPPED_HEADERS],
+                "cookies": [], "content": content, "redirectURL": "", "headersSize": -1, "bodySize": len(body),
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": round(elapsed * 1000, 3), "receive": 0},
+        }
+        self.entries[_entry_key(method, url)] = entry
+        self.stats["recorded"] += 1
+        self._unsaved = True
+
+    async def install(self, context) -> None:
+        """Route every request in a Playwright browser context through this archive.
+
+        Install it after any routes that unrecorded requests should fall back to.
+        """
+        await context.route("**/*", self._replay if self.replaying else self._record)
+
+    async def _record(self, route) -> None:
+        request = route.request
+        if (
+            request.method != "GET"
+            or request.resource_type not in RECORDED_RESOURCE_TYPES
+            or not host_matches(urlparse(request.url).hostname or "", RECORDED_HOST_SUFFIXES)
+        ):
+            # Let earlier routes (e.g. a fake Amazon) answer it before the network does
+            self.stats["passed_through"] += 1
+            await route.fallback()
+            return
+        started = time.perf_counter()
+        try:
+            # Keep redirects as their own entries so the browser (and page.url) follows them as usual
+            response = await route.fetch(max_redirects=0)
+        except Exception as e:
+            logger.warning(f"Could not fetch {request.url} for recording: {e}")
+            await route.abort("failed")
+            return
+        body = await response.body()
+        headers = [(header["name"], header["value"]) for header in response.headers_array]
+        self.add(request.url, response.status, headers, body, time.perf_counter() - started)
+        await route.fulfill(response=response, body=body)
+
+    async def _replay(self, route) -> None:
+        request = route.request
+        entry = self.entries.get(_entry_key(request.method, request.url))
+        if entry is None:
+            self.stats["missed"] += 1
+            logger.debug(f"Not in archive, aborting: {request.method} {request.url}")
+            await route.abort("internetdisconnected")
+            return
+        if self.latency.enabled:
+            await asyncio.sleep(self.latency.delay(entry))
+        response = entry["response"]
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = {
+            header["name"]: header["value"]
+            for header in response.get("headers", [])
+            # HTTP/2 pseudo-headers (":status") appear in browser-saved HARs
+            if header["name"].lower() not in DROPPED_HEADERS and not header["name"].startswith(":")
+        }
+        self.stats["replayed"] += 1
+        await route.fulfill(status=response["status"], headers=headers, body=body)
+
+    def status(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "path": str(self.path), "entries": len(self.entries), **self.stats}
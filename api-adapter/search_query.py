@@ -0,0 +1,64 @@
+"""
+Canonical form of search queries, used for search cache keys and
+single-flight dedup.
+
+"Pink Corset", "pink corset " and "ｐｉｎｋ  corset" are the same search and
+should share one cache entry and one upstream call. canonical_query() applies:
+
+- Unicode NFKC (full-width letters, ligatures, non-breaking spaces)
+- removal of invisible format characters (zero-width spaces, joiners)
+- case folding
+- whitespace collapse
+
+and optionally:
+
+- stop-word folding: drop words like "a", "the", "for", "with"
+  ("dress for the beach" -> "dress beach")
+- plural folding: strip common English plural endings
+  ("dresses" -> "dress", "hoodies" -> "hoody", "shoes" -> "shoe")
+
+Plurals are folded before stop words are dropped, so a word that folds to a
+stop word is dropped too ("dress fors beach" -> "dress beach"). The result is
+idempotent: canonicalizing a canonical query returns it unchanged, so
+canonical keys can be fed back in (e.g. by the prefetcher).
+"""
+import unicodedata
+from functools import lru_cache
+from typing import FrozenSet
+
+STOP_WORDS: FrozenSet[str] = frozenset(
+    "a an and the for with of in on to by at from or my".split()
+)
+
+# Endings where "es" (not just "s") is the plural suffix: boxes, buzzes, watches, brushes, dresses
+_ES_PLURALS = ("xes", "zes", "ches", "shes", "sses")
+
+
+def fold_plural(word: str) -> str:
+    """Singular form of a plural English word by suffix rules; other words unchanged."""
+    if len(word) <= 3 or not word.isalpha() or not word.endswith("s"):
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(_ES_PLURALS):
+        return word[:-2]
+    # Leave words that only look plural: dress, citrus, bikini(s) vs iris
+    if word.endswith(("ss", "us", "is")):
+        return word
+    return word[:-1]
+
+
+@lru_cache(maxsize=4096)
+def canonical_query(q: str, fold_stop_words: bool = False, fold_plurals: bool = False) -> str:
+    """The canonical form of search query `q` (see module docstring)."""
+    text = unicodedata.normalize("NFKC", q)
+    if not text.isascii():
+        text = "".join(ch for ch in text if unicodedata.category(ch) != "Cf")
+    words = text.casefold().split()
+    # Plurals first: "fors" folds to the stop word "for", which must then be dropped
+    if fold_plurals:
+        words = [fold_plural(word) for word in words]
+    if fold_stop_words:
+        # Keep a query made only of stop words as-is rather than emptying it
+        words = [word for word in words if word not in STOP_WORDS] or words
+    return " ".join(words)